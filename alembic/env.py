@@ -37,6 +37,7 @@ from apps.contacts import models as contacts_models
 from apps.products import models as products_models
 from apps.wallet import models as wallet_models
 from apps.integrations import models as integrations_models
+from apps.idempotency import models as idempotency_models
 
 target_metadata = Base.metadata
 
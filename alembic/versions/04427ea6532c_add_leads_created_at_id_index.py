@@ -0,0 +1,30 @@
+"""add leads (created_at, id) index
+
+Revision ID: 04427ea6532c
+Revises: a3c1ffc60b86
+Create Date: 2026-10-17 09:12:44.201318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '04427ea6532c'
+down_revision: Union[str, Sequence[str], None] = 'a3c1ffc60b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_leads_created_at_id",
+        "leads",
+        ["created_at", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_leads_created_at_id", table_name="leads")
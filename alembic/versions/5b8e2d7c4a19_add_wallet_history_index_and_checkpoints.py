@@ -0,0 +1,52 @@
+"""add wallet history index and checkpoints
+
+Revision ID: 5b8e2d7c4a19
+Revises: 9c4f1a6d2e87
+Create Date: 2026-10-17 17:22:09.643518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2d7c4a19'
+down_revision: Union[str, Sequence[str], None] = '9c4f1a6d2e87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_wallet_transactions_wallet_id_created_at",
+        "wallet_transactions",
+        ["wallet_id", "created_at", "id"],
+    )
+    op.create_table(
+        "wallet_balance_checkpoints",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("wallet_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("as_of_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("as_of_transaction_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("available_balance", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("totals", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["wallet_id"], ["wallets.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("wallet_id", "transaction_count", name="uq_wallet_checkpoint_count"),
+    )
+    op.create_index(
+        "ix_wallet_checkpoints_wallet_id_as_of",
+        "wallet_balance_checkpoints",
+        ["wallet_id", "as_of_created_at", "as_of_transaction_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_wallet_checkpoints_wallet_id_as_of", table_name="wallet_balance_checkpoints")
+    op.drop_table("wallet_balance_checkpoints")
+    op.drop_index("ix_wallet_transactions_wallet_id_created_at", table_name="wallet_transactions")
@@ -0,0 +1,36 @@
+"""add followup query indexes
+
+Revision ID: 7d2e9b41c3f5
+Revises: cfe6aba3623d
+Create Date: 2026-10-17 13:41:06.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e9b41c3f5'
+down_revision: Union[str, Sequence[str], None] = 'cfe6aba3623d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_followup_assignees_user_id_followup_id",
+        "followup_assignees",
+        ["user_id", "followup_id"],
+    )
+    op.create_index(
+        "ix_followups_status_is_deleted_due_date",
+        "followups",
+        ["status", "is_deleted", "due_date"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_followups_status_is_deleted_due_date", table_name="followups")
+    op.drop_index("ix_followup_assignees_user_id_followup_id", table_name="followup_assignees")
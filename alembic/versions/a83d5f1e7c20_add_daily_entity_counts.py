@@ -0,0 +1,41 @@
+"""add daily entity counts
+
+Revision ID: a83d5f1e7c20
+Revises: f4b7a2c9d1e6
+Create Date: 2026-10-17 19:48:06.731592
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83d5f1e7c20'
+down_revision: Union[str, Sequence[str], None] = 'f4b7a2c9d1e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Filled by the background aggregator (or python -m apps.admin.dashboard_rollups)
+    op.create_table(
+        "daily_entity_counts",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "entity"),
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("aggregated_through", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("rollup_watermarks")
+    op.drop_table("daily_entity_counts")
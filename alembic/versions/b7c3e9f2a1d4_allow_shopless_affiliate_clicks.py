@@ -0,0 +1,28 @@
+"""allow shopless affiliate clicks
+
+Revision ID: b7c3e9f2a1d4
+Revises: d29e6b3a8f41
+Create Date: 2026-10-17 22:06:52.184430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e9f2a1d4'
+down_revision: Union[str, Sequence[str], None] = 'd29e6b3a8f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # /integrations/redirect records clicks without ?shop= as click-only
+    op.alter_column("affiliate_clicks", "shop_domain", existing_type=sa.String(length=255), nullable=True)
+
+
+def downgrade():
+    op.execute("DELETE FROM affiliate_clicks WHERE shop_domain IS NULL")
+    op.alter_column("affiliate_clicks", "shop_domain", existing_type=sa.String(length=255), nullable=False)
@@ -0,0 +1,56 @@
+"""add commission rollups
+
+Revision ID: c61d0e4b8f23
+Revises: 5b8e2d7c4a19
+Create Date: 2026-10-17 18:03:51.270935
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c61d0e4b8f23'
+down_revision: Union[str, Sequence[str], None] = '5b8e2d7c4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index(
+        op.f("ix_commission_records_salesperson_id"),
+        "commission_records",
+        ["salesperson_id"],
+    )
+    op.create_table(
+        "commission_rollups",
+        sa.Column("salesperson_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM("pending", "paid", "canceled", name="commissionstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["salesperson_id"], ["persons.id"]),
+        sa.PrimaryKeyConstraint("salesperson_id", "status"),
+    )
+    # Backfill from existing records
+    op.execute(
+        """
+        INSERT INTO commission_rollups (salesperson_id, status, count, total_amount, updated_at)
+        SELECT salesperson_id, status, COUNT(*), SUM(amount), now()
+        FROM commission_records
+        WHERE status IS NOT NULL
+        GROUP BY salesperson_id, status
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("commission_rollups")
+    op.drop_index(op.f("ix_commission_records_salesperson_id"), table_name="commission_records")
@@ -0,0 +1,52 @@
+"""unique affiliate referral per (affiliate_user_id, shop_domain)
+
+Revision ID: cfe6aba3623d
+Revises: 04427ea6532c
+Create Date: 2026-10-17 11:40:02.518764
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cfe6aba3623d'
+down_revision: Union[str, Sequence[str], None] = '04427ea6532c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Collapse duplicates created by concurrent clicks, keeping the most
+    # recently updated referral for each pair
+    op.execute(
+        """
+        DELETE FROM affiliate_referrals
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY affiliate_user_id, shop_domain
+                           ORDER BY updated_at DESC NULLS LAST, created_at DESC NULLS LAST, id
+                       ) AS rn
+                FROM affiliate_referrals
+            ) ranked
+            WHERE ranked.rn > 1
+        )
+        """
+    )
+    op.create_unique_constraint(
+        "uq_affiliate_referrals_affiliate_shop",
+        "affiliate_referrals",
+        ["affiliate_user_id", "shop_domain"],
+    )
+
+
+def downgrade():
+    op.drop_constraint(
+        "uq_affiliate_referrals_affiliate_shop",
+        "affiliate_referrals",
+        type_="unique",
+    )
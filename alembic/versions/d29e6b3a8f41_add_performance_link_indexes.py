@@ -0,0 +1,27 @@
+"""add performance link indexes
+
+Revision ID: d29e6b3a8f41
+Revises: a83d5f1e7c20
+Create Date: 2026-10-17 20:31:14.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd29e6b3a8f41'
+down_revision: Union[str, Sequence[str], None] = 'a83d5f1e7c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index("ix_person_leads_person_id", "person_leads", ["person_id"])
+    op.create_index("ix_opportunity_persons_person_id", "opportunity_persons", ["person_id"])
+
+
+def downgrade():
+    op.drop_index("ix_opportunity_persons_person_id", table_name="opportunity_persons")
+    op.drop_index("ix_person_leads_person_id", table_name="person_leads")
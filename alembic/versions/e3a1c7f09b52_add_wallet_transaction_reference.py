@@ -0,0 +1,33 @@
+"""add wallet transaction reference
+
+Revision ID: e3a1c7f09b52
+Revises: 7d2e9b41c3f5
+Create Date: 2026-10-17 15:12:44.207391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a1c7f09b52'
+down_revision: Union[str, Sequence[str], None] = '7d2e9b41c3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column("wallet_transactions", sa.Column("reference", sa.String(length=100), nullable=True))
+    op.create_index(
+        op.f("ix_wallet_transactions_reference"),
+        "wallet_transactions",
+        ["reference"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_wallet_transactions_reference"), table_name="wallet_transactions")
+    op.drop_column("wallet_transactions", "reference")
@@ -0,0 +1,30 @@
+"""add created_at indexes for dashboard
+
+Revision ID: f4b7a2c9d1e6
+Revises: c61d0e4b8f23
+Create Date: 2026-10-17 19:12:40.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b7a2c9d1e6'
+down_revision: Union[str, Sequence[str], None] = 'c61d0e4b8f23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # leads is already covered by ix_leads_created_at_id
+    op.create_index(op.f("ix_persons_created_at"), "persons", ["created_at"])
+    op.create_index(op.f("ix_opportunities_created_at"), "opportunities", ["created_at"])
+    op.create_index(op.f("ix_followups_created_at"), "followups", ["created_at"])
+
+
+def downgrade():
+    op.drop_index(op.f("ix_followups_created_at"), table_name="followups")
+    op.drop_index(op.f("ix_opportunities_created_at"), table_name="opportunities")
+    op.drop_index(op.f("ix_persons_created_at"), table_name="persons")
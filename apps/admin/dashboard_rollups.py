@@ -0,0 +1,213 @@
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import delete, func, insert, select, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal
+from .dashboard_services import (
+    DAILY_COUNTS_WATERMARK,
+    DASHBOARD_ENTITIES,
+    BaseRange,
+    CountPlan,
+    _count_series,
+    midnight,
+)
+from .models import DailyEntityCount, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+# Rows this recent may still be committed by in-flight transactions with a
+# slightly earlier created_at, so a day is only aggregated once it is this
+# far in the past
+ROLLUP_SETTLE_SECONDS = 300
+# Days aggregated (and committed) per step, bounding backfill transactions
+ROLLUP_CHUNK_DAYS = 31
+
+# Watermark row locked for this transaction; concurrent aggregators (one
+# per API process) queue on it instead of aggregating the same days twice
+def _lock_watermark(db: Session) -> RollupWatermark:
+    def locked():
+        return (
+            db.query(RollupWatermark)
+            .filter(RollupWatermark.name == DAILY_COUNTS_WATERMARK)
+            .populate_existing()
+            .with_for_update()
+            .first()
+        )
+
+    watermark = locked()
+    if watermark is None:
+        try:
+            db.add(RollupWatermark(name=DAILY_COUNTS_WATERMARK))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        watermark = locked()
+    return watermark
+
+def _first_day(db: Session) -> Optional[date]:
+    query = union_all(*[select(func.min(model.created_at)) for model in DASHBOARD_ENTITIES.values()])
+    days = [value for (value,) in db.execute(query) if value is not None]
+    if not days:
+        return None
+    first = min(value if value.tzinfo else value.replace(tzinfo=timezone.utc) for value in days)
+    return first.astimezone(timezone.utc).date()
+
+# Replace the rollup rows of [start_day, end_day) with fresh counts
+def _aggregate_days(db: Session, start_day: date, end_day: date) -> int:
+    plan = CountPlan([BaseRange(midnight(start_day), midnight(end_day), end_inclusive=False)])
+    series = _count_series(db, plan, "day")
+    rows = [
+        {"day": bucket.date(), "entity": entity, "count": count}
+        for entity, buckets in series.items()
+        for bucket, count in buckets.items()
+        if bucket is not None and count
+    ]
+    db.execute(delete(DailyEntityCount).where(
+        DailyEntityCount.day >= start_day, DailyEntityCount.day < end_day
+    ))
+    if rows:
+        db.execute(insert(DailyEntityCount), rows)
+    return len(rows)
+
+# Aggregate every settled day after the watermark. Entity rows are only
+# ever inserted (deletes are soft) with created_at set at insert time, so
+# days before the watermark never change and are not re-read. Each chunk
+# commits together with the watermark advance.
+def aggregate_daily_counts(db: Session, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.now(timezone.utc)
+    closed_before = (now - timedelta(seconds=ROLLUP_SETTLE_SECONDS)).astimezone(timezone.utc).date()
+
+    watermark = _lock_watermark(db)
+    if watermark.aggregated_through is None:
+        watermark.aggregated_through = _first_day(db) or closed_before
+
+    days = rows = 0
+    while watermark.aggregated_through < closed_before:
+        start_day = watermark.aggregated_through
+        end_day = min(start_day + timedelta(days=ROLLUP_CHUNK_DAYS), closed_before)
+        rows += _aggregate_days(db, start_day, end_day)
+        days += (end_day - start_day).days
+        watermark.aggregated_through = end_day
+        db.commit()
+        watermark = _lock_watermark(db)
+
+    through = watermark.aggregated_through
+    db.commit()
+    if days:
+        logger.info(f"Daily entity counts aggregated | days={days} | rows={rows} | through={through}")
+    return {"days": days, "rows": rows, "aggregated_through": through.isoformat()}
+
+# Drop every rollup row and aggregate from the first created_at again,
+# e.g. after rows were imported with historical created_at values.
+# Readers fall back to the base tables until the watermark is set again.
+def rebuild_daily_counts(db: Session, now: Optional[datetime] = None) -> dict:
+    watermark = _lock_watermark(db)
+    db.execute(delete(DailyEntityCount))
+    watermark.aggregated_through = None
+    db.commit()
+    return aggregate_daily_counts(db, now)
+
+# Background aggregation loop: runs at startup and then every interval
+class DailyCountAggregator:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval_seconds: float = settings.DASHBOARD_ROLLUP_INTERVAL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Metrics
+        self.runs = 0
+        self.failures = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration_seconds: Optional[float] = None
+        self.last_result: Optional[dict] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="daily-count-aggregator", daemon=True)
+        self._thread.start()
+        logger.info(f"Daily entity count aggregator started | interval={self.interval_seconds}s")
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def run_once(self) -> dict:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            result = aggregate_daily_counts(db)
+        finally:
+            db.close()
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_duration_seconds = round(time.perf_counter() - started, 3)
+        self.last_result = result
+        return result
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                self.failures += 1
+                logger.exception("Daily entity count aggregation failed")
+            self._stop_event.wait(self.interval_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_result": self.last_result,
+        }
+
+daily_count_aggregator = DailyCountAggregator()
+
+
+# CLI: python -m apps.admin.dashboard_rollups [--rebuild]
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Aggregate daily_entity_counts for the admin dashboard.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every day from scratch")
+    args = parser.parse_args(argv)
+
+    # Registers every app's models (and configures logging) like the API process
+    import main as _app  # noqa: F401
+
+    db = SessionLocal()
+    try:
+        result = rebuild_daily_counts(db) if args.rebuild else aggregate_daily_counts(db)
+    finally:
+        db.close()
+
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
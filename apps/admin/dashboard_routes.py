@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime, timezone
 from apps.auth.security import get_current_admin
-from .dashboard_schemas import DashboardResponse, DashboardMetric
-from .dashboard_services import get_all_metrics, apply_date_filters
+from .dashboard_cache import dashboard_cache
+from .dashboard_rollups import aggregate_daily_counts, daily_count_aggregator, rebuild_daily_counts
+from .dashboard_schemas import DashboardResponse, DashboardMetric, DashboardSeries, DashboardSeriesPoint
+from .dashboard_services import get_all_metrics, get_metric_series
 from core.database import get_db
 
 router = APIRouter(prefix="/dashboard", tags=["Admin Dashboard"])
@@ -14,6 +16,7 @@ router = APIRouter(prefix="/dashboard", tags=["Admin Dashboard"])
 def get_admin_dashboard(
     start_date:Optional[str] = Query(None),
     end_date:Optional[str] = Query(None),
+    granularity: Optional[Literal["day", "week", "month"]] = Query(None),
     db: Session = Depends(get_db),
     admin_user: dict = Depends(get_current_admin)
 ):
@@ -38,8 +41,43 @@ def get_admin_dashboard(
         except ValueError:
             raise HTTPException(400, "Invalid end_date format. Use ISO format: YYYY-MM-DD")
 
-    metrics = get_all_metrics(db, start_date_obj, end_date_obj)
-    metrics_list = [
-        DashboardMetric(name=key, total=value) for key, value in metrics.items()
-    ]
-    return DashboardResponse(metrics=metrics_list)
\ No newline at end of file
+    if granularity is None:
+        metrics = get_all_metrics(db, start_date_obj, end_date_obj)
+        metrics_list = [
+            DashboardMetric(name=key, total=value) for key, value in metrics.items()
+        ]
+        return DashboardResponse(metrics=metrics_list)
+
+    # Per-entity time series; totals come from the same query
+    metrics, series = get_metric_series(db, start_date_obj, end_date_obj, granularity)
+    return DashboardResponse(
+        metrics=[DashboardMetric(name=key, total=value) for key, value in metrics.items()],
+        granularity=granularity,
+        series=[
+            DashboardSeries(
+                name=key,
+                points=[DashboardSeriesPoint(bucket=bucket, total=total) for bucket, total in points],
+            )
+            for key, points in series.items()
+        ],
+    )
+
+# Admin: Dashboard result cache statistics
+@router.get("/cache/stats")
+def get_dashboard_cache_stats(admin_user: dict = Depends(get_current_admin)):
+    return dashboard_cache.stats()
+
+# Admin: Aggregate settled days into daily_entity_counts now (rebuild=true
+# recomputes every day)
+@router.post("/rollups/refresh")
+def refresh_dashboard_rollups(
+    rebuild: bool = Query(False),
+    db: Session = Depends(get_db),
+    admin_user: dict = Depends(get_current_admin)
+):
+    return rebuild_daily_counts(db) if rebuild else aggregate_daily_counts(db)
+
+# Admin: Background rollup aggregator status
+@router.get("/rollups/stats")
+def get_dashboard_rollup_stats(admin_user: dict = Depends(get_current_admin)):
+    return daily_count_aggregator.stats()
@@ -1,9 +1,20 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class DashboardMetric(BaseModel):
     name: str
     total: int
 
+class DashboardSeriesPoint(BaseModel):
+    bucket: datetime
+    total: int
+
+class DashboardSeries(BaseModel):
+    name: str
+    points: List[DashboardSeriesPoint]
+
 class DashboardResponse(BaseModel):
-    metrics: List[DashboardMetric]
\ No newline at end of file
+    metrics: List[DashboardMetric]
+    granularity: Optional[str] = None
+    series: Optional[List[DashboardSeries]] = None
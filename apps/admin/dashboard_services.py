@@ -1,51 +1,233 @@
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, cast, func, literal, select, union_all
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
-from typing import Optional
+
+from core.config import settings
 from apps.contacts.models import PersonOfContact
 from apps.leads.models import Lead
 from apps.opportunities.models import Opportunity
 from apps.followups.models import FollowUp
+from .dashboard_cache import dashboard_cache
+from .models import DailyEntityCount, RollupWatermark
+
+# Dashboard metric name -> model counted by created_at
+DASHBOARD_ENTITIES = {
+    "contacts": PersonOfContact,
+    "leads": Lead,
+    "opportunities": Opportunity,
+    "followups": FollowUp,
+}
+
+DAILY_COUNTS_WATERMARK = "daily_entity_counts"
 
 # Helper function to apply date filters
-def apply_date_filters(query, model, start_date: Optional[datetime], end_date: Optional[datetime]):
+def apply_date_filters(
+    query,
+    model,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    end_inclusive: bool = True,
+):
     if start_date and start_date.tzinfo is None:
         start_date = start_date.replace(tzinfo=timezone.utc)
     if end_date and end_date.tzinfo is None:
         end_date = end_date.replace(tzinfo=timezone.utc)
-    
+
     if start_date:
         query = query.filter(model.created_at >= start_date)
     if end_date:
-        query = query.filter(model.created_at <= end_date)
-    
+        query = query.filter(model.created_at <= end_date if end_inclusive else model.created_at < end_date)
+
     return query
 
-# Count functions for each entity
-def count_contacts(db: Session, start_date: Optional[datetime], end_date: Optional[datetime]) -> int:
-    query = db.query(PersonOfContact)
-    query = apply_date_filters(query, PersonOfContact, start_date, end_date)
-    return query.count()
+# UTC, with start rounded down and end rounded up to the cache bucket, so
+# requests a few seconds apart share one cache entry and one query
+def normalize_range(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    bucket = max(settings.DASHBOARD_CACHE_BUCKET_SECONDS, 1)
+
+    def _round(value: Optional[datetime], rounding) -> Optional[datetime]:
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        seconds = rounding(value.timestamp() / bucket) * bucket
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+    return _round(start_date, math.floor), _round(end_date, math.ceil)
+
+def midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+# A created_at range on the base tables
+@dataclass(frozen=True)
+class BaseRange:
+    start: Optional[datetime]
+    end: Optional[datetime]
+    end_inclusive: bool = True
+
+# How a dashboard range is answered: whole aggregated days
+# [first_day, last_day) from daily_entity_counts, the rest from base tables
+@dataclass
+class CountPlan:
+    base_ranges: List[BaseRange] = field(default_factory=list)
+    rollup_days: Optional[Tuple[Optional[date], date]] = None
+
+def aggregated_through(db: Session) -> Optional[date]:
+    return db.scalar(
+        select(RollupWatermark.aggregated_through).where(RollupWatermark.name == DAILY_COUNTS_WATERMARK)
+    )
+
+# Split [start_date, end_date] (end inclusive) at the rollup watermark. Days
+# the range covers completely and that are already aggregated come from the
+# rollup; a partial first day and everything from the watermark on (today,
+# in steady state) are counted on the base tables.
+def plan_counts(start_date: Optional[datetime], end_date: Optional[datetime], through: Optional[date]) -> CountPlan:
+    if through is None:
+        return CountPlan([BaseRange(start_date, end_date)])
 
-def count_leads(db: Session, start_date: Optional[datetime], end_date: Optional[datetime]) -> int:
-    query = db.query(Lead)
-    query = apply_date_filters(query, Lead, start_date, end_date)
-    return query.count()
+    first_day = None
+    if start_date is not None:
+        first_day = start_date.date()
+        if start_date != midnight(first_day):
+            first_day += timedelta(days=1)
+    last_day = through if end_date is None else min(through, end_date.date())
+    if first_day is not None and first_day >= last_day:
+        return CountPlan([BaseRange(start_date, end_date)])
 
-def count_opportunities(db: Session, start_date: Optional[datetime], end_date: Optional[datetime]) -> int:
-    query = db.query(Opportunity)
-    query = apply_date_filters(query, Opportunity, start_date, end_date)
-    return query.count()
+    plan = CountPlan(rollup_days=(first_day, last_day))
+    if first_day is not None and start_date < midnight(first_day):
+        plan.base_ranges.append(BaseRange(start_date, midnight(first_day), end_inclusive=False))
+    plan.base_ranges.append(BaseRange(midnight(last_day), end_date))
+    return plan
 
-def count_followups(db: Session, start_date: Optional[datetime], end_date: Optional[datetime]) -> int:
-    query = db.query(FollowUp)
-    query = apply_date_filters(query, FollowUp, start_date, end_date)
-    return query.count()
+# One SELECT per entity over a base-table range; columns(model) gives the
+# select list after the entity name, group_by(model) the optional grouping
+def _entity_selects(base_range: BaseRange, columns, group_by=None) -> list:
+    selects = []
+    for name, model in DASHBOARD_ENTITIES.items():
+        query = select(literal(name).label("entity"), *columns(model)).select_from(model)
+        query = apply_date_filters(query, model, base_range.start, base_range.end, base_range.end_inclusive)
+        if group_by is not None:
+            query = query.group_by(*group_by(model))
+        selects.append(query)
+    return selects
+
+def _rollup_filters(rollup_days: Tuple[Optional[date], date]) -> list:
+    first_day, last_day = rollup_days
+    filters = [DailyEntityCount.day < last_day]
+    if first_day is not None:
+        filters.append(DailyEntityCount.day >= first_day)
+    return filters
+
+# Every base-table count and the rollup sum combined with UNION ALL, so all
+# totals come from a single statement (and snapshot)
+def _count_all(db: Session, plan: CountPlan) -> Dict[str, int]:
+    selects = []
+    for base_range in plan.base_ranges:
+        selects.extend(_entity_selects(base_range, lambda model: [func.count().label("total")]))
+    if plan.rollup_days is not None:
+        selects.append(
+            select(DailyEntityCount.entity, func.sum(DailyEntityCount.count).label("total"))
+            .where(*_rollup_filters(plan.rollup_days))
+            .group_by(DailyEntityCount.entity)
+        )
+
+    totals = {name: 0 for name in DASHBOARD_ENTITIES}
+    for entity, total in db.execute(union_all(*selects)):
+        totals[entity] += total or 0
+    return totals
+
+def _truncate(value: datetime, granularity: str) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    return value
+
+# Per-entity counts per day/week/month bucket (UTC, weeks start Monday).
+# PostgreSQL groups base rows and rollup days by date_trunc in one UNION
+# ALL; other dialects truncate in Python. Rows without created_at get a
+# None bucket.
+def _count_series(db: Session, plan: CountPlan, granularity: str) -> Dict[str, Dict[Optional[datetime], int]]:
+    series: Dict[str, Dict[Optional[datetime], int]] = {name: defaultdict(int) for name in DASHBOARD_ENTITIES}
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Grouping by the labelled select expression reuses its bind
+        # parameters, so GROUP BY matches the select list exactly
+        buckets = {
+            model: func.date_trunc(granularity, func.timezone("UTC", model.created_at)).label("bucket")
+            for model in DASHBOARD_ENTITIES.values()
+        }
+        selects = []
+        for base_range in plan.base_ranges:
+            selects.extend(_entity_selects(
+                base_range,
+                lambda model: [buckets[model], func.count().label("total")],
+                group_by=lambda model: [buckets[model]],
+            ))
+        if plan.rollup_days is not None:
+            day_bucket = func.date_trunc(granularity, cast(DailyEntityCount.day, DateTime())).label("bucket")
+            selects.append(
+                select(DailyEntityCount.entity, day_bucket, func.sum(DailyEntityCount.count).label("total"))
+                .where(*_rollup_filters(plan.rollup_days))
+                .group_by(DailyEntityCount.entity, day_bucket)
+            )
+        for entity, day, total in db.execute(union_all(*selects)):
+            key = day.replace(tzinfo=timezone.utc) if day is not None else None
+            series[entity][key] += total
+        return series
+
+    for base_range in plan.base_ranges:
+        query = union_all(*_entity_selects(base_range, lambda model: [model.created_at.label("created_at")]))
+        for entity, created_at in db.execute(query):
+            key = _truncate(created_at, granularity) if created_at is not None else None
+            series[entity][key] += 1
+    if plan.rollup_days is not None:
+        query = select(DailyEntityCount.entity, DailyEntityCount.day, DailyEntityCount.count).where(
+            *_rollup_filters(plan.rollup_days)
+        )
+        for entity, day, count in db.execute(query):
+            series[entity][_truncate(midnight(day), granularity)] += count
+    return series
 
 # Wrapper function to get all metrics
 def get_all_metrics(db: Session, start_date: Optional[datetime], end_date: Optional[datetime]):
-    return {
-        "contacts": count_contacts(db, start_date, end_date),
-        "leads": count_leads(db, start_date, end_date),
-        "opportunities": count_opportunities(db, start_date, end_date),
-        "followups": count_followups(db, start_date, end_date),
-    }
\ No newline at end of file
+    start_date, end_date = normalize_range(start_date, end_date)
+
+    def compute():
+        return _count_all(db, plan_counts(start_date, end_date, aggregated_through(db)))
+
+    return dashboard_cache.get_or_compute(("totals", start_date, end_date), compute)
+
+# Totals plus a time series per entity; the totals are summed from the
+# series, so both come from the same query
+def get_metric_series(
+    db: Session,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    granularity: str,
+) -> Tuple[Dict[str, int], Dict[str, List[Tuple[datetime, int]]]]:
+    start_date, end_date = normalize_range(start_date, end_date)
+
+    def compute():
+        plan = plan_counts(start_date, end_date, aggregated_through(db))
+        series = _count_series(db, plan, granularity)
+        totals = {name: sum(buckets.values()) for name, buckets in series.items()}
+        points = {
+            name: sorted((key, total) for key, total in buckets.items() if key is not None)
+            for name, buckets in series.items()
+        }
+        return totals, points
+
+    return dashboard_cache.get_or_compute(("series", granularity, start_date, end_date), compute)
@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from sqlalchemy import Column, Date, DateTime, Integer, String
 from core.database import Base
 
 # Admin model to represent single admin user "superadmin"
@@ -7,3 +9,23 @@ class Admin:
     admin_id: str
     hashed_password: str
 
+# Rows created per UTC day and dashboard entity (contacts, leads, ...).
+# Filled by apps/admin/dashboard_rollups.py for closed days only.
+class DailyEntityCount(Base):
+    __tablename__ = "daily_entity_counts"
+
+    day = Column(Date, primary_key=True)
+    entity = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False)
+
+# Progress of a rollup job: every day before aggregated_through is final
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(64), primary_key=True)
+    aggregated_through = Column(Date, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
@@ -0,0 +1,147 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event
+
+from apps.auth.models import User
+from core.config import settings
+
+# Lightweight, session-independent view of an authenticated user.
+# Carries the fields routes read from current_user and UserOut serializes.
+@dataclass(frozen=True)
+class UserPrincipal:
+    id: uuid.UUID
+    first_name: str
+    last_name: str
+    phone_code: Optional[str]
+    phone_no: Optional[str]
+    email: str
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            phone_code=user.phone_code,
+            phone_no=user.phone_no,
+            email=user.email,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+# Bounded TTL/LRU cache of token hash -> UserPrincipal.
+# Entries never outlive the token's own exp claim.
+class UserPrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._keys_by_user: Dict[uuid.UUID, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, token_hash: str) -> Optional[UserPrincipal]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(token_hash)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token_hash)
+            self.hits += 1
+            return principal
+
+    def set(self, token_hash: str, principal: UserPrincipal, token_exp: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        with self._lock:
+            if token_hash in self._entries:
+                self._remove(token_hash)
+            self._entries[token_hash] = (principal, expires_at)
+            self._keys_by_user.setdefault(principal.id, set()).add(token_hash)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, token_hash: str) -> None:
+        principal, _ = self._entries.pop(token_hash)
+        keys = self._keys_by_user.get(principal.id)
+        if keys is not None:
+            keys.discard(token_hash)
+            if not keys:
+                del self._keys_by_user[principal.id]
+
+    # Drop every cached token for a user (deactivation, ownership changes, profile edits)
+    def invalidate_user(self, user_id) -> None:
+        if isinstance(user_id, str):
+            user_id = uuid.UUID(user_id)
+        with self._lock:
+            for token_hash in list(self._keys_by_user.get(user_id, ())):
+                self._remove(token_hash)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+user_cache = UserPrincipalCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+def invalidate_user(user_id) -> None:
+    user_cache.invalidate_user(user_id)
+
+# Any ORM update or delete of a user (e.g. deactivation) drops their cached tokens
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(mapper, connection, target) -> None:
+    invalidate_user(target.id)
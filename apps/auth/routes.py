@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from apps.auth.security import get_current_user
+from apps.auth.security import get_current_admin, get_current_user
+from apps.auth.cache import user_cache
 from apps.contacts.models import PersonOfContact
 from apps.wallet.models import Wallet
 from . import schemas, models, security
@@ -126,3 +127,7 @@ def check_email_exists(payload: schemas.CheckEmailRequest, db: Session = Depends
 def read_current_user(current_user: models.User = Depends(get_current_user)):
     return current_user
 
+# Admin: Authenticated user cache statistics
+@router.get("/cache/stats")
+def get_user_cache_stats(current_admin: dict = Depends(get_current_admin)):
+    return user_cache.stats()
@@ -6,6 +6,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from apps.auth import models
+from apps.auth.cache import UserPrincipal, hash_token, user_cache
 from core.config import settings
 from core.database import get_db
 
@@ -61,6 +62,13 @@ def get_current_user(
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     token = credentials.credentials 
+
+    # Tokens are only cached after a successful decode, and never past their exp
+    token_hash = hash_token(token)
+    principal = user_cache.get(token_hash)
+    if principal is not None:
+        return principal
+
     payload = decode_access_token(token)
     
     user_id: str | None = payload.get("sub")
@@ -72,7 +80,9 @@ def get_current_user(
     if not user:
         raise HTTPException(status_code=404, detail="User does not exist")
 
-    return user
+    principal = UserPrincipal.from_user(user)
+    user_cache.set(token_hash, principal, payload.get("exp"))
+    return principal
 
 # Admin authentication
 def get_current_admin(
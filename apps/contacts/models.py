@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Boolean, Column, String, DateTime, Table, ForeignKey
+from sqlalchemy import Boolean, Column, String, DateTime, Table, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -10,7 +10,9 @@ person_leads = Table(
     "person_leads",
     Base.metadata,
     Column("person_id", UUID(as_uuid=True), ForeignKey("persons.id")),
-    Column("lead_id", UUID(as_uuid=True), ForeignKey("leads.id"))
+    Column("lead_id", UUID(as_uuid=True), ForeignKey("leads.id")),
+    # Per-person performance aggregates
+    Index("ix_person_leads_person_id", "person_id"),
 )
 
 class PersonOfContact(Base):
@@ -27,7 +29,8 @@ class PersonOfContact(Base):
 
     created_at = Column(
         DateTime(timezone=True), 
-        default=lambda: datetime.now(timezone.utc)
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
     )
     updated_at = Column(
         DateTime(timezone=True),
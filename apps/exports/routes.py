@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
+from apps.auth.security import get_current_admin
+from .services import EXPORT_TABLES, MEDIA_TYPES, SUPPORTED_FORMATS, stream_export
+
+router = APIRouter(prefix="/export", tags=["Exports"])
+
+# Admin: Stream a full table dump as NDJSON or CSV
+@router.get("/{entity}")
+def export_entity(
+    entity: str,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+    current_admin: dict = Depends(get_current_admin),
+):
+    if entity not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown export entity. Use one of: {', '.join(EXPORT_TABLES)}",
+        )
+
+    fmt = format.strip().lower()
+    if fmt not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format. Use one of: {', '.join(SUPPORTED_FORMATS)}",
+        )
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    filename = f"{entity}-{timestamp}.{fmt}"
+    media_type = MEDIA_TYPES[fmt]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        stream_export(entity, fmt, gzip=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+import logging
+import uuid
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from apps.accounts.models import Account
+from apps.integrations.models import AffiliateClick
+from apps.leads.models import Lead
+from core.config import settings
+from core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Exportable entities: plain table columns only, no relationships
+EXPORT_TABLES = {
+    "leads": Lead.__table__,
+    "accounts": Account.__table__,
+    "clicks": AffiliateClick.__table__,
+}
+
+def export_columns(entity: str) -> List[str]:
+    return [column.name for column in EXPORT_TABLES[entity].columns]
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+# Stream rows of one table with a server-side cursor, yield_per rows at a time
+def iter_export_rows(db: Session, entity: str, batch_size: int) -> Iterator[list]:
+    table = EXPORT_TABLES[entity]
+    result = db.execute(
+        select(table).execution_options(stream_results=True, yield_per=batch_size)
+    )
+    for partition in result.partitions():
+        yield partition
+
+def _encode_ndjson(columns: List[str], rows: list) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+        for row in rows
+    )
+
+def _encode_csv(rows: list) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+# Yield encoded export chunks (one per fetched batch), optionally gzipped.
+# Opens its own session so the cursor outlives the request handler.
+def stream_export(
+    entity: str,
+    fmt: str,
+    gzip: bool = False,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: int = settings.EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    columns = export_columns(entity)
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    db = session_factory()
+    exported = 0
+    try:
+        if fmt == "csv":
+            yield encode(_encode_csv([columns]))
+
+        for rows in iter_export_rows(db, entity, batch_size):
+            text = _encode_ndjson(columns, rows) if fmt == "ndjson" else _encode_csv(rows)
+            exported += len(rows)
+            chunk = encode(text)
+            if chunk:
+                yield chunk
+
+        if compressor:
+            yield compressor.flush()
+    finally:
+        db.close()
+        logger.info(f"Export finished | entity={entity} | format={fmt} | gzip={gzip} | rows={exported}")
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Boolean,
     Text,
     Table,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -29,10 +30,15 @@ followup_assignees = Table(
         ForeignKey("users.id"),
         primary_key=True,
     ),
+    # Per-user lookups; the primary key leads with followup_id
+    Index("ix_followup_assignees_user_id_followup_id", "user_id", "followup_id"),
 )
 
 class FollowUp(Base):
     __tablename__ = "followups"
+    __table_args__ = (
+        Index("ix_followups_status_is_deleted_due_date", "status", "is_deleted", "due_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
 
@@ -60,12 +66,12 @@ class FollowUp(Base):
     person = relationship("PersonOfContact", back_populates="followups")
     interaction = relationship("Interaction", back_populates="followups")
 
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
     updated_at = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
     )
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from apps.followups import models, schemas, services
 from apps.auth.models import User
 from core.database import get_db
-from apps.auth.security import get_current_user 
+from apps.auth.security import get_current_admin, get_current_user
+from apps.followups.scheduler import followup_scheduler
 
 router = APIRouter(
     prefix="/followups",
@@ -22,13 +23,43 @@ def create_followup(
     return services.create_followup(db, data, current_user)
 
 
+# Bulk Create Follow-Ups
+@router.post("/bulk", response_model=schemas.FollowUpBulkCreateResponse)
+def bulk_create_followups(
+    data: schemas.FollowUpBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return services.bulk_create_followups(db, data, current_user)
+
+# Admin: Reassign Follow-Ups from one user to another (e.g. when a rep leaves)
+@router.put("/reassign", response_model=schemas.FollowUpReassignResponse)
+def reassign_followups(
+    data: schemas.FollowUpReassign,
+    db: Session = Depends(get_db),
+    current_admin: dict = Depends(get_current_admin),
+):
+    return services.reassign_followups(db, data)
+
+# Return a page of follow-ups, exposing the next cursor in X-Next-Cursor
+def _page(response: Response, result):
+    followups, next_cursor = result
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return followups
+
 # Get All Active Follow-Ups
+# Passing limit (and cursor for later pages) switches the list endpoints to
+# keyset pagination on (due_date, id).
 @router.get("/", response_model=List[schemas.FollowUpResponse])
 def get_all_followups(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return services.get_all_followups(db, current_user)
+    return _page(response, services.get_all_followups(db, current_user, limit, cursor))
 
 # Get All Deleted Follow-Ups from Trash
 @router.get("/trash", response_model=List[schemas.FollowUpResponse])
@@ -42,29 +73,43 @@ def get_deleted_followups(
 # Get Past Due Follow-Ups
 @router.get("/reminders/past-due", response_model=List[schemas.FollowUpResponse])
 def get_past_due_followups(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return services.get_past_due_followups(db, current_user)
+    return _page(response, services.get_past_due_followups(db, current_user, limit, cursor))
 
 
 # Get Upcoming Follow-Ups
 @router.get("/reminders/upcoming", response_model=List[schemas.FollowUpResponse])
 def get_upcoming_followups(
+    response: Response,
     hours: int = 48,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return services.get_upcoming_followups(db, current_user, hours)
+    return _page(response, services.get_upcoming_followups(db, current_user, hours, limit, cursor))
 
 # Get Follow-Ups with No Recent Interactions
 @router.get("/reminders/no-interaction", response_model=List[schemas.FollowUpResponse])
 def get_no_interaction_followups(
+    response: Response,
     days: int = 7,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return services.get_no_interaction_followups(db, current_user, days)
+    return _page(response, services.get_no_interaction_followups(db, current_user, days, limit, cursor))
+
+# Admin: Reminder scheduler metrics
+@router.get("/reminders/scheduler/stats")
+def get_reminder_scheduler_stats(current_admin: dict = Depends(get_current_admin)):
+    return followup_scheduler.stats()
 
 # Get Follow-Up by ID
 @router.get("/{followup_id}", response_model=schemas.FollowUpResponse)
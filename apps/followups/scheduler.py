@@ -0,0 +1,321 @@
+import heapq
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, selectinload
+
+from apps.integrations.utils import send_email
+from core.config import settings
+from core.database import SessionLocal
+from .models import FollowUp
+
+logger = logging.getLogger(__name__)
+
+# Load pending follow-ups in chunks so the initial load never materializes
+# the whole window as ORM objects
+LOAD_CHUNK_SIZE = 10000
+
+def _is_pending(followup: FollowUp) -> bool:
+    return not followup.is_deleted and followup.status != "completed" and followup.due_date is not None
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+# Default reminder callback: email every assignee of each due follow-up.
+# Rows are re-read so reminders reflect the committed state at fire time.
+def send_followup_reminders(db: Session, followup_ids: List[uuid.UUID]) -> None:
+    followups = (
+        db.query(FollowUp)
+        .options(selectinload(FollowUp.assigned_users))
+        .filter(FollowUp.id.in_(followup_ids))
+        .all()
+    )
+    for followup in followups:
+        if not _is_pending(followup):
+            continue
+        body = (
+            f"Follow-up due: {followup.type}\n"
+            f"Due: {followup.due_date.isoformat()}\n"
+            f"Notes: {followup.notes or 'N/A'}\n"
+            f"Follow-up: {followup.id}"
+        )
+        for user in followup.assigned_users:
+            send_email(user.email, "Follow-up reminder", body)
+
+# In-process reminder scheduler.
+# Pending follow-ups due within the horizon are kept in a min-heap of
+# (due_timestamp, followup_id_int) tuples; a second dict holds each id's
+# current due time so updates and deletes are O(log n) pushes with lazy
+# invalidation instead of heap searches. The thread sleeps until the
+# earliest due time (or a wake-up from a schedule change) and only touches
+# the database to load the next window and to read the rows it fires.
+class FollowUpReminderScheduler:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        horizon_seconds: float = settings.FOLLOWUP_REMINDER_HORIZON_HOURS * 3600,
+        max_entries: int = settings.FOLLOWUP_REMINDER_MAX_ENTRIES,
+        callback: Callable[[Session, List[uuid.UUID]], None] = send_followup_reminders,
+        fire_batch_size: int = 500,
+    ):
+        self.session_factory = session_factory
+        self.horizon_seconds = horizon_seconds
+        self.max_entries = max_entries
+        self.callback = callback
+        self.fire_batch_size = fire_batch_size
+
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+        # Follow-ups due after this are not in memory; loaded with the next window
+        self._window_end = 0.0
+        # (due_date, id) of the last row loaded when a window hit max_entries;
+        # the next load resumes after it so rows sharing that due time are
+        # neither skipped nor loaded twice
+        self._resume_after: Optional[Tuple[datetime, uuid.UUID]] = None
+        self._loading = False
+        self._changes_during_load: Dict[int, Optional[float]] = {}
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Metrics
+        self.loaded = 0
+        self.fired = 0
+        self.stale_skipped = 0
+        self.window_loads = 0
+        self.callback_failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.horizon_seconds > 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> None:
+        if not self.enabled or self.running:
+            return
+        self._stop_event.clear()
+        # The first window starts at startup; reminders due before it are not sent
+        self._window_end = 0.0
+        self._resume_after = None
+        self._thread = threading.Thread(target=self._run, name="followup-reminders", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Follow-up reminder scheduler started | horizon={self.horizon_seconds}s | "
+            f"max_entries={self.max_entries}"
+        )
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    # Replace the in-memory window with pending follow-ups due after the
+    # previous window, up to now + horizon. Starting where the last window
+    # stopped (not at now) picks up rows cut at max_entries and anything that
+    # came due while the reload was pending; they fire on the next pass.
+    # Called once everything due in the previous window has been popped.
+    def load_window(self) -> int:
+        now = time.time()
+        window_end = now + self.horizon_seconds
+        end = datetime.fromtimestamp(window_end, timezone.utc)
+        if self._resume_after is not None:
+            after = tuple_(FollowUp.due_date, FollowUp.id) > self._resume_after
+        else:
+            after = FollowUp.due_date > datetime.fromtimestamp(self._window_end or now, timezone.utc)
+
+        with self._cond:
+            self._loading = True
+            self._changes_during_load = {}
+
+        heap: List[Tuple[float, int]] = []
+        due: Dict[int, float] = {}
+        db = self.session_factory()
+        try:
+            rows = (
+                db.query(FollowUp.id, FollowUp.due_date)
+                .filter(
+                    FollowUp.is_deleted == False,
+                    FollowUp.status != "completed",
+                    after,
+                    FollowUp.due_date <= end,
+                )
+                .order_by(FollowUp.due_date.asc(), FollowUp.id.asc())
+                .limit(self.max_entries)
+                .yield_per(LOAD_CHUNK_SIZE)
+            )
+            last_row = None
+            for followup_id, due_date in rows:
+                key = followup_id.int
+                due_ts = _timestamp(due_date)
+                heap.append((due_ts, key))
+                due[key] = due_ts
+                last_row = (due_date, followup_id)
+        except Exception:
+            with self._cond:
+                self._loading = False
+                self._changes_during_load = {}
+            raise
+        finally:
+            db.close()
+
+        # At the cap, the window ends at the last loaded row; the rest is
+        # picked up by the next load
+        resume_after = None
+        if len(heap) >= self.max_entries:
+            window_end = heap[-1][0]
+            resume_after = last_row
+
+        heapq.heapify(heap)
+        with self._cond:
+            self._heap = heap
+            self._due = due
+            self._window_end = window_end
+            self._resume_after = resume_after
+            self._loading = False
+            for key, due_ts in self._changes_during_load.items():
+                self._apply(key, due_ts)
+            self._changes_during_load = {}
+            self.loaded = len(due)
+            self.window_loads += 1
+            self._cond.notify_all()
+
+        logger.info(f"Follow-up reminder window loaded | pending={len(due)} | until={datetime.fromtimestamp(window_end, timezone.utc).isoformat()}")
+        return len(due)
+
+    # Due after the in-memory window, so left to a later load
+    def _after_window(self, due_ts: float, key: int) -> bool:
+        if due_ts != self._window_end or self._resume_after is None:
+            return due_ts > self._window_end
+        return key > self._resume_after[1].int
+
+    def _apply(self, key: int, due_ts: Optional[float]) -> None:
+        if due_ts is None or self._after_window(due_ts, key):
+            self._due.pop(key, None)
+            return
+        if self._due.get(key) == due_ts:
+            return
+        self._due[key] = due_ts
+        heapq.heappush(self._heap, (due_ts, key))
+        # Lazy invalidation leaves superseded tuples behind; rebuild when
+        # they outnumber live entries
+        if len(self._heap) > 2 * len(self._due) + 1024:
+            self._heap = [(ts, k) for k, ts in self._due.items()]
+            heapq.heapify(self._heap)
+
+    # Incremental update after a follow-up is created, edited, deleted or restored
+    def schedule(self, followup: FollowUp) -> None:
+        if not self.running:
+            return
+        due_ts = _timestamp(followup.due_date) if _is_pending(followup) else None
+        if due_ts is not None and due_ts <= time.time():
+            due_ts = None
+
+        key = followup.id.int
+        with self._cond:
+            if self._loading:
+                self._changes_during_load[key] = due_ts
+                return
+            self._apply(key, due_ts)
+            # Wake the thread if this is now the earliest reminder
+            if self._heap and self._heap[0] == (due_ts, key):
+                self._cond.notify_all()
+
+    # Schedule newly created pending follow-ups in one lock acquisition
+    def schedule_many(self, entries: List[Tuple[uuid.UUID, datetime]]) -> None:
+        if not self.running:
+            return
+        now = time.time()
+        with self._cond:
+            for followup_id, due_date in entries:
+                due_ts = _timestamp(due_date)
+                if due_ts <= now:
+                    continue
+                if self._loading:
+                    self._changes_during_load[followup_id.int] = due_ts
+                else:
+                    self._apply(followup_id.int, due_ts)
+            self._cond.notify_all()
+
+    def _pop_due(self, now: float) -> List[uuid.UUID]:
+        due_ids: List[uuid.UUID] = []
+        while self._heap and self._heap[0][0] <= now and len(due_ids) < self.fire_batch_size:
+            due_ts, key = heapq.heappop(self._heap)
+            if self._due.get(key) != due_ts:
+                # Superseded by a later schedule() or removed
+                self.stale_skipped += 1
+                continue
+            del self._due[key]
+            due_ids.append(uuid.UUID(int=key))
+        return due_ids
+
+    def _fire(self, followup_ids: List[uuid.UUID]) -> None:
+        db = self.session_factory()
+        try:
+            self.callback(db, followup_ids)
+            self.fired += len(followup_ids)
+        except Exception:
+            self.callback_failures += 1
+            logger.exception(f"Follow-up reminder callback failed for {len(followup_ids)} follow-ups")
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            # Drain everything due (in fire_batch_size batches, including
+            # reminders that came due while the previous batch fired) before
+            # the window is replaced
+            with self._cond:
+                now = time.time()
+                due_ids = self._pop_due(now)
+            if due_ids:
+                self._fire(due_ids)
+                continue
+
+            if now >= self._window_end:
+                try:
+                    self.load_window()
+                except Exception:
+                    logger.exception("Follow-up reminder window load failed, retrying in 60s")
+                    self._stop_event.wait(60)
+                continue
+
+            with self._cond:
+                now = time.time()
+                next_due = self._heap[0][0] if self._heap else self._window_end
+                self._cond.wait(timeout=max(0.0, min(next_due, self._window_end) - now))
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "running": self.running,
+                "pending": len(self._due),
+                "heap_entries": len(self._heap),
+                "next_due_at": (
+                    datetime.fromtimestamp(self._heap[0][0], timezone.utc).isoformat()
+                    if self._heap else None
+                ),
+                "window_end": (
+                    datetime.fromtimestamp(self._window_end, timezone.utc).isoformat()
+                    if self._window_end else None
+                ),
+                "loaded": self.loaded,
+                "window_loads": self.window_loads,
+                "fired": self.fired,
+                "stale_skipped": self.stale_skipped,
+                "callback_failures": self.callback_failures,
+            }
+
+followup_scheduler = FollowUpReminderScheduler()
@@ -60,4 +60,33 @@ class FollowUpResponse(BaseModel):
         completed_at: Optional[datetime] = None
 
         class Config:
-            orm_mode = True
\ No newline at end of file
+            orm_mode = True
+
+class FollowUpBulkCreate(BaseModel):
+    followups: List[FollowUpCreate] = Field(..., min_items=1, max_items=10000)
+
+class FollowUpReassign(BaseModel):
+    from_user_id: UUID_Type = Field(..., description="User whose follow-ups are handed over")
+    to_user_id: UUID_Type = Field(..., description="User who takes the follow-ups over")
+    followup_ids: Optional[List[UUID_Type]] = Field(
+        default=None,
+        description="Limit to these follow-ups; defaults to all of from_user's open follow-ups",
+    )
+
+class FollowUpBulkError(BaseModel):
+    index: Optional[int] = None
+    followup_id: Optional[UUID_Type] = None
+    error: str
+
+class FollowUpBulkCreateResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    created_ids: List[UUID_Type] = []
+    errors: List[FollowUpBulkError] = []
+
+class FollowUpReassignResponse(BaseModel):
+    total: int
+    reassigned: int
+    failed: int
+    errors: List[FollowUpBulkError] = []
@@ -1,46 +1,236 @@
 from datetime import datetime, timezone, timedelta
-from typing import List
-from fastapi import HTTPException, status, logger
-from sqlalchemy.orm import Session, joinedload
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import base64
+import json
+import uuid
+import logging
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, literal, select, tuple_, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, selectinload
 from apps.followups import models, schemas
+from apps.followups.scheduler import followup_scheduler
 from apps.auth.models import User             
 from apps.leads.models import Lead
 from apps.opportunities.models import Opportunity
 from apps.contacts.models import PersonOfContact
 from apps.interactions.models import Interaction
 
-# Ensure related entities exist before creating/updating FollowUp
-def _validate_relations(db: Session, data: schemas.FollowUpBase):
-  
-    poc = db.query(PersonOfContact).filter(PersonOfContact.id == data.poc_id).first()
-    if not poc:
-        raise HTTPException(status_code=404, detail="Person of contact not found.")
-
-    interaction = db.query(Interaction).filter(Interaction.id == data.interaction_id).first()
-    if not interaction:
-        raise HTTPException(status_code=404, detail="Interaction not found.")
-
-    lead = None
-    if data.lead_id:
-        lead = db.query(Lead).filter(Lead.id == data.lead_id).first()
-        if not lead:
-            raise HTTPException(status_code=404, detail="Lead not found.")
-
-    opportunity = None
-    if data.opportunity_id:
-        opportunity = db.query(Opportunity).filter(Opportunity.id == data.opportunity_id).first()
-        if not opportunity:
-            raise HTTPException(status_code=404, detail="Opportunity not found.")
-
-    return poc, interaction, lead, opportunity
-
-# Retrieve and validate all assigned users by UUID list
-def _get_assigned_users(db: Session, user_ids: List[str]) -> List[User]:
-  
-    users = db.query(User).filter(User.id.in_(user_ids)).all()
-    if len(users) != len(set(user_ids)):
-        raise HTTPException(status_code=400, detail="One or more assigned users not found.")
-    return users
+logger = logging.getLogger(__name__)
+
+DEFAULT_FOLLOWUP_PAGE_SIZE = 50
+FOLLOWUP_BULK_CHUNK_SIZE = 1000
+FOLLOWUP_REASSIGN_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+_followup_list_adapter = TypeAdapter(List[schemas.FollowUpResponse])
+
+# Single serialization path for follow-ups. is_past_due is evaluated for the
+# whole batch against one reference time; naive due dates are treated as UTC.
+def serialize_followups(
+    followups: List[models.FollowUp],
+    now: Optional[datetime] = None,
+) -> List[schemas.FollowUpResponse]:
+    if now is None:
+        now = datetime.now(timezone.utc)
+    naive_now = now.astimezone(timezone.utc).replace(tzinfo=None)
+
+    rows = []
+    for followup in followups:
+        due_date = followup.due_date
+        if due_date is None:
+            is_past_due = False
+        elif due_date.tzinfo is None:
+            is_past_due = due_date < naive_now
+        else:
+            is_past_due = due_date < now
+
+        rows.append({
+            "id": followup.id,
+            "due_date": due_date,
+            "status": followup.status,
+            "type": followup.type,
+            "notes": followup.notes,
+            "poc_id": followup.poc_id,
+            "interaction_id": followup.interaction_id,
+            "lead_id": followup.lead_id,
+            "opportunity_id": followup.opportunity_id,
+            "assigned_user_ids": [user.id for user in followup.assigned_users],
+            "is_deleted": followup.is_deleted,
+            "is_past_due": is_past_due,
+            "created_at": followup.created_at,
+            "updated_at": followup.updated_at,
+            "completed_at": followup.completed_at,
+        })
+
+    return _followup_list_adapter.validate_python(rows)
+
+def serialize_followup(followup: models.FollowUp, now: Optional[datetime] = None) -> schemas.FollowUpResponse:
+    return serialize_followups([followup], now)[0]
+
+# Bits returned by _missing_relations
+MISSING_POC = 1
+MISSING_INTERACTION = 2
+MISSING_LEAD = 4
+MISSING_OPPORTUNITY = 8
+MISSING_ASSIGNED_USERS = 16
+
+RELATION_COLUMNS = {
+    MISSING_POC: PersonOfContact.id,
+    MISSING_INTERACTION: Interaction.id,
+    MISSING_LEAD: Lead.id,
+    MISSING_OPPORTUNITY: Opportunity.id,
+    MISSING_ASSIGNED_USERS: User.id,
+}
+
+# Look up every referenced id in a single UNION ALL round trip of id-only
+# SELECTs (no ORM objects or eager loads). Takes and returns
+# {relation bit: ids}; the result holds the ids that exist.
+def _existing_relation_ids(db: Session, requested: Dict[int, Set[UUID]]) -> Dict[int, Set[UUID]]:
+    checks = [
+        select(literal(bit).label("relation"), RELATION_COLUMNS[bit].label("id"))
+        .where(RELATION_COLUMNS[bit].in_(ids))
+        for bit, ids in requested.items()
+        if ids
+    ]
+    existing: Dict[int, Set[UUID]] = {bit: set() for bit in requested}
+    if not checks:
+        return existing
+
+    statement = checks[0] if len(checks) == 1 else union_all(*checks)
+    for relation, relation_id in db.execute(statement):
+        existing[relation].add(relation_id)
+    return existing
+
+# Bitmap of the relations referenced by one follow-up that do not exist
+def _missing_relations(
+    db: Session,
+    poc_id: Optional[UUID] = None,
+    interaction_id: Optional[UUID] = None,
+    lead_id: Optional[UUID] = None,
+    opportunity_id: Optional[UUID] = None,
+    user_ids: Optional[List[UUID]] = None,
+) -> int:
+    requested = {
+        bit: {value}
+        for bit, value in (
+            (MISSING_POC, poc_id),
+            (MISSING_INTERACTION, interaction_id),
+            (MISSING_LEAD, lead_id),
+            (MISSING_OPPORTUNITY, opportunity_id),
+        )
+        if value is not None
+    }
+    if user_ids:
+        requested[MISSING_ASSIGNED_USERS] = set(user_ids)
+
+    existing = _existing_relation_ids(db, requested)
+
+    missing = 0
+    for bit, ids in requested.items():
+        if not ids <= existing[bit]:
+            missing |= bit
+    return missing
+
+# Errors for missing relations, in the order the API has always reported them
+MISSING_RELATION_ERRORS = (
+    (MISSING_POC, 404, "Person of contact not found."),
+    (MISSING_INTERACTION, 404, "Interaction not found."),
+    (MISSING_LEAD, 404, "Lead not found."),
+    (MISSING_OPPORTUNITY, 404, "Opportunity not found."),
+    (MISSING_ASSIGNED_USERS, 400, "One or more assigned users not found."),
+)
+
+def _raise_missing_relations(missing: int) -> None:
+    for bit, status_code, detail in MISSING_RELATION_ERRORS:
+        if missing & bit:
+            raise HTTPException(status_code=status_code, detail=detail)
+
+# Ensure related entities and assigned users exist before creating/updating FollowUp
+def _validate_relations(
+    db: Session,
+    data: Optional[schemas.FollowUpBase] = None,
+    user_ids: Optional[List[UUID]] = None,
+) -> None:
+    missing = _missing_relations(
+        db,
+        poc_id=data.poc_id if data else None,
+        interaction_id=data.interaction_id if data else None,
+        lead_id=data.lead_id if data else None,
+        opportunity_id=data.opportunity_id if data else None,
+        user_ids=user_ids,
+    )
+    _raise_missing_relations(missing)
+
+# Replace a follow-up's assignees with association rows, without loading User objects
+def _set_assignees(db: Session, followup: models.FollowUp, user_ids: List[UUID], replace: bool = True) -> None:
+    if replace:
+        db.execute(
+            delete(models.followup_assignees)
+            .where(models.followup_assignees.c.followup_id == followup.id)
+        )
+    db.execute(
+        models.followup_assignees.insert(),
+        [{"followup_id": followup.id, "user_id": user_id} for user_id in dict.fromkeys(user_ids)],
+    )
+    db.expire(followup, ["assigned_users"])
+
+def encode_followup_cursor(followup: models.FollowUp) -> str:
+    raw = json.dumps([followup.due_date.isoformat(), str(followup.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_followup_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        due_date, followup_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(due_date), UUID(followup_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Follow-ups assigned to a user. Joins followup_assignees directly (served by
+# its (user_id, followup_id) index) instead of a correlated EXISTS, and loads
+# assignees with a separate IN query so LIMIT applies to follow-ups.
+def _assigned_followups_query(db: Session, current_user: User):
+    return (
+        db.query(models.FollowUp)
+        .join(
+            models.followup_assignees,
+            models.followup_assignees.c.followup_id == models.FollowUp.id,
+        )
+        .filter(models.followup_assignees.c.user_id == current_user.id)
+        .options(selectinload(models.FollowUp.assigned_users))
+    )
+
+# Without a limit the whole result is returned in its default order. With a
+# limit (and cursor for later pages) results are keyset-paginated on
+# (due_date, id); returns the follow-ups and the next page's cursor.
+def _fetch_followups(
+    query,
+    limit: Optional[int],
+    cursor: Optional[str],
+    default_order: tuple = (models.FollowUp.due_date.asc(),),
+) -> Tuple[List[models.FollowUp], Optional[str]]:
+    if limit is None and cursor is None:
+        return query.order_by(*default_order).all(), None
+
+    limit = limit or DEFAULT_FOLLOWUP_PAGE_SIZE
+    if cursor:
+        query = query.filter(
+            tuple_(models.FollowUp.due_date, models.FollowUp.id) > decode_followup_cursor(cursor)
+        )
+
+    followups = (
+        query.order_by(models.FollowUp.due_date.asc(), models.FollowUp.id.asc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(followups) > limit:
+        followups = followups[:limit]
+        next_cursor = encode_followup_cursor(followups[-1])
+    return followups, next_cursor
 
 # Check if current user has permission to modify the follow-up
 def _permission_check(followup: models.FollowUp, current_user: User):
@@ -53,13 +243,13 @@ def _permission_check(followup: models.FollowUp, current_user: User):
 
 # Create a new Follow-Up
 def create_followup(db: Session, data: schemas.FollowUpCreate, current_user: User,) -> schemas.FollowUpResponse:
-    poc, interaction, lead, opportunity = _validate_relations(db, data)
-    assigned_users = _get_assigned_users(db, data.assigned_user_ids)
-    
-    if current_user.id not in [user.id for user in assigned_users]:
+    _validate_relations(db, data, data.assigned_user_ids)
+
+    if current_user.id not in data.assigned_user_ids:
         raise HTTPException(status_code=403, detail="You must be assigned to the follow-up to create it.")
     
     followup = models.FollowUp(
+        id=uuid.uuid4(),
         due_date=data.due_date,
         status="pending",
         type=data.type,
@@ -71,83 +261,25 @@ def create_followup(db: Session, data: schemas.FollowUpCreate, current_user: Use
         opportunity_id=data.opportunity_id,
     )
 
-    followup.assigned_users = assigned_users
-
     db.add(followup)
+    db.flush()
+    _set_assignees(db, followup, data.assigned_user_ids, replace=False)
     db.commit()
     db.refresh(followup)
+    followup_scheduler.schedule(followup)
 
-    due_date = (
-        followup.due_date.replace(tzinfo=timezone.utc)
-        if followup.due_date and followup.due_date.tzinfo is None
-        else followup.due_date
-    )
-    is_past_due = (
-        due_date < datetime.now(timezone.utc)
-        if due_date
-        else False
-    )
+    return serialize_followup(followup)
 
-    return schemas.FollowUpResponse(
-        id=followup.id,
-        due_date=followup.due_date,
-        status=followup.status,
-        type=followup.type,
-        notes=followup.notes,
-        poc_id=followup.poc_id,
-        interaction_id=followup.interaction_id,
-        lead_id=followup.lead_id,
-        opportunity_id=followup.opportunity_id,
-        assigned_user_ids=[user.id for user in followup.assigned_users],
-        is_deleted=followup.is_deleted,
-        is_past_due=is_past_due,
-        created_at=followup.created_at,
-        updated_at=followup.updated_at,
-    )
-
-def get_all_followups(db: Session, current_user: User) -> List[schemas.FollowUpResponse]:
-    followups = (
-        db.query(models.FollowUp)
-        .options(joinedload(models.FollowUp.assigned_users))
-        .filter(models.FollowUp.assigned_users.any(User.id == current_user.id))
-        .order_by(models.FollowUp.due_date.asc())
-        .all()
-    )
-
-    responses = []
-    for followup in followups:
-        due_date = (
-            followup.due_date.replace(tzinfo=timezone.utc)
-            if followup.due_date and followup.due_date.tzinfo is None
-            else followup.due_date
-        )
-        is_past_due = (
-            due_date < datetime.now(timezone.utc)
-            if due_date
-            else False
-        )
-
-        responses.append(
-            schemas.FollowUpResponse(
-                id=followup.id,
-                due_date=followup.due_date,
-                status=followup.status,
-                type=followup.type,
-                notes=followup.notes,
-                poc_id=followup.poc_id,
-                interaction_id=followup.interaction_id,
-                lead_id=followup.lead_id,
-                opportunity_id=followup.opportunity_id,
-                assigned_user_ids=[user.id for user in followup.assigned_users],
-                is_deleted=followup.is_deleted,
-                is_past_due=is_past_due,
-                created_at=followup.created_at,
-                updated_at=followup.updated_at,
-            )
-        )
-
-    return responses
+def get_all_followups(
+    db: Session,
+    current_user: User,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[schemas.FollowUpResponse], Optional[str]]:
+    query = _assigned_followups_query(db, current_user)
 
+    followups, next_cursor = _fetch_followups(query, limit, cursor)
+    return serialize_followups(followups), next_cursor
 
 def get_followup_by_id(db: Session, followup_id: str, current_user: User) -> schemas.FollowUpResponse:
     followup = (db.query(models.FollowUp).options(joinedload(models.FollowUp.assigned_users))
@@ -158,34 +290,7 @@ def get_followup_by_id(db: Session, followup_id: str, current_user: User) -> sch
     if current_user.id not in [user.id for user in followup.assigned_users]:
         raise HTTPException(status_code=403, detail="You are not authorized to view this follow-up.")
 
-    due_date = (
-        followup.due_date.replace(tzinfo=timezone.utc)
-        if followup.due_date and followup.due_date.tzinfo is None
-        else followup.due_date
-    )
-    is_past_due = (
-        due_date < datetime.now(timezone.utc)
-        if due_date
-        else False
-    )
-
-    return schemas.FollowUpResponse(
-        id=followup.id,
-        due_date=followup.due_date,
-        status=followup.status,
-        type=followup.type,
-        notes=followup.notes,
-        poc_id=followup.poc_id,
-        interaction_id=followup.interaction_id,
-        lead_id=followup.lead_id,
-        opportunity_id=followup.opportunity_id,
-        assigned_user_ids=[user.id for user in followup.assigned_users],
-        is_deleted=followup.is_deleted,
-        is_past_due=is_past_due,
-        created_at=followup.created_at,
-        updated_at=followup.updated_at,
-        completed_at=followup.completed_at,
-    )
+    return serialize_followup(followup)
 
 def update_followup(db: Session, followup_id: str, data: schemas.FollowUpUpdate, current_user: User) -> schemas.FollowUpResponse:
     followup = db.query(models.FollowUp).options(joinedload(models.FollowUp.assigned_users)) \
@@ -201,8 +306,8 @@ def update_followup(db: Session, followup_id: str, data: schemas.FollowUpUpdate,
     for field, value in update_data.items():
         if field == "assigned_user_ids":
             # many-to-many relationship update
-            new_assignees = _get_assigned_users(db, value)
-            followup.assigned_users = new_assignees
+            _validate_relations(db, user_ids=value)
+            _set_assignees(db, followup, value)
         else:
             if hasattr(followup, field):
                 setattr(followup, field, value)
@@ -216,35 +321,9 @@ def update_followup(db: Session, followup_id: str, data: schemas.FollowUpUpdate,
 
     db.commit()
     db.refresh(followup)
+    followup_scheduler.schedule(followup)
 
-    due_date = (
-        followup.due_date.replace(tzinfo=timezone.utc)
-        if followup.due_date and followup.due_date.tzinfo is None
-        else followup.due_date
-    )
-    is_past_due = (
-        due_date < datetime.now(timezone.utc)
-        if due_date
-        else False
-    )
-
-    return schemas.FollowUpResponse(
-        id=followup.id,
-        due_date=followup.due_date,
-        status=followup.status,
-        type=followup.type,
-        notes=followup.notes,
-        poc_id=followup.poc_id,
-        interaction_id=followup.interaction_id,
-        lead_id=followup.lead_id,
-        opportunity_id=followup.opportunity_id,
-        assigned_user_ids=[user.id for user in followup.assigned_users],
-        is_deleted=followup.is_deleted,
-        is_past_due=is_past_due,
-        created_at=followup.created_at,
-        updated_at=followup.updated_at,
-        completed_at=followup.completed_at,
-    )
+    return serialize_followup(followup)
 
 def soft_delete_followup(db: Session, followup_id: str, current_user: User,) -> schemas.FollowUpResponse:
     followup = db.query(models.FollowUp).options(joinedload(models.FollowUp.assigned_users)) \
@@ -263,35 +342,9 @@ def soft_delete_followup(db: Session, followup_id: str, current_user: User,) ->
 
     db.commit()
     db.refresh(followup)
+    followup_scheduler.schedule(followup)
 
-    due_date = (
-        followup.due_date.replace(tzinfo=timezone.utc)
-        if followup.due_date and followup.due_date.tzinfo is None
-        else followup.due_date
-    )
-    is_past_due = (
-        due_date < datetime.now(timezone.utc)
-        if due_date
-        else False
-    )
-
-    return schemas.FollowUpResponse(
-        id=followup.id,
-        due_date=followup.due_date,
-        status=followup.status,
-        type=followup.type,
-        notes=followup.notes,
-        poc_id=followup.poc_id,
-        interaction_id=followup.interaction_id,
-        lead_id=followup.lead_id,
-        opportunity_id=followup.opportunity_id,
-        assigned_user_ids=[user.id for user in followup.assigned_users],
-        is_deleted=followup.is_deleted,
-        is_past_due=is_past_due,
-        created_at=followup.created_at,
-        updated_at=followup.updated_at,
-        completed_at=followup.completed_at,
-    )
+    return serialize_followup(followup)
 
 def restore_followup(db: Session, followup_id: str, current_user: User,) -> schemas.FollowUpResponse:
     followup = db.query(models.FollowUp).options(joinedload(models.FollowUp.assigned_users)) \
@@ -311,35 +364,9 @@ def restore_followup(db: Session, followup_id: str, current_user: User,) -> sche
 
     db.commit()
     db.refresh(followup)
+    followup_scheduler.schedule(followup)
 
-    due_date = (
-        followup.due_date.replace(tzinfo=timezone.utc)
-        if followup.due_date and followup.due_date.tzinfo is None
-        else followup.due_date
-    )
-    is_past_due = (
-        due_date < datetime.now(timezone.utc)
-        if due_date
-        else False
-    )
-
-    return schemas.FollowUpResponse(
-        id=followup.id,
-        due_date=followup.due_date,
-        status=followup.status,
-        type=followup.type,
-        notes=followup.notes,
-        poc_id=followup.poc_id,
-        interaction_id=followup.interaction_id,
-        lead_id=followup.lead_id,
-        opportunity_id=followup.opportunity_id,
-        assigned_user_ids=[user.id for user in followup.assigned_users],
-        is_deleted=followup.is_deleted,
-        is_past_due=is_past_due,
-        created_at=followup.created_at,
-        updated_at=followup.updated_at,
-        completed_at=followup.completed_at,
-    )
+    return serialize_followup(followup)
 
 def get_deleted_followups(db: Session, current_user: User) -> List[schemas.FollowUpResponse]:
     followups = (
@@ -353,196 +380,259 @@ def get_deleted_followups(db: Session, current_user: User) -> List[schemas.Follo
         .all()
     )
 
-    responses = []
-    for followup in followups:
-        due_date = (
-            followup.due_date.replace(tzinfo=timezone.utc)
-            if followup.due_date and followup.due_date.tzinfo is None
-            else followup.due_date
-        )
-        is_past_due = (
-            due_date < datetime.now(timezone.utc)
-            if due_date
-            else False
-        )
-
-        responses.append(
-            schemas.FollowUpResponse(
-                id=followup.id,
-                due_date=followup.due_date,
-                status=followup.status,
-                type=followup.type,
-                notes=followup.notes,
-                poc_id=followup.poc_id,
-                interaction_id=followup.interaction_id,
-                lead_id=followup.lead_id,
-                opportunity_id=followup.opportunity_id,
-                assigned_user_ids=[user.id for user in followup.assigned_users],
-                is_deleted=followup.is_deleted,
-                is_past_due=is_past_due,
-                created_at=followup.created_at,
-                updated_at=followup.updated_at,
-                completed_at=followup.completed_at,
-            )
-        )
-
-    return responses
+    return serialize_followups(followups)
 
 
-def get_past_due_followups(db: Session, current_user: User) -> List[schemas.FollowUpResponse]:
+def get_past_due_followups(
+    db: Session,
+    current_user: User,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[schemas.FollowUpResponse], Optional[str]]:
     now = datetime.now(timezone.utc)
 
-    followups = (
-        db.query(models.FollowUp)
-        .options(joinedload(models.FollowUp.assigned_users))
-        .filter(
-            models.FollowUp.is_deleted == False,
-            models.FollowUp.status != "completed",
-            models.FollowUp.due_date < now,
-            models.FollowUp.assigned_users.any(User.id == current_user.id),
-        )
-        .order_by(models.FollowUp.due_date.asc())
-        .all()
+    query = _assigned_followups_query(db, current_user).filter(
+        models.FollowUp.is_deleted == False,
+        models.FollowUp.status != "completed",
+        models.FollowUp.due_date < now,
     )
 
-    responses = []
-    for followup in followups:
-        due_date = (
-            followup.due_date.replace(tzinfo=timezone.utc)
-            if followup.due_date and followup.due_date.tzinfo is None
-            else followup.due_date
-        )
-        is_past_due = (
-            due_date < datetime.now(timezone.utc)
-            if due_date
-            else False
-        )
-
-        responses.append(
-            schemas.FollowUpResponse(
-                id=followup.id,
-                due_date=followup.due_date,
-                status=followup.status,
-                type=followup.type,
-                notes=followup.notes,
-                poc_id=followup.poc_id,
-                interaction_id=followup.interaction_id,
-                lead_id=followup.lead_id,
-                opportunity_id=followup.opportunity_id,
-                assigned_user_ids=[user.id for user in followup.assigned_users],
-                is_deleted=followup.is_deleted,
-                is_past_due=is_past_due,
-                created_at=followup.created_at,
-                updated_at=followup.updated_at,
-                completed_at=followup.completed_at,
-            )
-        )
-
-    return responses
+    followups, next_cursor = _fetch_followups(query, limit, cursor)
+    return serialize_followups(followups, now), next_cursor
 
 
-def get_upcoming_followups(db: Session, current_user: User, hours: int = 48) -> List[schemas.FollowUpResponse]:
+def get_upcoming_followups(
+    db: Session,
+    current_user: User,
+    hours: int = 48,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[schemas.FollowUpResponse], Optional[str]]:
     now = datetime.now(timezone.utc)
     upcoming_threshold = now + timedelta(hours=hours)
 
-    followups = (
-        db.query(models.FollowUp)
-        .options(joinedload(models.FollowUp.assigned_users))
-        .filter(
-            models.FollowUp.is_deleted == False,
-            models.FollowUp.status != "completed",
-            models.FollowUp.due_date >= now,
-            models.FollowUp.due_date <= upcoming_threshold,
-            models.FollowUp.assigned_users.any(User.id == current_user.id),
-        )
-        .order_by(models.FollowUp.due_date.asc())
-        .all()
+    query = _assigned_followups_query(db, current_user).filter(
+        models.FollowUp.is_deleted == False,
+        models.FollowUp.status != "completed",
+        models.FollowUp.due_date >= now,
+        models.FollowUp.due_date <= upcoming_threshold,
     )
 
-    responses = []
-    for followup in followups:
-        due_date = (
-            followup.due_date.replace(tzinfo=timezone.utc)
-            if followup.due_date and followup.due_date.tzinfo is None
-            else followup.due_date
-        )
-        is_past_due = (
-            due_date < datetime.now(timezone.utc)
-            if due_date
-            else False
-        )
-
-        responses.append(
-            schemas.FollowUpResponse(
-                id=followup.id,
-                due_date=followup.due_date,
-                status=followup.status,
-                type=followup.type,
-                notes=followup.notes,
-                poc_id=followup.poc_id,
-                interaction_id=followup.interaction_id,
-                lead_id=followup.lead_id,
-                opportunity_id=followup.opportunity_id,
-                assigned_user_ids=[user.id for user in followup.assigned_users],
-                is_deleted=followup.is_deleted,
-                is_past_due=is_past_due,
-                created_at=followup.created_at,
-                updated_at=followup.updated_at,
-                completed_at=followup.completed_at,
-            )
-        )
-
-    return responses
+    followups, next_cursor = _fetch_followups(query, limit, cursor)
+    return serialize_followups(followups, now), next_cursor
 
 
-def get_no_interaction_followups(db: Session, current_user: User, days: int = 7) -> List[schemas.FollowUpResponse]:
+def get_no_interaction_followups(
+    db: Session,
+    current_user: User,
+    days: int = 7,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[schemas.FollowUpResponse], Optional[str]]:
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
-    followups = (
-        db.query(models.FollowUp)
-        .join(Interaction)
-        .options(joinedload(models.FollowUp.assigned_users))
+    query = (
+        _assigned_followups_query(db, current_user)
+        .join(Interaction, Interaction.id == models.FollowUp.interaction_id)
         .filter(
             models.FollowUp.is_deleted == False,
             models.FollowUp.status != "completed",
             models.FollowUp.updated_at < cutoff,
-            models.FollowUp.assigned_users.any(User.id == current_user.id),
         )
-        .order_by(Interaction.updated_at.asc())
-        .all()
     )
 
-    responses = []
-    for followup in followups:
-        due_date = (
-            followup.due_date.replace(tzinfo=timezone.utc)
-            if followup.due_date and followup.due_date.tzinfo is None
-            else followup.due_date
-        )
-        is_past_due = (
-            due_date < datetime.now(timezone.utc)
-            if due_date
-            else False
-        )
-
-        responses.append(
-            schemas.FollowUpResponse(
-                id=followup.id,
-                due_date=followup.due_date,
-                status=followup.status,
-                type=followup.type,
-                notes=followup.notes,
-                poc_id=followup.poc_id,
-                interaction_id=followup.interaction_id,
-                lead_id=followup.lead_id,
-                opportunity_id=followup.opportunity_id,
-                assigned_user_ids=[user.id for user in followup.assigned_users],
-                is_deleted=followup.is_deleted,
-                is_past_due=is_past_due,
-                created_at=followup.created_at,
-                updated_at=followup.updated_at,
-                completed_at=followup.completed_at,
+    # Unpaginated callers keep the stalest-interaction-first ordering
+    followups, next_cursor = _fetch_followups(
+        query, limit, cursor, default_order=(Interaction.updated_at.asc(),)
+    )
+    return serialize_followups(followups), next_cursor
+
+
+# Collects per-item failures for the bulk endpoints, capping the error list
+class _BulkErrors:
+    def __init__(self):
+        self.failed = 0
+        self.errors: List[schemas.FollowUpBulkError] = []
+
+    def add(self, error: str, index: Optional[int] = None, followup_id: Optional[UUID] = None):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(schemas.FollowUpBulkError(index=index, followup_id=followup_id, error=error))
+
+# Create many follow-ups at once. All referenced ids are validated in one
+# query; valid items are inserted with executemany in chunks, one commit per
+# chunk. Invalid items and failed chunks are reported per item.
+def bulk_create_followups(
+    db: Session,
+    data: schemas.FollowUpBulkCreate,
+    current_user: User,
+) -> schemas.FollowUpBulkCreateResponse:
+    items = data.followups
+
+    requested: Dict[int, Set[UUID]] = {bit: set() for bit in RELATION_COLUMNS}
+    for item in items:
+        requested[MISSING_POC].add(item.poc_id)
+        requested[MISSING_INTERACTION].add(item.interaction_id)
+        if item.lead_id:
+            requested[MISSING_LEAD].add(item.lead_id)
+        if item.opportunity_id:
+            requested[MISSING_OPPORTUNITY].add(item.opportunity_id)
+        requested[MISSING_ASSIGNED_USERS].update(item.assigned_user_ids)
+    existing = _existing_relation_ids(db, requested)
+
+    errors = _BulkErrors()
+    valid = []
+    for index, item in enumerate(items):
+        missing = 0
+        for bit, value in (
+            (MISSING_POC, item.poc_id),
+            (MISSING_INTERACTION, item.interaction_id),
+            (MISSING_LEAD, item.lead_id),
+            (MISSING_OPPORTUNITY, item.opportunity_id),
+        ):
+            if value is not None and value not in existing[bit]:
+                missing |= bit
+        if not set(item.assigned_user_ids) <= existing[MISSING_ASSIGNED_USERS]:
+            missing |= MISSING_ASSIGNED_USERS
+
+        error = next((detail for bit, _, detail in MISSING_RELATION_ERRORS if missing & bit), None)
+        if error is None and current_user.id not in item.assigned_user_ids:
+            error = "You must be assigned to the follow-up to create it."
+        if error:
+            errors.add(error, index=index)
+            continue
+        valid.append((index, item))
+
+    created_ids: List[UUID] = []
+    for start in range(0, len(valid), FOLLOWUP_BULK_CHUNK_SIZE):
+        chunk = valid[start:start + FOLLOWUP_BULK_CHUNK_SIZE]
+        now = datetime.now(timezone.utc)
+        followup_rows = []
+        assignee_rows = []
+        for _, item in chunk:
+            followup_id = uuid.uuid4()
+            followup_rows.append({
+                "id": followup_id,
+                "due_date": item.due_date,
+                "status": "pending",
+                "type": item.type,
+                "notes": item.notes,
+                "is_deleted": False,
+                "poc_id": item.poc_id,
+                "interaction_id": item.interaction_id,
+                "lead_id": item.lead_id,
+                "opportunity_id": item.opportunity_id,
+                "created_at": now,
+                "updated_at": now,
+            })
+            assignee_rows.extend(
+                {"followup_id": followup_id, "user_id": user_id}
+                for user_id in dict.fromkeys(item.assigned_user_ids)
             )
-        )
 
-    return responses
+        try:
+            db.execute(insert(models.FollowUp), followup_rows)
+            db.execute(models.followup_assignees.insert(), assignee_rows)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.exception(f"Bulk follow-up chunk failed | first_index={chunk[0][0]} | size={len(chunk)}")
+            for index, _ in chunk:
+                errors.add(f"Insert failed: {e.__class__.__name__}", index=index)
+            continue
+
+        created_ids.extend(row["id"] for row in followup_rows)
+        followup_scheduler.schedule_many([(row["id"], row["due_date"]) for row in followup_rows])
+
+    logger.info(f"Bulk follow-up create | total={len(items)} | created={len(created_ids)} | failed={errors.failed}")
+    return schemas.FollowUpBulkCreateResponse(
+        total=len(items),
+        created=len(created_ids),
+        failed=errors.failed,
+        created_ids=created_ids,
+        errors=errors.errors,
+    )
+
+# Move follow-ups from one user to another, set-based. Each batch is one
+# SELECT (explicit ids only), one DELETE of the old (and any existing new)
+# assignment and one executemany INSERT, committed together.
+def reassign_followups(db: Session, data: schemas.FollowUpReassign) -> schemas.FollowUpReassignResponse:
+    if data.from_user_id == data.to_user_id:
+        raise HTTPException(status_code=400, detail="from_user_id and to_user_id must differ.")
+    if _missing_relations(db, user_ids=[data.to_user_id]):
+        raise HTTPException(status_code=404, detail="Target user not found.")
+
+    assignees = models.followup_assignees
+    errors = _BulkErrors()
+
+    if data.followup_ids is None:
+        # All of from_user's open follow-ups
+        targets = [
+            followup_id
+            for (followup_id,) in db.query(models.FollowUp.id)
+            .join(assignees, assignees.c.followup_id == models.FollowUp.id)
+            .filter(
+                assignees.c.user_id == data.from_user_id,
+                models.FollowUp.is_deleted == False,
+                models.FollowUp.status != "completed",
+            )
+        ]
+    else:
+        targets = list(dict.fromkeys(data.followup_ids))
+
+    reassigned = 0
+    for start in range(0, len(targets), FOLLOWUP_REASSIGN_BATCH_SIZE):
+        batch = targets[start:start + FOLLOWUP_REASSIGN_BATCH_SIZE]
+
+        if data.followup_ids is not None:
+            found = dict(
+                db.query(models.FollowUp.id, models.FollowUp.is_deleted)
+                .join(assignees, assignees.c.followup_id == models.FollowUp.id)
+                .filter(
+                    assignees.c.user_id == data.from_user_id,
+                    models.FollowUp.id.in_(batch),
+                )
+                .all()
+            )
+            valid = []
+            for followup_id in batch:
+                if followup_id not in found:
+                    errors.add("Follow-up not found or not assigned to from_user_id.", followup_id=followup_id)
+                elif found[followup_id]:
+                    errors.add("This follow-up is deleted.", followup_id=followup_id)
+                else:
+                    valid.append(followup_id)
+            batch = valid
+            if not batch:
+                continue
+
+        try:
+            db.execute(
+                delete(assignees).where(
+                    assignees.c.followup_id.in_(batch),
+                    assignees.c.user_id.in_([data.from_user_id, data.to_user_id]),
+                )
+            )
+            db.execute(
+                assignees.insert(),
+                [{"followup_id": followup_id, "user_id": data.to_user_id} for followup_id in batch],
+            )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.exception(f"Follow-up reassign batch failed | size={len(batch)}")
+            for followup_id in batch:
+                errors.add(f"Reassign failed: {e.__class__.__name__}", followup_id=followup_id)
+            continue
+        reassigned += len(batch)
+
+    logger.info(
+        f"Follow-ups reassigned | from={data.from_user_id} | to={data.to_user_id} | "
+        f"reassigned={reassigned} | failed={errors.failed}"
+    )
+    return schemas.FollowUpReassignResponse(
+        total=len(targets),
+        reassigned=reassigned,
+        failed=errors.failed,
+        errors=errors.errors,
+    )
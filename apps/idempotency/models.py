@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary
+from core.database import Base
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+
+    # sha256 of (scope, principal, Idempotency-Key header)
+    key_hash = Column(String(64), primary_key=True)
+    scope = Column(String(100), nullable=False)
+
+    # sha256 of the request payload; a key may not be reused for a different request
+    request_hash = Column(String(64), nullable=False)
+
+    # Null while the first request is still in flight
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True,
+                        default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Depends
+from apps.auth.security import get_current_admin
+from .store import idempotency_store
+
+router = APIRouter(prefix="/idempotency", tags=["Idempotency"])
+
+# Admin: Replay store hit rates and retention
+@router.get("/stats", response_model=dict)
+def get_idempotency_stats(current_admin: dict = Depends(get_current_admin)):
+    return idempotency_store.stats()
@@ -0,0 +1,317 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal
+from .models import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+REPLAY_HEADER = "Idempotent-Replayed"
+
+# Completed first response for a key
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: bytes
+    expires_at: float
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+# Keys are namespaced by endpoint and caller so two clients (or two
+# endpoints) can never replay each other's responses
+def hash_key(scope: str, principal: Optional[str], key: str) -> str:
+    return _sha256(f"{scope}\x00{principal or ''}\x00{key}")
+
+def hash_request(payload: Any) -> str:
+    return _sha256(json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":")))
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+# Idempotency-Key replay store.
+# The first request for a key inserts a reservation row (committed on its
+# own session, so the primary key arbitrates concurrent retries), runs, and
+# stores its serialized response on the row. Replays are answered from a
+# bounded in-memory LRU, falling back to a primary-key lookup, without
+# touching business tables. Keys are honoured for the retention window;
+# expired rows are purged periodically and may be reused.
+class IdempotencyStore:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_size: int = settings.IDEMPOTENCY_CACHE_MAX_SIZE,
+        retention_seconds: float = settings.IDEMPOTENCY_RETENTION_HOURS * 3600,
+        purge_interval_seconds: float = 600,
+    ):
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.retention_seconds = retention_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+        # Metrics
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.conflicts = 0
+        self.mismatches = 0
+        self.stored = 0
+        self.purged = 0
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            setattr(self, metric, getattr(self, metric) + 1)
+
+    def _remember(self, key_hash: str, entry: StoredResponse) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key_hash] = entry
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _cached(self, key_hash: str) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key_hash]
+                return None
+            self._entries.move_to_end(key_hash)
+            return entry
+
+    def _replay(self, entry: StoredResponse, request_hash: str, metric: str) -> Response:
+        if entry.request_hash != request_hash:
+            self._count("mismatches")
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request.",
+            )
+        self._count(metric)
+        return Response(
+            content=entry.body,
+            status_code=entry.status_code,
+            media_type="application/json",
+            headers={REPLAY_HEADER: "true"},
+        )
+
+    # Replay of the stored response, or None once this caller holds the
+    # reservation and must run the request
+    def begin(self, scope: str, key_hash: str, request_hash: str) -> Optional[Response]:
+        entry = self._cached(key_hash)
+        if entry is not None:
+            return self._replay(entry, request_hash, "memory_hits")
+
+        db = self.session_factory()
+        try:
+            while True:
+                now = datetime.now(timezone.utc)
+                db.add(IdempotencyRecord(
+                    key_hash=key_hash,
+                    scope=scope,
+                    request_hash=request_hash,
+                    created_at=now,
+                ))
+                try:
+                    db.commit()
+                    self._count("misses")
+                    return None
+                except IntegrityError:
+                    db.rollback()
+
+                record = db.get(IdempotencyRecord, key_hash, populate_existing=True)
+                if record is None:
+                    # Purged in between; reserve again
+                    continue
+
+                created_at = _aware(record.created_at)
+                if created_at <= now - timedelta(seconds=self.retention_seconds):
+                    # Expired key: take it over unless another request just did
+                    taken = db.execute(
+                        update(IdempotencyRecord)
+                        .where(
+                            IdempotencyRecord.key_hash == key_hash,
+                            IdempotencyRecord.created_at == record.created_at,
+                        )
+                        .values(
+                            scope=scope,
+                            request_hash=request_hash,
+                            status_code=None,
+                            response_body=None,
+                            created_at=now,
+                        )
+                    ).rowcount
+                    db.commit()
+                    if taken:
+                        self._count("misses")
+                        return None
+                    continue
+
+                if record.status_code is None:
+                    if record.request_hash != request_hash:
+                        self._count("mismatches")
+                        raise HTTPException(
+                            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail="Idempotency-Key was already used for a different request.",
+                        )
+                    self._count("conflicts")
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A request with this Idempotency-Key is still being processed.",
+                    )
+
+                entry = StoredResponse(
+                    request_hash=record.request_hash,
+                    status_code=record.status_code,
+                    body=record.response_body,
+                    expires_at=created_at.timestamp() + self.retention_seconds,
+                )
+                self._remember(key_hash, entry)
+                return self._replay(entry, request_hash, "db_hits")
+        finally:
+            db.close()
+
+    def complete(self, key_hash: str, request_hash: str, status_code: int, body: bytes) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(IdempotencyRecord)
+                .where(IdempotencyRecord.key_hash == key_hash)
+                .values(status_code=status_code, response_body=body)
+            )
+            db.commit()
+            self._count("stored")
+            self._remember(key_hash, StoredResponse(
+                request_hash=request_hash,
+                status_code=status_code,
+                body=body,
+                expires_at=time.time() + self.retention_seconds,
+            ))
+            self._maybe_purge(db)
+        except Exception:
+            db.rollback()
+            # The request itself succeeded; retries get 409 until the key expires
+            logger.exception(f"Failed to store idempotent response | key_hash={key_hash}")
+        finally:
+            db.close()
+
+    # Drop an in-flight reservation after a failed request so it can be retried
+    def release(self, key_hash: str) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(
+                delete(IdempotencyRecord)
+                .where(IdempotencyRecord.key_hash == key_hash, IdempotencyRecord.status_code.is_(None))
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception(f"Failed to release idempotency reservation | key_hash={key_hash}")
+        finally:
+            db.close()
+
+    def _maybe_purge(self, db: Session) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval_seconds
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)
+        purged = db.execute(
+            delete(IdempotencyRecord).where(IdempotencyRecord.created_at < cutoff)
+        ).rowcount
+        db.commit()
+        if purged:
+            with self._lock:
+                self.purged += purged
+            logger.info(f"Purged expired idempotency keys | count={purged}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.db_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "retention_seconds": self.retention_seconds,
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.db_hits) / lookups, 4) if lookups else 0.0,
+                "memory_hit_rate": round(self.memory_hits / lookups, 4) if lookups else 0.0,
+                "conflicts": self.conflicts,
+                "mismatches": self.mismatches,
+                "stored": self.stored,
+                "purged": self.purged,
+            }
+
+idempotency_store = IdempotencyStore()
+
+@lru_cache(maxsize=None)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+# Run a write endpoint at most once per Idempotency-Key.
+# Without a key the handler simply runs. With one, the first request's
+# response (serialized through response_model) is stored and returned
+# byte-for-byte to every replay; a failed first request releases the key.
+def run_idempotent(
+    scope: str,
+    key: Optional[str],
+    payload: Any,
+    handler: Callable[[], Any],
+    response_model: Any,
+    principal: Optional[str] = None,
+) -> Any:
+    if key is None:
+        return handler()
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters.",
+        )
+
+    key_hash = hash_key(scope, principal, key)
+    request_hash = hash_request(payload)
+    replay = idempotency_store.begin(scope, key_hash, request_hash)
+    if replay is not None:
+        return replay
+
+    try:
+        result = handler()
+        adapter = _adapter(response_model)
+        body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+    except Exception:
+        idempotency_store.release(key_hash)
+        raise
+
+    idempotency_store.complete(key_hash, request_hash, status.HTTP_200_OK, body)
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,270 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal
+from .services import record_clicks_batch_isolated
+
+logger = logging.getLogger(__name__)
+
+# In-process click ingestion for /integrations/redirect.
+# The redirect enqueues a click and returns; a writer thread drains the
+# bounded queue every flush interval and writes clicks and referrals in
+# batches. When the queue is full, or the database is failing or slow,
+# clicks are appended to an NDJSON spool file and replayed once writes
+# are healthy again.
+class ClickIngestor:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_queue_size: int = settings.CLICK_QUEUE_MAX_SIZE,
+        batch_size: int = settings.CLICK_BATCH_SIZE,
+        flush_interval_ms: int = settings.CLICK_FLUSH_INTERVAL_MS,
+        enqueue_timeout_ms: int = settings.CLICK_ENQUEUE_TIMEOUT_MS,
+        slow_flush_seconds: float = settings.CLICK_SLOW_FLUSH_SECONDS,
+        degraded_cooldown_seconds: float = settings.CLICK_DEGRADED_COOLDOWN_SECONDS,
+        spool_path: str = settings.CLICK_SPOOL_PATH,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self.slow_flush_seconds = slow_flush_seconds
+        self.degraded_cooldown_seconds = degraded_cooldown_seconds
+        self.spool_path = Path(spool_path)
+
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue_size)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._spool_lock = threading.Lock()
+        self._degraded_until = 0.0
+
+        # Metrics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.last_flush_latency_ms = 0.0
+        self.max_flush_latency_ms = 0.0
+        self._total_flush_latency_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    # Build a click record; the id is assigned up front so callers can log it
+    @staticmethod
+    def build_click(affiliate_user_id: uuid.UUID, shop_domain: Optional[str], utm_source: Optional[str]) -> dict:
+        return {
+            "id": uuid.uuid4(),
+            "affiliate_user_id": affiliate_user_id,
+            "shop_domain": shop_domain,
+            "utm_source": utm_source,
+            "created_at": datetime.now(timezone.utc),
+        }
+
+    def submit(self, click: dict) -> None:
+        if not self.running:
+            # No writer thread (e.g. scripts); write inline
+            self._flush([click])
+            return
+
+        try:
+            self._queue.put(click, timeout=self.enqueue_timeout)
+            self.enqueued += 1
+        except queue.Full:
+            # Backpressure: never block the redirect longer than the enqueue timeout
+            logger.warning("Click queue full, spooling click to disk")
+            self._spool([click])
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="click-ingestor", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Click ingestor started | batch_size={self.batch_size} | "
+            f"flush_interval={self.flush_interval}s | spool={self.spool_path}"
+        )
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        # Flush anything still queued
+        remaining = self._drain(block=False)
+        while remaining:
+            self._flush(remaining)
+            remaining = self._drain(block=False)
+
+    def _drain(self, block: bool = True) -> List[dict]:
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    # Only stop() ends the loop: if a batch can be neither written nor
+    # spooled (e.g. disk full) it is logged and lost, and the thread keeps
+    # going so submit() never falls back to inline writes
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            batch: List[dict] = []
+            try:
+                batch = self._drain()
+                if batch:
+                    self._flush(batch)
+                elif not self.degraded:
+                    self._replay_spool()
+            except Exception:
+                logger.exception(f"Click ingestor iteration failed | batch={len(batch)}")
+                self._stop_event.wait(self.flush_interval)
+
+    @property
+    def degraded(self) -> bool:
+        return time.monotonic() < self._degraded_until
+
+    def _flush(self, batch: List[dict]) -> None:
+        if self.degraded:
+            self._spool(batch)
+            return
+
+        start = time.perf_counter()
+        db = self.session_factory()
+        try:
+            written = record_clicks_batch_isolated(db, batch)
+            self.written += written
+            self.dropped += len(batch) - written
+        except Exception:
+            # Any failure (database errors, pool checkout timeouts, ...)
+            # spools the batch and switches to spooling for the cooldown
+            self.flush_failures += 1
+            self._degraded_until = time.monotonic() + self.degraded_cooldown_seconds
+            logger.exception(f"Click batch write failed, spooling {len(batch)} clicks")
+            self._spool(batch)
+            db.rollback()
+        finally:
+            db.close()
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.flushes += 1
+        self.last_flush_latency_ms = latency_ms
+        self.max_flush_latency_ms = max(self.max_flush_latency_ms, latency_ms)
+        self._total_flush_latency_ms += latency_ms
+
+        if latency_ms / 1000 > self.slow_flush_seconds:
+            logger.warning(
+                f"Slow click flush ({latency_ms:.0f} ms), spooling for "
+                f"{self.degraded_cooldown_seconds}s"
+            )
+            self._degraded_until = time.monotonic() + self.degraded_cooldown_seconds
+
+    def _spool(self, clicks: List[dict]) -> None:
+        lines = [
+            json.dumps({
+                "id": str(c["id"]),
+                "affiliate_user_id": str(c["affiliate_user_id"]),
+                "shop_domain": c.get("shop_domain"),
+                "utm_source": c.get("utm_source"),
+                "created_at": c["created_at"].isoformat(),
+            })
+            for c in clicks
+        ]
+        with self._spool_lock:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self.spooled += len(clicks)
+
+    @staticmethod
+    def _load_spooled(line: str) -> dict:
+        data = json.loads(line)
+        return {
+            "id": uuid.UUID(data["id"]),
+            "affiliate_user_id": uuid.UUID(data["affiliate_user_id"]),
+            "shop_domain": data.get("shop_domain"),
+            "utm_source": data.get("utm_source"),
+            "created_at": datetime.fromisoformat(data["created_at"]),
+        }
+
+    # Move the spool aside and write it back in batches; whatever cannot be
+    # written is re-spooled by _flush
+    def _replay_spool(self) -> None:
+        replay_path = self.spool_path.with_suffix(self.spool_path.suffix + ".replay")
+        with self._spool_lock:
+            # A leftover replay file means a previous replay was interrupted;
+            # finish it first (already-written clicks fail on their primary key
+            # and are dropped by the isolated writer)
+            if not replay_path.exists():
+                if not self.spool_path.exists() or self.spool_path.stat().st_size == 0:
+                    return
+                os.replace(self.spool_path, replay_path)
+
+        logger.info(f"Replaying spooled clicks from {replay_path}")
+        batch: List[dict] = []
+        with open(replay_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    batch.append(self._load_spooled(line))
+                except (ValueError, KeyError):
+                    logger.warning(f"Skipping malformed spooled click: {line.strip()}")
+                    continue
+                if len(batch) >= self.batch_size:
+                    self._replay_batch(batch)
+                    batch = []
+        if batch:
+            self._replay_batch(batch)
+        replay_path.unlink()
+
+    def _replay_batch(self, batch: List[dict]) -> None:
+        spooled_before = self.spooled
+        self._flush(batch)
+        if self.spooled == spooled_before:
+            self.replayed += len(batch)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "degraded": self.degraded,
+            "queue_depth": self._queue.qsize(),
+            "queue_max_size": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "flushes": self.flushes,
+            "flush_failures": self.flush_failures,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 2),
+            "avg_flush_latency_ms": round(self._total_flush_latency_ms / self.flushes, 2) if self.flushes else 0.0,
+            "max_flush_latency_ms": round(self.max_flush_latency_ms, 2),
+            "spool_bytes": self.spool_path.stat().st_size if self.spool_path.exists() else 0,
+        }
+
+click_ingestor = ClickIngestor()
@@ -13,11 +13,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ecommerce", tags=["E-commerce Integration"])
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
 from sqlalchemy.orm import Session
+from typing import Optional
 import logging
 
 from core.database import get_db
+from apps.idempotency.store import run_idempotent
 from .services import handle_install_callback
 from .schemas import (
     AffiliateInstallIn,
@@ -33,6 +35,7 @@ router = APIRouter(prefix="/ecommerce", tags=["E-commerce Integration"])
 @router.post("/install/callback", response_model=InstallCallbackResponse)
 def affiliate_install_callback(
     payload: AffiliateInstallIn,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
 ):
     logger.info(
@@ -42,29 +45,39 @@ def affiliate_install_callback(
         f"shop={payload.shop_domain}"
     )
 
-    install = handle_install_callback(
-        db=db,
-        affiliate_link_id=payload.affiliate_link_id,
-        lead_id=payload.lead_id,
-        shop_domain=payload.shop_domain,
-    )
+    def process():
+        install = handle_install_callback(
+            db=db,
+            affiliate_link_id=payload.affiliate_link_id,
+            lead_id=payload.lead_id,
+            shop_domain=payload.shop_domain,
+        )
+
+        if not install:
+            logger.info(
+                "E-commerce install ignored (no persistence required) | "
+                f"affiliate_link_id={payload.affiliate_link_id}"
+            )
+            return WebhookAck(
+                type="ack",
+                status="ok",
+                message="E-commerce install ignored",
+            )
 
-    if not install:
         logger.info(
-            "E-commerce install ignored (no persistence required) | "
-            f"affiliate_link_id={payload.affiliate_link_id}"
+            "E-commerce install completed successfully | "
+            f"install_id={install.id}"
         )
-        return WebhookAck(
-            type="ack",
-            status="ok",
-            message="E-commerce install ignored",
-        )
-
-    logger.info(
-        "E-commerce install completed successfully | "
-        f"install_id={install.id}"
+        return AffiliateInstallOut.model_validate(install)
+
+    # Webhook retries carrying the same Idempotency-Key are replayed
+    return run_idempotent(
+        "ecommerce.install_callback",
+        idempotency_key,
+        payload.model_dump(),
+        process,
+        InstallCallbackResponse,
     )
-    return AffiliateInstallOut.model_validate(install)
     
 @router.get("/conversion/callback", response_model=AffiliateConversionOut)
 def ecommerce_conversion_callback(shop: str, db: Session = Depends(get_db)):
@@ -0,0 +1,225 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from apps.auth.models import User
+from core.config import settings
+from .models import AffiliateLink
+
+logger = logging.getLogger(__name__)
+
+# Process-local cache for affiliate resolution on the redirect and install
+# callback paths. Links and affiliate ids are cached for a TTL, and every
+# entry for a user is dropped as soon as the user is updated (e.g.
+# deactivated) or deleted, so a removed affiliate stops resolving. Unknown
+# ids are negatively cached for a shorter TTL in a bounded LRU so bot
+# traffic with random ids cannot hammer the database or grow memory
+# without limit.
+class AffiliateLinkCache:
+    def __init__(self, ttl_seconds: float, negative_ttl_seconds: float, negative_max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.negative_max_size = negative_max_size
+        # link id -> (affiliate_user_id, expires_at), user id -> expires_at
+        self._links: Dict[UUID, Tuple[UUID, float]] = {}
+        self._affiliates: Dict[UUID, float] = {}
+        # Keyed by ("link" | "user", id)
+        self._negative: "OrderedDict[Tuple[str, UUID], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.warmed_links = 0
+
+    # Load every affiliate link and every active link-owning affiliate
+    def warm(self, db: Session) -> int:
+        rows = (
+            db.query(AffiliateLink.id, AffiliateLink.affiliate_user_id, User.is_active)
+            .join(User, User.id == AffiliateLink.affiliate_user_id)
+            .all()
+        )
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for link_id, affiliate_user_id, is_active in rows:
+                self._links[link_id] = (affiliate_user_id, expires_at)
+                if is_active:
+                    self._affiliates[affiliate_user_id] = expires_at
+            self.warmed_links = len(rows)
+        logger.info(f"Affiliate link cache warmed | links={len(rows)}")
+        return len(rows)
+
+    def _cached_link(self, link_id: UUID) -> Optional[UUID]:
+        entry = self._links.get(link_id)
+        if entry is None:
+            return None
+        affiliate_user_id, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._links[link_id]
+            return None
+        return affiliate_user_id
+
+    def _cached_affiliate(self, user_id: UUID) -> bool:
+        expires_at = self._affiliates.get(user_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._affiliates[user_id]
+            return False
+        return True
+
+    def _is_negative(self, key: Tuple[str, UUID]) -> bool:
+        expires_at = self._negative.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._negative[key]
+            return False
+        return True
+
+    def _remember_negative(self, key: Tuple[str, UUID]) -> None:
+        with self._lock:
+            self._negative[key] = time.monotonic() + self.negative_ttl_seconds
+            self._negative.move_to_end(key)
+            while len(self._negative) > self.negative_max_size:
+                self._negative.popitem(last=False)
+
+    def add_link(self, link_id: UUID, affiliate_user_id: UUID) -> None:
+        with self._lock:
+            self._links[link_id] = (affiliate_user_id, time.monotonic() + self.ttl_seconds)
+            self._negative.pop(("link", link_id), None)
+
+    def _add_affiliate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._affiliates[user_id] = time.monotonic() + self.ttl_seconds
+            self._negative.pop(("user", user_id), None)
+
+    # Drop the affiliate and every link it owns (deactivation, deletion)
+    def invalidate_affiliate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._affiliates.pop(user_id, None)
+            self._negative.pop(("user", user_id), None)
+            for link_id in [
+                link_id for link_id, (owner_id, _) in self._links.items() if owner_id == user_id
+            ]:
+                del self._links[link_id]
+            self.invalidations += 1
+
+    def _fetch_link(self, db: Session, link_id: UUID) -> Optional[UUID]:
+        affiliate_user_id = (
+            db.query(AffiliateLink.affiliate_user_id)
+            .filter(AffiliateLink.id == link_id)
+            .scalar()
+        )
+        if affiliate_user_id is None:
+            self._remember_negative(("link", link_id))
+            return None
+        self.add_link(link_id, affiliate_user_id)
+        return affiliate_user_id
+
+    def _fetch_affiliate(self, db: Session, user_id: UUID) -> bool:
+        exists = (
+            db.query(User.id)
+            .filter(User.id == user_id, User.is_active == True)
+            .first()
+        ) is not None
+        if not exists:
+            self._remember_negative(("user", user_id))
+            return False
+        self._add_affiliate(user_id)
+        return True
+
+    # Affiliate user id for an affiliate link id, or None if the link does not exist
+    def resolve_link(self, db: Session, link_id: UUID) -> Optional[UUID]:
+        with self._lock:
+            affiliate_user_id = self._cached_link(link_id)
+            if affiliate_user_id is not None:
+                self.hits += 1
+                return affiliate_user_id
+            if self._is_negative(("link", link_id)):
+                self.negative_hits += 1
+                return None
+            self.misses += 1
+
+        return self._fetch_link(db, link_id)
+
+    # Whether user_id is an active affiliate
+    def affiliate_exists(self, db: Session, user_id: UUID) -> bool:
+        with self._lock:
+            if self._cached_affiliate(user_id):
+                self.hits += 1
+                return True
+            if self._is_negative(("user", user_id)):
+                self.negative_hits += 1
+                return False
+            self.misses += 1
+
+        return self._fetch_affiliate(db, user_id)
+
+    # Redirect utm_source may be an affiliate link id (tracking URLs) or an
+    # affiliate user id; returns the affiliate user id or None. Counted as
+    # one lookup: a cached user id is a hit even though it is not a link.
+    def resolve_redirect_source(self, db: Session, utm_source: UUID) -> Optional[UUID]:
+        with self._lock:
+            affiliate_user_id = self._cached_link(utm_source)
+            if affiliate_user_id is not None:
+                self.hits += 1
+                return affiliate_user_id
+            if self._cached_affiliate(utm_source):
+                self.hits += 1
+                return utm_source
+            link_negative = self._is_negative(("link", utm_source))
+            user_negative = self._is_negative(("user", utm_source))
+            if link_negative and user_negative:
+                self.negative_hits += 1
+                return None
+            self.misses += 1
+
+        if not link_negative:
+            affiliate_user_id = self._fetch_link(db, utm_source)
+            if affiliate_user_id is not None:
+                return affiliate_user_id
+        if not user_negative and self._fetch_affiliate(db, utm_source):
+            return utm_source
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._links.clear()
+            self._affiliates.clear()
+            self._negative.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "links": len(self._links),
+                "affiliates": len(self._affiliates),
+                "negative_entries": len(self._negative),
+                "warmed_links": self.warmed_links,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+affiliate_link_cache = AffiliateLinkCache(
+    ttl_seconds=settings.AFFILIATE_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.AFFILIATE_NEGATIVE_CACHE_TTL_SECONDS,
+    negative_max_size=settings.AFFILIATE_NEGATIVE_CACHE_MAX_SIZE,
+)
+
+# Any ORM update or delete of a user (e.g. deactivation) drops their cached
+# affiliate id and links
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(mapper, connection, target) -> None:
+    affiliate_link_cache.invalidate_affiliate(target.id)
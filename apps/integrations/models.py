@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint
 from datetime import datetime, timezone
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -12,8 +12,8 @@ class AffiliateClick(Base):
    
     affiliate_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
-    # e-commerce store domain
-    shop_domain = Column(String(255), nullable=False, index=True)
+    # e-commerce store domain; None for click-only redirects without ?shop=
+    shop_domain = Column(String(255), nullable=True, index=True)
     
     # For debugging / should match with affiliate_user_id
     utm_source = Column(String(255), nullable=True)
@@ -66,6 +66,10 @@ class AffiliateInstall(Base):
 
 class AffiliateReferral(Base):
     __tablename__ = "affiliate_referrals"
+    __table_args__ = (
+        # One referral per affiliate and shop; target of the click upsert
+        UniqueConstraint("affiliate_user_id", "shop_domain", name="uq_affiliate_referrals_affiliate_shop"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     affiliate_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
@@ -6,9 +6,10 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 from core.database import get_db
 from apps.auth.models import User
-from apps.auth.security import get_current_user
-from .models import AffiliateClick, AffiliateLink
-from .services import record_click
+from apps.auth.security import get_current_admin, get_current_user
+from .models import AffiliateLink
+from .click_pipeline import click_ingestor
+from .link_cache import affiliate_link_cache
 from .schemas import AffiliateLinkOut
 from .utils import normalize_shop_domain, validate_shop_domain
 import logging
@@ -42,6 +43,8 @@ def generate_affiliate_link(
         db.commit()
         db.refresh(affiliate_link)
 
+    affiliate_link_cache.add_link(affiliate_link.id, affiliate_id)
+
     tracking_url = (
         f"https://yourdomain.com/integrations/redirect"
         f"?utm_source={affiliate_link.id}"
@@ -64,8 +67,9 @@ def affiliate_redirect(
         f"Integration redirect received | affiliate_id={utm_source} | raw_shop={shop}"
     )
 
-    affiliate = db.query(User).filter(User.id == utm_source).first()
-    if not affiliate:
+    # utm_source is an affiliate link id (tracking URLs) or an affiliate user id
+    affiliate_user_id = affiliate_link_cache.resolve_redirect_source(db, utm_source)
+    if affiliate_user_id is None:
         logger.warning(f"Affiliate not found: {utm_source}")
         raise HTTPException(status_code=404, detail="Affiliate not found")
 
@@ -76,33 +80,34 @@ def affiliate_redirect(
             logger.warning(f"Invalid shop domain: {shop}")
             raise HTTPException(status_code=400, detail="Invalid e-commerce store domain")
 
-        click, referral = record_click(
-            db=db,
-            affiliate_user_id=utm_source,
-            shop_domain=shop,
-            utm_source=str(utm_source),
-        )
+    # Click and referral are written asynchronously by the click ingestor
+    click = click_ingestor.build_click(
+        affiliate_user_id=affiliate_user_id,
+        shop_domain=shop,
+        utm_source=str(utm_source),
+    )
+    click_ingestor.submit(click)
 
-        logger.info(
-            f"Click recorded with shop | click_id={click.id} | referral_id={referral.id}"
-        )
+    if shop:
+        logger.info(f"Click queued with shop | click_id={click['id']}")
 
         redirect_url = f"https://{shop}/apps/your-app"
         logger.info(f"Redirecting to {redirect_url}")
         return RedirectResponse(url=redirect_url)
 
     # Click-only case
-    click = AffiliateClick(
-        affiliate_user_id=utm_source,
-        utm_source=str(utm_source),
-        created_at=datetime.now(timezone.utc),
-    )
-    db.add(click)
-    db.commit()
-    db.refresh(click)
-
-    logger.info(f"Click recorded without shop attribution | click_id={click.id}")
+    logger.info(f"Click queued without shop attribution | click_id={click['id']}")
 
     return RedirectResponse(
         url="https://yourdomain.com/integrations/landing"
-    )
\ No newline at end of file
+    )
+
+# Admin: Click ingestion queue and flush metrics
+@router.get("/clicks/stats")
+def get_click_ingestion_stats(current_admin: dict = Depends(get_current_admin)):
+    return click_ingestor.stats()
+
+# Admin: Affiliate link resolution cache metrics
+@router.get("/links/cache/stats")
+def get_affiliate_link_cache_stats(current_admin: dict = Depends(get_current_admin)):
+    return affiliate_link_cache.stats()
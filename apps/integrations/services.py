@@ -1,10 +1,16 @@
+from sqlalchemy import insert, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+from typing import List
 from uuid import UUID
 import logging
+import uuid
 
 from apps.leads.models import Lead
-from .models import AffiliateClick, AffiliateLink, AffiliateReferral, AffiliateInstall
+from .models import AffiliateClick, AffiliateReferral, AffiliateInstall
+from .link_cache import affiliate_link_cache
 from apps.accounts.models import Account
 from .utils import (
     normalize_shop_domain,
@@ -15,7 +21,25 @@ from .utils import (
 
 logger = logging.getLogger(__name__)
 
-# Click handler to record affiliate click and referral
+# Upsert statement for referrals keyed on (affiliate_user_id, shop_domain).
+# An existing referral only moves forward to a newer click.
+def _referral_upsert(rows: List[dict]):
+    stmt = pg_insert(AffiliateReferral).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        constraint="uq_affiliate_referrals_affiliate_shop",
+        set_={
+            "last_click_id": excluded.last_click_id,
+            "last_clicked_at": excluded.last_clicked_at,
+            "updated_at": excluded.updated_at,
+        },
+        where=or_(
+            AffiliateReferral.last_clicked_at.is_(None),
+            AffiliateReferral.last_clicked_at <= excluded.last_clicked_at,
+        ),
+    )
+
+# Click handler to record affiliate click and referral in one transaction
 def record_click(db: Session, affiliate_user_id: UUID, shop_domain: str, utm_source: str = None):
     logger.info(f"Recording affiliate click | affiliate_id={affiliate_user_id} | shop={shop_domain}")
     # Normalize & validate shop domain
@@ -23,47 +47,121 @@ def record_click(db: Session, affiliate_user_id: UUID, shop_domain: str, utm_sou
     if not validate_shop_domain(shop_domain):
         raise ValueError("Invalid e-commerce store domain format")
 
-    # Create click record
-    click = AffiliateClick(
-        affiliate_user_id=affiliate_user_id,
-        shop_domain=shop_domain,
-        utm_source=utm_source,
-        created_at=datetime.now(timezone.utc)
-    )
-    db.add(click)
-    db.commit()
-    db.refresh(click)
-
-    # Retrieve or create referral
-    referral = (
-        db.query(AffiliateReferral)
-        .filter_by(affiliate_user_id=affiliate_user_id, shop_domain=shop_domain)
-        .first()
-    )
+    now = datetime.now(timezone.utc)
 
-    if referral:
-        logger.info(f"Existing referral found | referral_id={referral.id}")
-        referral.last_click_id = click.id
-        referral.last_clicked_at = datetime.now(timezone.utc)
-        referral.updated_at = datetime.now(timezone.utc)
-    else:
-        logger.info("No referral found — creating new referral")
-        referral = AffiliateReferral(
+    try:
+        # Create click record
+        click = AffiliateClick(
             affiliate_user_id=affiliate_user_id,
             shop_domain=shop_domain,
-            last_click_id=click.id,
-            last_clicked_at=datetime.now(timezone.utc),
-            status="pending",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            utm_source=utm_source,
+            created_at=now
+        )
+        db.add(click)
+        db.flush()
+
+        # Create the referral or point the existing one at this click
+        stmt = _referral_upsert([{
+            "id": uuid.uuid4(),
+            "affiliate_user_id": affiliate_user_id,
+            "shop_domain": shop_domain,
+            "last_click_id": click.id,
+            "last_clicked_at": now,
+            "status": "pending",
+            "created_at": now,
+            "updated_at": now,
+        }]).returning(AffiliateReferral)
+        referral = db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).first()
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if referral is None:
+        # A newer click already owns the referral; return it unchanged
+        referral = (
+            db.query(AffiliateReferral)
+            .filter_by(affiliate_user_id=affiliate_user_id, shop_domain=shop_domain)
+            .first()
         )
-        db.add(referral)
 
-    db.commit()
     logger.info(f"Referral resolved | referral_id={referral.id} | status={referral.status}")
-    db.refresh(referral)
     return click, referral
 
+# Batch click writer used by the click ingestion pipeline.
+# Each click is a dict with id, affiliate_user_id, shop_domain, utm_source
+# and created_at. Clicks are inserted with one executemany; referrals for
+# (affiliate_user_id, shop_domain) pairs are upserted in one statement with
+# the latest click in the batch. Caller commits.
+def record_clicks_batch(db: Session, clicks: List[dict]) -> None:
+    if not clicks:
+        return
+
+    rows = [
+        {
+            "id": c["id"],
+            "affiliate_user_id": c["affiliate_user_id"],
+            "shop_domain": c.get("shop_domain"),
+            "utm_source": c.get("utm_source"),
+            "created_at": c["created_at"],
+        }
+        for c in clicks
+    ]
+    db.execute(insert(AffiliateClick), rows)
+
+    latest = {}
+    for row in rows:
+        if not row["shop_domain"]:
+            continue
+        key = (row["affiliate_user_id"], row["shop_domain"])
+        if key not in latest or row["created_at"] >= latest[key]["created_at"]:
+            latest[key] = row
+    if not latest:
+        return
+
+    # Upsert in key order so concurrent batches lock referral rows in the
+    # same order and cannot deadlock each other
+    now = datetime.now(timezone.utc)
+    db.execute(_referral_upsert([
+        {
+            "id": uuid.uuid4(),
+            "affiliate_user_id": row["affiliate_user_id"],
+            "shop_domain": row["shop_domain"],
+            "last_click_id": row["id"],
+            "last_clicked_at": row["created_at"],
+            "status": "pending",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for _, row in sorted(latest.items(), key=lambda item: (str(item[0][0]), item[0][1]))
+    ]))
+
+# Write a batch, isolating rows that violate constraints so one bad click
+# does not drop the whole batch. Returns the number of clicks written.
+def record_clicks_batch_isolated(db: Session, clicks: List[dict]) -> int:
+    try:
+        record_clicks_batch(db, clicks)
+        db.commit()
+        return len(clicks)
+    except IntegrityError:
+        db.rollback()
+
+    written = 0
+    for click in clicks:
+        try:
+            record_clicks_batch(db, [click])
+            db.commit()
+            written += 1
+        except IntegrityError as e:
+            db.rollback()
+            logger.warning(
+                f"Dropping invalid affiliate click | click_id={click['id']} | error={e.orig}"
+            )
+    return written
+
 # Get referral by shop domain
 def get_referral_by_shop(db: Session, shop_domain: str):
     shop_domain = normalize_shop_domain(shop_domain)
@@ -87,22 +185,16 @@ def handle_install_callback(
         f"lead_id={lead_id} | shop={shop_domain}"
     )
 
-    # Resolve affiliate link (source of truth)
-    affiliate_link = (
-        db.query(AffiliateLink)
-        .filter_by(id=affiliate_link_id)
-        .first()
-    )
+    # Resolve affiliate link (source of truth, cached per process)
+    affiliate_user_id = affiliate_link_cache.resolve_link(db, affiliate_link_id)
 
-    if not affiliate_link:
+    if affiliate_user_id is None:
         logger.warning(
             f"Affiliate install ignored — affiliate link not found | "
             f"affiliate_link_id={affiliate_link_id}"
         )
         return None
 
-    affiliate_user_id = affiliate_link.affiliate_user_id
-
     # Resolve or create lead
     lead = None
     if lead_id:
@@ -112,7 +204,7 @@ def handle_install_callback(
     if not lead:
         lead = Lead(
             source="affiliate",
-            affiliate_link_id=affiliate_link.id,
+            affiliate_link_id=affiliate_link_id,
             created_at=datetime.now(timezone.utc),
         )
         db.add(lead)
@@ -123,14 +215,14 @@ def handle_install_callback(
 
     # Ensure attribution is correct
     if lead.affiliate_link_id is None:
-        lead.affiliate_link_id = affiliate_link.id
+        lead.affiliate_link_id = affiliate_link_id
         db.commit()
-        logger.info(f"Lead attributed to affiliate link | lead_id={lead.id} | affiliate_link_id={affiliate_link.id}")
+        logger.info(f"Lead attributed to affiliate link | lead_id={lead.id} | affiliate_link_id={affiliate_link_id}")
 
     # Idempotency check
     existing_install = (
         db.query(AffiliateInstall)
-        .filter_by(affiliate_link_id=affiliate_link.id, lead_id=lead.id)
+        .filter_by(affiliate_link_id=affiliate_link_id, lead_id=lead.id)
         .first()
     )
 
@@ -144,7 +236,7 @@ def handle_install_callback(
     # Create install record
     install = AffiliateInstall(
         affiliate_user_id=affiliate_user_id,
-        affiliate_link_id=affiliate_link.id,
+        affiliate_link_id=affiliate_link_id,
         lead_id=lead.id,
         shop_domain=shop_domain,
         installed_at=datetime.now(timezone.utc),
@@ -156,7 +248,7 @@ def handle_install_callback(
     logger.info(
         "Affiliate install persisted successfully | "
         f"install_id={install.id} | "
-        f"affiliate_link_id={affiliate_link.id} | "
+        f"affiliate_link_id={affiliate_link_id} | "
         f"lead_id={lead.id} | "
         f"shop={shop_domain}"
     )
@@ -0,0 +1,164 @@
+import logging
+import uuid
+from typing import IO, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from apps.accounts.models import Account
+from apps.leads.scoring import resolve_lead_scores
+from core.file_import import format_validation_error, iter_rows
+from .models import Lead, LeadDetails, LeadProduct, lead_accounts
+from .schemas import LeadCreate, LeadDetailsBase, BulkLeadImportError, BulkLeadImportResponse
+
+logger = logging.getLogger(__name__)
+
+BULK_IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# CSV columns holding lists are separated by ";"
+CSV_LIST_FIELDS = ("products", "account_ids")
+CSV_DETAILS_PREFIX = "details."
+
+LEAD_COLUMNS = [
+    "title", "first_name", "last_name", "email", "phone_code", "phone_no",
+    "entry_point", "source", "priority", "lead_stage", "lead_substage",
+    "company_name", "industry", "company_size", "website",
+]
+DETAILS_COLUMNS = list(LeadDetailsBase.model_fields.keys())
+
+# Lead CSV rows: "details.*" columns nest under details and list columns
+# are split on ";"
+def _csv_row_to_payload(row: dict) -> dict:
+    payload = {}
+    details = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = key.strip()
+        value = value.strip() if isinstance(value, str) else value
+        if value in ("", None):
+            continue
+        if key.startswith(CSV_DETAILS_PREFIX):
+            field = key[len(CSV_DETAILS_PREFIX):]
+            details[field] = [v.strip() for v in value.split(";") if v.strip()] if field == "tags" else value
+        elif key in CSV_LIST_FIELDS:
+            payload[key] = [v.strip() for v in value.split(";") if v.strip()]
+        else:
+            payload[key] = value
+    if details:
+        payload["details"] = details
+    return payload
+
+# Insert one chunk of validated leads with executemany inserts and a single commit
+def _insert_chunk(db: Session, chunk: List[Tuple[int, LeadCreate]]) -> None:
+    scores = resolve_lead_scores(
+        (lead.lead_stage, lead.lead_substage) for _, lead in chunk
+    )
+
+    requested_account_ids = {
+        account_id
+        for _, lead in chunk
+        for account_id in (lead.account_ids or [])
+    }
+    existing_account_ids = set()
+    if requested_account_ids:
+        existing_account_ids = {
+            row.id
+            for row in db.query(Account.id).filter(Account.id.in_(requested_account_ids))
+        }
+
+    lead_rows = []
+    details_rows = []
+    product_rows = []
+    account_rows = []
+    for (_, lead), score in zip(chunk, scores):
+        lead_id = uuid.uuid4()
+        row = {column: getattr(lead, column) for column in LEAD_COLUMNS}
+        row["id"] = lead_id
+        row["score"] = score
+        lead_rows.append(row)
+
+        if lead.details:
+            details = lead.details.model_dump()
+            details_rows.append({"lead_id": lead_id, **{c: details.get(c) for c in DETAILS_COLUMNS}})
+
+        for product in lead.products or []:
+            product_rows.append({"lead_id": lead_id, "product": product})
+
+        for account_id in dict.fromkeys(lead.account_ids or []):
+            if account_id in existing_account_ids:
+                account_rows.append({"lead_id": lead_id, "account_id": account_id})
+
+    db.execute(insert(Lead), lead_rows)
+    if details_rows:
+        db.execute(insert(LeadDetails), details_rows)
+    if product_rows:
+        db.execute(insert(LeadProduct), product_rows)
+    if account_rows:
+        db.execute(lead_accounts.insert(), account_rows)
+    db.commit()
+
+# Stream, validate, score and insert leads in chunks. Rows that fail
+# validation are reported individually; a chunk that fails to insert is
+# rolled back and all of its rows are reported as failed.
+def bulk_import_leads(
+    db: Session,
+    stream: IO[bytes],
+    fmt: str,
+    chunk_size: int = BULK_IMPORT_CHUNK_SIZE,
+) -> BulkLeadImportResponse:
+    total_rows = 0
+    imported = 0
+    failed = 0
+    errors: List[BulkLeadImportError] = []
+
+    def record_error(row_number: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(BulkLeadImportError(row=row_number, error=message))
+
+    def flush(chunk: List[Tuple[int, LeadCreate]]):
+        nonlocal imported
+        if not chunk:
+            return
+        try:
+            _insert_chunk(db, chunk)
+            imported += len(chunk)
+        except Exception as e:
+            db.rollback()
+            logger.exception(
+                f"Bulk lead import chunk failed | first_row={chunk[0][0]} | size={len(chunk)}"
+            )
+            for row_number, _ in chunk:
+                record_error(row_number, f"Insert failed: {e.__class__.__name__}")
+
+    chunk: List[Tuple[int, LeadCreate]] = []
+    for row_number, payload, error in iter_rows(stream, fmt, _csv_row_to_payload):
+        total_rows += 1
+        if error:
+            record_error(row_number, error)
+            continue
+        try:
+            lead = LeadCreate.model_validate(payload)
+        except ValidationError as e:
+            record_error(row_number, format_validation_error(e))
+            continue
+
+        chunk.append((row_number, lead))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    flush(chunk)
+
+    logger.info(
+        f"Bulk lead import finished | total={total_rows} | imported={imported} | failed={failed}"
+    )
+    return BulkLeadImportResponse(
+        total_rows=total_rows,
+        imported=imported,
+        failed=failed,
+        errors=errors,
+    )
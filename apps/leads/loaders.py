@@ -0,0 +1,41 @@
+from enum import Enum
+from sqlalchemy.orm import Query, Session, joinedload, lazyload, selectinload
+from .models import Lead
+
+# Named relationship loading profiles for Lead queries.
+# Lead relationships default to lazy loading; each call site picks the
+# profile matching what it actually reads.
+class LeadLoad(str, Enum):
+    # Only the leads row; relationships load on first access
+    MINIMAL = "minimal"
+    # What LeadResponse serializes: details and products
+    DETAIL = "detail"
+    # Every relationship, collections via selectinload to avoid cartesian joins
+    FULL = "full"
+
+def lead_load_options(profile: LeadLoad) -> list:
+    if profile == LeadLoad.MINIMAL:
+        return [lazyload("*")]
+
+    if profile == LeadLoad.DETAIL:
+        return [
+            selectinload(Lead.details).lazyload("*"),
+            selectinload(Lead.products).lazyload("*"),
+            lazyload("*"),
+        ]
+
+    return [
+        joinedload(Lead.details).lazyload("*"),
+        joinedload(Lead.user).lazyload("*"),
+        joinedload(Lead.affiliate_link).lazyload("*"),
+        selectinload(Lead.accounts).lazyload("*"),
+        selectinload(Lead.persons).lazyload("*"),
+        selectinload(Lead.notes).lazyload("*"),
+        selectinload(Lead.products).lazyload("*"),
+        selectinload(Lead.opportunities).lazyload("*"),
+        selectinload(Lead.interactions).lazyload("*"),
+        selectinload(Lead.followups).lazyload("*"),
+    ]
+
+def query_leads(db: Session, profile: LeadLoad = LeadLoad.MINIMAL) -> Query:
+    return db.query(Lead).options(*lead_load_options(profile))
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Boolean, Column, String, DateTime, ForeignKey, Table, Integer, Text, JSON
+from sqlalchemy import Boolean, Column, String, DateTime, ForeignKey, Index, Table, Integer, Text, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -20,6 +20,10 @@ lead_accounts = Table(
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        # Keyset pagination for lead listings
+        Index("ix_leads_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255))
@@ -59,18 +63,18 @@ class Lead(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     affiliate_link_id = Column(UUID(as_uuid=True), ForeignKey("affiliate_links.id"), nullable=True, index=True)
 
-    # Relationships
-    accounts = relationship("Account", secondary="lead_accounts", back_populates="contacts", lazy="joined")
-    persons = relationship("PersonOfContact", secondary="person_leads", back_populates="leads", lazy="joined")
-    details = relationship("LeadDetails", uselist=False, back_populates="lead", lazy="joined")
-    notes = relationship("LeadNote", back_populates="lead", lazy="joined")
-    products = relationship("LeadProduct", back_populates="lead", lazy="joined")
-    opportunities = relationship("Opportunity", secondary="opportunity_leads", back_populates="leads", lazy="joined")
-    user = relationship("User", back_populates="leads", overlaps="owner", lazy="joined")
+    # Relationships (lazy by default; pick a LeadLoad profile per query)
+    accounts = relationship("Account", secondary="lead_accounts", back_populates="contacts")
+    persons = relationship("PersonOfContact", secondary="person_leads", back_populates="leads")
+    details = relationship("LeadDetails", uselist=False, back_populates="lead")
+    notes = relationship("LeadNote", back_populates="lead")
+    products = relationship("LeadProduct", back_populates="lead")
+    opportunities = relationship("Opportunity", secondary="opportunity_leads", back_populates="leads")
+    user = relationship("User", back_populates="leads", overlaps="owner")
     owner = relationship("User", back_populates="leads")
-    affiliate_link = relationship("AffiliateLink", back_populates="leads", lazy="joined")
-    interactions = relationship("Interaction", back_populates="lead", lazy="joined")
-    followups = relationship("FollowUp", back_populates="lead", lazy="joined")
+    affiliate_link = relationship("AffiliateLink", back_populates="leads")
+    interactions = relationship("Interaction", back_populates="lead")
+    followups = relationship("FollowUp", back_populates="lead")
 
 class LeadDetails(Base):
     __tablename__ = "lead_details"
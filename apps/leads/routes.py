@@ -1,22 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List
-from apps.auth.security import get_current_user
+from typing import List, Optional
+from apps.auth.security import get_current_admin, get_current_user
+from apps.auth.cache import invalidate_user
 from core.database import get_db
+from core.file_import import detect_format
 from .models import Lead
-from .schemas import LeadResponse, LeadCreate, LeadUpdate, LeadValidationRequest, LeadConvertResponse
+from .schemas import LeadResponse, LeadCreate, LeadUpdate, LeadValidationRequest, LeadConvertResponse, BulkLeadImportResponse
 from .services import (
     convert_lead_to_contact, 
     validate_lead_existence,
     create_lead_service,
     update_lead_service,
     soft_delete_lead_service,
-    restore_lead_service
+    restore_lead_service,
+    list_leads_page
 )
+from .loaders import LeadLoad, query_leads
+from .bulk_import import bulk_import_leads
 from apps.accounts.models import Account
 from apps.auth.models import User
 from apps.leads import schemas
+from apps.leads.scoring import stage_catalog
 
 router = APIRouter(prefix="/leads", tags=["Leads"])
 
@@ -28,6 +34,19 @@ def create_lead(lead: LeadCreate,
     new_lead = create_lead_service(db, lead)
     return new_lead
 
+# Bulk import leads from a CSV or NDJSON file
+@router.post("/bulk", response_model=BulkLeadImportResponse)
+def bulk_create_leads(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson; inferred from the file when omitted"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    fmt = detect_format(format, file.filename, file.content_type)
+    if not fmt:
+        raise HTTPException(status_code=400, detail="Unsupported import format. Use csv or ndjson.")
+    return bulk_import_leads(db, file.file, fmt)
+
 # Validate Lead
 @router.post("/validate", response_model=dict)
 def validate_lead(
@@ -44,16 +63,40 @@ def validate_lead(
     )
     return result
 
+# Admin: Stage catalog reload status
+@router.get("/scoring/catalog", response_model=schemas.StageCatalogStatus)
+def get_stage_catalog_status(current_admin: dict = Depends(get_current_admin)):
+    return stage_catalog.stats()
+
+# Admin: Force a stage catalog reload
+@router.post("/scoring/catalog/reload", response_model=schemas.StageCatalogStatus)
+def reload_stage_catalog(current_admin: dict = Depends(get_current_admin)):
+    stage_catalog.reload(force=True)
+    return stage_catalog.stats()
+
 # Get Leads
+# Passing limit (and cursor for later pages) switches to keyset pagination;
+# the next page's cursor is returned in the X-Next-Cursor header.
 @router.get("/", response_model=List[LeadResponse])
-def get_leads(db: Session = Depends(get_db), 
+def get_leads(response: Response,
+              limit: Optional[int] = Query(None, ge=1, le=500),
+              cursor: Optional[str] = Query(None),
+              include: List[str] = Query([], description="accounts, details, products (comma separated or repeated)"),
+              db: Session = Depends(get_db), 
               current_user: dict = Depends(get_current_user)):
-    return db.query(Lead).filter(Lead.is_deleted.is_(False)).all()
+    if limit is None and cursor is None:
+        return query_leads(db, LeadLoad.DETAIL).filter(Lead.is_deleted.is_(False)).all()
+
+    include_values = [v.strip() for value in include for v in value.split(",") if v.strip()]
+    leads, next_cursor = list_leads_page(db, limit or 50, cursor, include_values)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return leads
 
 @router.get("/{lead_id}", response_model=LeadResponse)
 def get_lead(lead_id: UUID, db: Session = Depends(get_db), 
              current_user: dict = Depends(get_current_user)):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.DETAIL).filter(Lead.id == lead_id).first()
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     return lead
@@ -82,7 +125,7 @@ def get_account_contacts(account_id: UUID, db: Session = Depends(get_db),
 def add_contact_to_account(account_id: UUID, lead_id: UUID, db: Session = Depends(get_db),
                            current_user: dict = Depends(get_current_user)):
     account = db.query(Account).filter(Account.id == account_id).first()
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.MINIMAL).filter(Lead.id == lead_id).first()
 
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
@@ -100,7 +143,7 @@ def add_contact_to_account(account_id: UUID, lead_id: UUID, db: Session = Depend
 def remove_contact_from_account(account_id: UUID, lead_id: UUID, db: Session = Depends(get_db),
                                 current_user: dict = Depends(get_current_user)):
     account = db.query(Account).filter(Account.id == account_id).first()
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.MINIMAL).filter(Lead.id == lead_id).first()
 
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
@@ -128,7 +171,7 @@ def convert_lead(lead_id: UUID, db: Session = Depends(get_db),
 @router.put("/{lead_id}/transfer/{new_user_id}", response_model=dict)
 def transfer_lead_ownership(lead_id: UUID, new_user_id: UUID, db: Session = Depends(get_db),
                             current_user: dict = Depends(get_current_user)):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.MINIMAL).filter(Lead.id == lead_id).first()
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
@@ -136,10 +179,16 @@ def transfer_lead_ownership(lead_id: UUID, new_user_id: UUID, db: Session = Depe
     if not new_owner:
         raise HTTPException(status_code=404, detail="User not found")
 
+    previous_owner_id = lead.user_id
     lead.user_id = new_user_id
     db.commit()
     db.refresh(lead)
 
+    # Ownership changed; drop cached principals for both users
+    if previous_owner_id:
+        invalidate_user(previous_owner_id)
+    invalidate_user(new_user_id)
+
     return {"message": "Lead ownership transferred"}
 
 # Soft Delete, get from Trash, Restore Lead from Trash
@@ -154,7 +203,7 @@ def soft_delete_lead(lead_id: UUID, db: Session = Depends(get_db),
 @router.get("/trash/", response_model=List[LeadResponse])
 def get_deleted_leads(db: Session = Depends(get_db),
                       current_user: dict = Depends(get_current_user)):
-    return db.query(Lead).filter(Lead.is_deleted.is_(True)).all()
+    return query_leads(db, LeadLoad.DETAIL).filter(Lead.is_deleted.is_(True)).all()
 
 @router.put("/restore/{lead_id}", response_model=dict)
 def restore_lead(lead_id: UUID, db: Session = Depends(get_db),
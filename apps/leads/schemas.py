@@ -156,4 +156,22 @@ class ContactResponse(BaseModel):
     is_contact: Optional[bool] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class StageCatalogStatus(BaseModel):
+    base_path: str
+    entries: int
+    loaded_at: datetime
+    reload_count: int
+    last_reloaded_at: Optional[datetime] = None
+    watcher_running: bool
+
+class BulkLeadImportError(BaseModel):
+    row: int
+    error: str
+
+class BulkLeadImportResponse(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[BulkLeadImportError] = []
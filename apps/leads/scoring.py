@@ -1,7 +1,9 @@
 import json
+from datetime import datetime, timezone
 from pathlib import Path
 import logging
-from typing import Optional
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,50 +18,176 @@ def normalize(text: str) -> str:
         .replace("—", "-")
     )
 
-# Resolve lead score based on stage and substage json files
-def resolve_lead_score(stage: Optional[str], substage: Optional[str] = None) -> int:
-    try:
+# Compiled (stage, substage) -> score index built from the stages/ directory.
+# Stage-level entries are stored under (stage, None); their value is None when
+# the stage exists but does not define a stage-level score.
+# reload() builds a fresh index and swaps it in with a single assignment, so
+# readers never take a lock and always see either the old or the new index.
+class StageCatalog:
+    def __init__(self, base_path: Path = STAGES_BASE_PATH):
+        self.base_path = base_path
+        self.reload_count = 0
+        self.last_reloaded_at: Optional[datetime] = None
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._signature = self._fingerprint(base_path)
+        self._index: Dict[Tuple[str, Optional[str]], Optional[int]] = self._compile(base_path)
+        self.loaded_at = datetime.now(timezone.utc)
+
+    # Cheap change detection: path, mtime and size of every json file
+    @staticmethod
+    def _fingerprint(base_path: Path) -> Tuple[Tuple[str, int, int], ...]:
+        if not base_path.exists():
+            return ()
+        entries = []
+        for path in base_path.rglob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+
+    @staticmethod
+    def _compile(base_path: Path) -> Dict[Tuple[str, Optional[str]], Optional[int]]:
+        index: Dict[Tuple[str, Optional[str]], Optional[int]] = {}
+        if not base_path.exists():
+            logger.warning(f"Stages base path '{base_path}' not found, scoring disabled.")
+            return index
+
+        for stage_path in sorted(p for p in base_path.iterdir() if p.is_dir()):
+            stage_key = normalize(stage_path.name)
+            index.setdefault((stage_key, None), None)
+
+            for stage_file in sorted(stage_path.rglob("*.json")):
+                try:
+                    with open(stage_file, "r", encoding="utf-8") as f:
+                        stage_data = json.load(f)
+                except (OSError, ValueError):
+                    logger.exception(f"Failed to load stage file '{stage_file}', skipping.")
+                    continue
+
+                # Stage-level score (first file defining one wins)
+                if isinstance(stage_data, dict):
+                    if "score" in stage_data and index[(stage_key, None)] is None:
+                        index[(stage_key, None)] = stage_data.get("score", 0)
+                    continue
+
+                if stage_file.name != "substages.json":
+                    continue
+
+                for item in stage_data:
+                    status = item.get("status")
+                    if not status:
+                        continue
+                    index.setdefault((stage_key, normalize(status)), item.get("score", 0))
+
+        logger.info(f"Compiled stage catalog with {len(index)} entries from {base_path}")
+        return index
+
+    def reload(self, force: bool = False) -> bool:
+        with self._reload_lock:
+            signature = self._fingerprint(self.base_path)
+            if not force and signature == self._signature:
+                return False
+
+            index = self._compile(self.base_path)
+            self._index = index
+            self._signature = signature
+            self.reload_count += 1
+            self.last_reloaded_at = datetime.now(timezone.utc)
+
+        logger.info(
+            f"Stage catalog reloaded | reload_count={self.reload_count} | entries={len(index)}"
+        )
+        return True
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("Stage catalog reload failed, keeping previous index")
+
+    # Poll stages/ for substages.json changes in a daemon thread
+    def start_watcher(self, interval: float) -> None:
+        if interval <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="stage-catalog-watcher", daemon=True
+        )
+        self._watcher.start()
+        logger.info(f"Stage catalog watcher started | interval={interval}s")
+
+    def stop_watcher(self) -> None:
+        self._stop_event.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def stats(self) -> dict:
+        return {
+            "base_path": str(self.base_path),
+            "entries": len(self._index),
+            "loaded_at": self.loaded_at,
+            "reload_count": self.reload_count,
+            "last_reloaded_at": self.last_reloaded_at,
+            "watcher_running": bool(self._watcher and self._watcher.is_alive()),
+        }
+
+    def resolve(self, stage: Optional[str], substage: Optional[str] = None) -> int:
         if not stage:
             logger.warning("No stage provided, defaulting score to 0.")
             return 0
-        stage_path = STAGES_BASE_PATH / stage
-        if not stage_path.exists():
+
+        index = self._index
+        stage_key = normalize(stage)
+        if (stage_key, None) not in index:
             logger.warning(f"Stage '{stage}' not found.")
             return 0
+
         if substage:
-            for substages_file in stage_path.rglob("substages.json"):
-                with open(substages_file, "r", encoding="utf-8") as f:
-                    substages = json.load(f)
-
-                for item in substages:
-                    if item.get("status") == substage:
-                        score = item.get("score", 0)
-                        logger.info(
-                            f"Resolved lead score={score} "
-                            f"for stage='{stage}', substage='{substage}'")
-                        return score
+            score = index.get((stage_key, normalize(substage)))
+            if score is not None:
+                logger.info(
+                    f"Resolved lead score={score} "
+                    f"for stage='{stage}', substage='{substage}'")
+                return score
             logger.warning(
                 f"No matching substage '{substage}' found for stage '{stage}'. Falling back to stage score.")
-            
-            
-        
-        # Fallback to stage score if substage not found or not provided
-        for stage_file in stage_path.rglob("*.json"):
-            with open(stage_file, "r", encoding="utf-8") as f:
-                stage_data = json.load(f)
-
 
-            if isinstance(stage_data, dict) and "score" in stage_data:
-                score = stage_data.get("score", 0)
-                logger.info(
-                    f"Resolved stage-level score={score} for stage='{stage}'"
-                )
-                return score
+        # Fallback to stage score if substage not found or not provided
+        score = index[(stage_key, None)]
+        if score is not None:
+            logger.info(
+                f"Resolved stage-level score={score} for stage='{stage}'"
+            )
+            return score
 
         logger.warning(
             f"No matching substage '{substage}' found for stage '{stage}', defaulting score to 0.")
         return 0
-        
+
+# Loaded once at import time (main.py imports this module first)
+stage_catalog = StageCatalog()
+
+# Resolve lead score based on stage and substage json files
+def resolve_lead_score(stage: Optional[str], substage: Optional[str] = None) -> int:
+    try:
+        return stage_catalog.resolve(stage, substage)
     except Exception as e:
         logger.exception("Failed to resolve lead score")
-        return 0
\ No newline at end of file
+        return 0
+
+# Resolve scores for many (stage, substage) pairs in one pass, looking up
+# each distinct pair only once
+def resolve_lead_scores(pairs: Iterable[Tuple[Optional[str], Optional[str]]]) -> List[int]:
+    resolved: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+    scores = []
+    for pair in pairs:
+        if pair not in resolved:
+            resolved[pair] = resolve_lead_score(*pair)
+        scores.append(resolved[pair])
+    return scores
@@ -1,6 +1,9 @@
+import base64
 import datetime
-from sqlalchemy import and_, exists, or_
-from sqlalchemy.orm import Session, joinedload
+import json
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, exists, or_, tuple_
+from sqlalchemy.orm import Session, load_only, noload, selectinload
 from uuid import UUID
 from fastapi import HTTPException, logger
 from apps.accounts.models import Account
@@ -10,6 +13,7 @@ from .models import lead_accounts, LeadDetails
 from .schemas import LeadCreate, LeadUpdate
 import logging
 from apps.leads.scoring import resolve_lead_score
+from .loaders import LeadLoad, query_leads
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +56,8 @@ def create_lead_service(db: Session, lead_data: LeadCreate):
 
         db.commit()
         lead = (
-            db.query(Lead)
-            .options(joinedload(Lead.accounts))
+            query_leads(db, LeadLoad.DETAIL)
+            .options(selectinload(Lead.accounts))
             .filter(Lead.id == lead.id)
             .first()
         )
@@ -64,12 +68,84 @@ def create_lead_service(db: Session, lead_data: LeadCreate):
         raise
 
 # Retrieve leads
-def get_lead_service(db: Session, lead_id: str):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+def get_lead_service(db: Session, lead_id: str, profile: LeadLoad = LeadLoad.DETAIL):
+    lead = query_leads(db, profile).filter(Lead.id == lead_id).first()
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     return lead
 
+# Columns needed to build a LeadResponse without touching relationships
+LEAD_LIST_COLUMNS = (
+    Lead.id, Lead.title, Lead.first_name, Lead.last_name, Lead.email,
+    Lead.phone_code, Lead.phone_no, Lead.entry_point, Lead.source,
+    Lead.priority, Lead.lead_stage, Lead.lead_substage, Lead.score,
+    Lead.company_name, Lead.industry, Lead.company_size, Lead.website,
+    Lead.status, Lead.created_at, Lead.updated_at, Lead.is_contact,
+    Lead.last_contact_at,
+)
+LEAD_LIST_INCLUDES = ("accounts", "details", "products")
+
+# Only called for leads from list_leads_page, which excludes a NULL created_at
+def encode_lead_cursor(lead: Lead) -> str:
+    raw = json.dumps([lead.created_at.isoformat(), str(lead.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_lead_cursor(cursor: str) -> Tuple[datetime.datetime, UUID]:
+    try:
+        created_at, lead_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.datetime.fromisoformat(created_at), UUID(lead_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Keyset-paginated lead listing ordered by (created_at, id). Only the
+# columns LeadResponse needs are loaded; relationships are loaded with
+# selectinload only when requested through include. Leads without a
+# created_at (only possible for rows written outside the ORM) cannot be
+# placed in the keyset order and are left out of paginated listings.
+def list_leads_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    include: Optional[List[str]] = None,
+) -> Tuple[List[Lead], Optional[str]]:
+    include = set(include or [])
+    unknown = include - set(LEAD_LIST_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported include value(s): {', '.join(sorted(unknown))}"
+        )
+
+    options = [load_only(*LEAD_LIST_COLUMNS)]
+    if "accounts" in include:
+        options.append(selectinload(Lead.accounts).load_only(Account.id).noload("*"))
+    if "details" in include:
+        options.append(selectinload(Lead.details).noload("*"))
+    if "products" in include:
+        options.append(selectinload(Lead.products).load_only(LeadProduct.product).noload("*"))
+    options.append(noload("*"))
+
+    query = (
+        db.query(Lead)
+        .options(*options)
+        .filter(Lead.is_deleted.is_(False), Lead.created_at.is_not(None))
+    )
+    if cursor:
+        query = query.filter(tuple_(Lead.created_at, Lead.id) > decode_lead_cursor(cursor))
+
+    leads = query.order_by(Lead.created_at.asc(), Lead.id.asc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(leads) > limit:
+        leads = leads[:limit]
+        next_cursor = encode_lead_cursor(leads[-1])
+
+    if "accounts" in include:
+        for lead in leads:
+            lead.account_ids = [a.id for a in lead.accounts]
+
+    return leads, next_cursor
+
 # Check if Lead exists based on email and phone number
 def validate_lead_existence(
     db: Session, 
@@ -123,7 +199,7 @@ def validate_lead_existence(
 
 # Convert lead to contact
 def convert_lead_to_contact(db: Session, lead_id: UUID):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.MINIMAL).filter(Lead.id == lead_id).first()
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     lead.status = "Converted"
@@ -133,7 +209,7 @@ def convert_lead_to_contact(db: Session, lead_id: UUID):
     return lead
 
 def update_lead_service(db: Session, lead_id: str, lead_data: LeadUpdate):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.MINIMAL).filter(Lead.id == lead_id).first()
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
@@ -201,7 +277,7 @@ def update_lead_service(db: Session, lead_id: str, lead_data: LeadUpdate):
         raise
 
 def soft_delete_lead_service(db: Session, lead_id: str):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.MINIMAL).filter(Lead.id == lead_id).first()
     if lead:
         lead.is_deleted = True
         db.commit()
@@ -209,7 +285,7 @@ def soft_delete_lead_service(db: Session, lead_id: str):
     return lead
 
 def restore_lead_service(db: Session, lead_id: str):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = query_leads(db, LeadLoad.MINIMAL).filter(Lead.id == lead_id).first()
     if lead and lead.is_deleted:
         lead.is_deleted = False
         db.commit()
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Boolean, Column, Date, String, DateTime, Float, Table, ForeignKey, Text
+from sqlalchemy import Boolean, Column, Date, String, DateTime, Float, Table, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -25,7 +25,9 @@ opportunity_persons = Table(
     "opportunity_persons",
     Base.metadata,
     Column("opportunity_id", UUID(as_uuid=True), ForeignKey("opportunities.id")),
-    Column("person_id", UUID(as_uuid=True), ForeignKey("persons.id"))
+    Column("person_id", UUID(as_uuid=True), ForeignKey("persons.id")),
+    # Per-person performance aggregates
+    Index("ix_opportunity_persons_person_id", "person_id"),
 )
 
 
@@ -43,7 +45,7 @@ class Opportunity(Base):
     expected_close_date = Column(Date, nullable=True)
     reason_lost = Column(String(255), nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True)
     updated_at = Column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
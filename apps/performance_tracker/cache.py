@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from apps.contacts.models import PersonOfContact
+from apps.leads.models import Lead
+from apps.opportunities.models import Opportunity
+from apps.transactions.models import CommissionRecord
+from core.config import settings
+
+# Tables the performance metrics are computed from
+TRACKED_TABLES = {
+    "persons", "leads", "person_leads", "opportunities",
+    "opportunity_persons", "commission_records", "commission_rollups",
+}
+# ORM classes whose flushes (including secondary collection changes) touch them
+TRACKED_MODELS = (PersonOfContact, Lead, Opportunity, CommissionRecord)
+
+# Bounded TTL/LRU cache of performance results. Every committed write to a
+# tracked table clears it; the TTL only bounds writes made outside this
+# process. A result computed while an invalidation happened is not stored.
+class PerformanceCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+performance_cache = PerformanceCache(
+    max_size=settings.PERFORMANCE_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PERFORMANCE_CACHE_TTL_SECONDS,
+)
+
+_DIRTY_KEY = "performance_cache_dirty"
+
+# Flag sessions that write tracked rows, through the ORM...
+@event.listens_for(Session, "after_flush")
+def _flag_tracked_flush(session, flush_context) -> None:
+    if any(isinstance(obj, TRACKED_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_DIRTY_KEY] = True
+
+# ...or with insert()/update()/delete() statements (bulk imports, rollups)
+@event.listens_for(Session, "do_orm_execute")
+def _flag_tracked_statement(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in TRACKED_TABLES:
+        orm_execute_state.session.info[_DIRTY_KEY] = True
+
+# and clear the cache once their transaction commits. A flag left by a
+# rolled-back transaction only costs one extra invalidation later.
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        performance_cache.invalidate()
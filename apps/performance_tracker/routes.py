@@ -1,18 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from apps.auth.security import get_current_admin
 from core.database import get_db
 from . import services
+from .cache import performance_cache
 
 router = APIRouter(prefix="/performance", tags=["Performance Tracker"])
 
 # Get performance analytics for a specific salesperson
 @router.get("/salesperson/{salesperson_id}")
-def get_salesperson_performance(salesperson_id: str, db: Session = Depends(get_db)):
+def get_salesperson_performance(salesperson_id: UUID, db: Session = Depends(get_db)):
     performance = services.calculate_salesperson_performance(db, salesperson_id)
     if not performance:
         raise HTTPException(status_code=404, detail="Salesperson not found")
     return performance
 
+# Rank every salesperson with activity by one metric
+@router.get("/leaderboard")
+def get_performance_leaderboard(
+    sort_by: Literal[
+        "total_commission", "closed_deals", "conversion_rate", "total_opportunities", "total_leads"
+    ] = Query("total_commission"),
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    return services.performance_leaderboard(db, sort_by=sort_by, limit=limit)
+
+# Admin: Performance cache statistics
+@router.get("/cache/stats")
+def get_performance_cache_stats(current_admin: dict = Depends(get_current_admin)):
+    return performance_cache.stats()
+
 # Suggest salespersons based on client personality type
 @router.get("/personality-match/{client_personality}")
 def personality_match(client_personality: str, db: Session = Depends(get_db)):
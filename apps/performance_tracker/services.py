@@ -1,35 +1,116 @@
+from typing import List, Optional
+from uuid import UUID
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from apps.transactions import models as commission_models
-from apps.contacts.models import PersonOfContact
+from sqlalchemy import case, func, or_, select
+from apps.transactions.models import CommissionRollup
+from apps.contacts.models import PersonOfContact, person_leads
+from apps.leads.models import Lead
+from apps.opportunities.models import Opportunity, opportunity_persons
 from . import models, schemas
+from .cache import performance_cache
 
-# Calculate performance analytics for a given salesperson
-def calculate_salesperson_performance(db: Session, salesperson_id):
-    total_commission = db.query(func.sum(commission_models.CommissionRecord.amount))\
-        .filter(commission_models.CommissionRecord.salesperson_id == salesperson_id)\
-        .scalar() or 0.0
+# Opportunity statuses (case-insensitive) that count as a closed deal
+CLOSED_DEAL_STATUSES = ("won", "closed_won")
 
-    total_commissions = db.query(func.count(commission_models.CommissionRecord.id))\
-        .filter(commission_models.CommissionRecord.salesperson_id == salesperson_id)\
-        .scalar() or 0
+# Per-person metrics as one statement: leads, opportunities (with closed
+# deals) and commissions are each aggregated by person in a subquery and
+# outer-joined to persons. Commission totals come from commission_rollups
+# (maintained with every commission write) instead of re-scanning
+# commission_records. With salesperson_id every subquery is filtered to
+# that person; otherwise only people with any activity are returned.
+def _performance_query(salesperson_id: Optional[UUID] = None):
+    leads = (
+        select(
+            person_leads.c.person_id,
+            func.count(Lead.id.distinct()).label("total_leads"),
+        )
+        .join(Lead, Lead.id == person_leads.c.lead_id)
+        .where(Lead.is_deleted.is_not(True))
+        .group_by(person_leads.c.person_id)
+    )
+    closed = func.lower(Opportunity.status).in_(CLOSED_DEAL_STATUSES)
+    opportunities = (
+        select(
+            opportunity_persons.c.person_id,
+            func.count(Opportunity.id.distinct()).label("total_opportunities"),
+            func.count(case((closed, Opportunity.id)).distinct()).label("closed_deals"),
+        )
+        .join(Opportunity, Opportunity.id == opportunity_persons.c.opportunity_id)
+        .where(Opportunity.is_deleted.is_not(True))
+        .group_by(opportunity_persons.c.person_id)
+    )
+    commissions = (
+        select(
+            CommissionRollup.salesperson_id,
+            func.sum(CommissionRollup.total_amount).label("total_commission"),
+            func.sum(CommissionRollup.count).label("total_commission_records"),
+        )
+        .group_by(CommissionRollup.salesperson_id)
+    )
+    if salesperson_id is not None:
+        leads = leads.where(person_leads.c.person_id == salesperson_id)
+        opportunities = opportunities.where(opportunity_persons.c.person_id == salesperson_id)
+        commissions = commissions.where(CommissionRollup.salesperson_id == salesperson_id)
+    leads, opportunities, commissions = leads.subquery(), opportunities.subquery(), commissions.subquery()
 
-    # Placeholder for future lead/opportunity data
-    total_leads = 0
-    total_opportunities = 0
-    closed_deals = 0
-    conversion_rate = 0.0
+    query = (
+        select(
+            PersonOfContact.id,
+            func.coalesce(leads.c.total_leads, 0).label("total_leads"),
+            func.coalesce(opportunities.c.total_opportunities, 0).label("total_opportunities"),
+            func.coalesce(opportunities.c.closed_deals, 0).label("closed_deals"),
+            func.coalesce(commissions.c.total_commission, 0.0).label("total_commission"),
+            func.coalesce(commissions.c.total_commission_records, 0).label("total_commission_records"),
+        )
+        .outerjoin(leads, leads.c.person_id == PersonOfContact.id)
+        .outerjoin(opportunities, opportunities.c.person_id == PersonOfContact.id)
+        .outerjoin(commissions, commissions.c.salesperson_id == PersonOfContact.id)
+        .where(PersonOfContact.is_deleted.is_not(True))
+    )
+    if salesperson_id is not None:
+        return query.where(PersonOfContact.id == salesperson_id)
+    return query.where(or_(
+        leads.c.person_id.is_not(None),
+        opportunities.c.person_id.is_not(None),
+        commissions.c.salesperson_id.is_not(None),
+    ))
 
+def _performance_row(row) -> dict:
     return {
-        "salesperson_id": str(salesperson_id),
-        "total_leads": total_leads,
-        "total_opportunities": total_opportunities,
-        "closed_deals": closed_deals,
-        "conversion_rate": conversion_rate,
-        "total_commission": total_commission,
-        "total_commission_records": total_commissions
+        "salesperson_id": str(row.id),
+        "total_leads": row.total_leads,
+        "total_opportunities": row.total_opportunities,
+        "closed_deals": row.closed_deals,
+        # Share of the salesperson's opportunities that closed as won
+        "conversion_rate": round(row.closed_deals / row.total_opportunities, 4) if row.total_opportunities else 0.0,
+        "total_commission": float(row.total_commission),
+        "total_commission_records": row.total_commission_records,
     }
 
+# Calculate performance analytics for a given salesperson (None if unknown)
+def calculate_salesperson_performance(db: Session, salesperson_id: UUID) -> Optional[dict]:
+    def compute():
+        row = db.execute(_performance_query(salesperson_id)).first()
+        return _performance_row(row) if row else None
+
+    return performance_cache.get_or_compute(("salesperson", salesperson_id), compute)
+
+# Metrics for every salesperson with any activity, in one statement
+def calculate_all_performance(db: Session) -> List[dict]:
+    return performance_cache.get_or_compute(
+        ("all",),
+        lambda: [_performance_row(row) for row in db.execute(_performance_query())],
+    )
+
+# Salespeople ranked by one metric (ties broken by commission, then id)
+def performance_leaderboard(db: Session, sort_by: str = "total_commission", limit: int = 50) -> List[dict]:
+    ranked = sorted(
+        calculate_all_performance(db),
+        key=lambda entry: (-entry[sort_by], -entry["total_commission"], entry["salesperson_id"]),
+    )
+    return [{"rank": rank, **entry} for rank, entry in enumerate(ranked[:limit], start=1)]
+
 # Suggest salespersons based on client personality type
 def personality_match(db: Session, client_personality: str):
     compatibility = {
@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+from .models import CommissionRecord, CommissionRollup
+
+# Aggregation levels, matching the GROUPING() bitmask of the select list
+CELL, SUBTOTAL, TOTAL = "cell", "subtotal", "total"
+
+Row = Tuple[str, Optional[UUID], Optional[str], int, float]
+
+# (salesperson_id, status, count, amount) expressions and filters. Without a
+# date range the rollup table is aggregated; with one, commission_records.
+def _source(salesperson_id: Optional[UUID], start: Optional[datetime], end: Optional[datetime]):
+    if start is None and end is None:
+        model = CommissionRollup
+        count = func.sum(model.count)
+        amount = func.sum(model.total_amount)
+        filters = [model.count > 0]
+    else:
+        model = CommissionRecord
+        count = func.count(model.id)
+        amount = func.sum(model.amount)
+        filters = [model.status.is_not(None)]
+        if start is not None:
+            filters.append(model.created_at >= start)
+        if end is not None:
+            filters.append(model.created_at < end)
+    if salesperson_id is not None:
+        filters.append(model.salesperson_id == salesperson_id)
+    return model.salesperson_id, model.status, count, amount, filters
+
+# Commission counts and amounts in one statement: per-status cells, per-
+# salesperson subtotals (with by_salesperson) and the grand total. On
+# PostgreSQL this is a single GROUP BY GROUPING SETS, so every figure comes
+# from the same snapshot; other dialects run the finest grouping and total
+# it in Python. Returns (level, salesperson_id, status, count, amount) rows.
+def commission_grouping_sets(
+    db: Session,
+    by_salesperson: bool = False,
+    salesperson_id: Optional[UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Row]:
+    sp_col, status_col, count, amount, filters = _source(salesperson_id, start, end)
+    keys = [sp_col, status_col] if by_salesperson else [status_col]
+
+    if db.get_bind().dialect.name == "postgresql":
+        sets = [tuple_(*keys), tuple_(sp_col), tuple_()] if by_salesperson else [tuple_(*keys), tuple_()]
+        query = (
+            select(*keys, func.grouping(*keys).label("level"), count, amount)
+            .where(*filters)
+            .group_by(func.grouping_sets(*sets))
+        )
+        # GROUPING() sets one bit per column rolled up, leftmost highest
+        levels = {0: CELL, 1: SUBTOTAL, 3: TOTAL} if by_salesperson else {0: CELL, 1: TOTAL}
+        rows = []
+        for row in db.execute(query):
+            *key_values, level, row_count, row_amount = row
+            sp = key_values[0] if by_salesperson else None
+            status = key_values[-1].value if key_values[-1] is not None else None
+            rows.append((levels[level], sp, status, row_count or 0, row_amount or 0))
+        return rows
+
+    cells = db.execute(select(*keys, count, amount).where(*filters).group_by(*keys)).all()
+    rows: List[Row] = []
+    subtotals: Dict[UUID, List] = {}
+    total = [0, 0]
+    for row in cells:
+        *key_values, row_count, row_amount = row
+        sp = key_values[0] if by_salesperson else None
+        rows.append((CELL, sp, key_values[-1].value, row_count or 0, row_amount or 0))
+        total[0] += row_count or 0
+        total[1] += row_amount or 0
+        if by_salesperson:
+            subtotal = subtotals.setdefault(sp, [0, 0])
+            subtotal[0] += row_count or 0
+            subtotal[1] += row_amount or 0
+    rows.extend((SUBTOTAL, sp, None, c, a) for sp, (c, a) in subtotals.items())
+    rows.append((TOTAL, None, None, total[0], total[1]))
+    return rows
+
+def _overall(count: int, amount: float) -> dict:
+    return {"total_commissions": count, "total_amount": amount}
+
+def _by_status(rows: List[Row]) -> list:
+    return [
+        {"status": status, "count": count, "total_amount": amount}
+        for level, _, status, count, amount in rows
+        if level == CELL
+    ]
+
+# {"overall": ..., "by_status": [...]} for everyone or one salesperson
+def summarize_commissions(
+    db: Session,
+    salesperson_id: Optional[UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> dict:
+    rows = commission_grouping_sets(db, salesperson_id=salesperson_id, start=start, end=end)
+    total = next((r for r in rows if r[0] == TOTAL), None)
+    return {
+        "overall": _overall(total[3], total[4]) if total else _overall(0, 0),
+        "by_status": _by_status(rows),
+    }
+
+# Team-wide matrix: overall totals plus each salesperson's breakdown
+def summarize_commissions_by_salesperson(
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> dict:
+    rows = commission_grouping_sets(db, by_salesperson=True, start=start, end=end)
+
+    salespeople: Dict[UUID, dict] = {}
+    overall = _overall(0, 0)
+    for level, sp, status, count, amount in rows:
+        if level == TOTAL:
+            overall = _overall(count, amount)
+            continue
+        entry = salespeople.setdefault(sp, {
+            "salesperson_id": str(sp),
+            "overall": _overall(0, 0),
+            "by_status": [],
+        })
+        if level == SUBTOTAL:
+            entry["overall"] = _overall(count, amount)
+        else:
+            entry["by_status"].append({"status": status, "count": count, "total_amount": amount})
+
+    return {
+        "overall": overall,
+        "salespeople": sorted(
+            salespeople.values(),
+            key=lambda entry: entry["overall"]["total_amount"],
+            reverse=True,
+        ),
+    }
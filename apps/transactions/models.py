@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, String, Float, ForeignKey, Enum, DateTime, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -16,7 +16,7 @@ class CommissionRecord(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    salesperson_id = Column(UUID(as_uuid=True), ForeignKey("persons.id"), nullable=False)
+    salesperson_id = Column(UUID(as_uuid=True), ForeignKey("persons.id"), nullable=False, index=True)
     opportunity_id = Column(UUID(as_uuid=True), ForeignKey("opportunities.id"), nullable=True)
     amount = Column(Float, nullable=False)
     percentage = Column(Float, nullable=True)
@@ -27,4 +27,17 @@ class CommissionRecord(Base):
 
     # Relationships
     salesperson = relationship("PersonOfContact", back_populates="commissions", lazy="joined")
-    opportunity = relationship("Opportunity", back_populates="commissions", lazy="joined")
\ No newline at end of file
+    opportunity = relationship("Opportunity", back_populates="commissions", lazy="joined")
+
+
+# Per-salesperson, per-status commission totals, kept in step with
+# commission_records by the transaction services
+class CommissionRollup(Base):
+    __tablename__ = "commission_rollups"
+
+    salesperson_id = Column(UUID(as_uuid=True), ForeignKey("persons.id"), primary_key=True)
+    status = Column(Enum(CommissionStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
+                        onupdate=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,141 @@
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .models import CommissionRecord, CommissionRollup, CommissionStatus
+
+logger = logging.getLogger(__name__)
+
+rollups = CommissionRollup.__table__
+
+# Add count/amount deltas to one (salesperson, status) rollup row. Runs in
+# the caller's transaction, so the rollup commits (or rolls back) together
+# with the commission change. PostgreSQL upserts in one statement.
+def apply_rollup_delta(
+    db: Session,
+    salesperson_id: UUID,
+    status: Optional[CommissionStatus],
+    count_delta: int,
+    amount_delta: float,
+) -> None:
+    if status is None or (count_delta == 0 and amount_delta == 0):
+        return
+    now = datetime.now(timezone.utc)
+
+    if db.get_bind().dialect.name == "postgresql":
+        statement = pg_insert(rollups).values(
+            salesperson_id=salesperson_id,
+            status=status,
+            count=count_delta,
+            total_amount=amount_delta,
+            updated_at=now,
+        )
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[rollups.c.salesperson_id, rollups.c.status],
+            set_={
+                "count": rollups.c.count + statement.excluded.count,
+                "total_amount": rollups.c.total_amount + statement.excluded.total_amount,
+                "updated_at": now,
+            },
+        ))
+        return
+
+    updated = db.execute(
+        update(rollups)
+        .where(rollups.c.salesperson_id == salesperson_id, rollups.c.status == status)
+        .values(
+            count=rollups.c.count + count_delta,
+            total_amount=rollups.c.total_amount + amount_delta,
+            updated_at=now,
+        )
+    ).rowcount
+    if not updated:
+        db.execute(insert(rollups).values(
+            salesperson_id=salesperson_id,
+            status=status,
+            count=count_delta,
+            total_amount=amount_delta,
+            updated_at=now,
+        ))
+
+# Move a commission between rollup rows after an update. Both rows are
+# touched in (salesperson_id, status) order, whichever direction the
+# commission moves, so two concurrent moves between the same pair of rows
+# lock them in the same order instead of deadlocking.
+def move_rollup(
+    db: Session,
+    before: tuple,
+    after: tuple,
+) -> None:
+    if before == after:
+        return
+    old_salesperson_id, old_status, old_amount = before
+    new_salesperson_id, new_status, new_amount = after
+    deltas = [
+        (old_salesperson_id, old_status, -1, -old_amount),
+        (new_salesperson_id, new_status, 1, new_amount),
+    ]
+    for salesperson_id, status, count_delta, amount_delta in sorted(
+        (delta for delta in deltas if delta[1] is not None),
+        key=lambda delta: (str(delta[0]), delta[1].value),
+    ):
+        apply_rollup_delta(db, salesperson_id, status, count_delta, amount_delta)
+
+# Recompute every rollup row from commission_records. On PostgreSQL the
+# rollup table is locked first so concurrent commission writes wait for the
+# rebuild instead of applying deltas to rows it is replacing.
+def rebuild_commission_rollups(db: Session) -> dict:
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE commission_rollups IN EXCLUSIVE MODE"))
+
+    db.execute(delete(rollups))
+    db.execute(
+        insert(rollups).from_select(
+            ["salesperson_id", "status", "count", "total_amount", "updated_at"],
+            select(
+                CommissionRecord.salesperson_id,
+                CommissionRecord.status,
+                func.count(),
+                func.sum(CommissionRecord.amount),
+                func.now(),
+            )
+            .where(CommissionRecord.status.is_not(None))
+            .group_by(CommissionRecord.salesperson_id, CommissionRecord.status)
+        )
+    )
+    db.commit()
+
+    rows = db.scalar(select(func.count()).select_from(rollups))
+    logger.info(f"Commission rollups rebuilt | rows={rows}")
+    return {"rollup_rows": rows}
+
+
+# CLI: python -m apps.transactions.rollups
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild commission_rollups from commission_records.")
+    parser.parse_args(argv)
+
+    # Registers every app's models (and configures logging) like the API process
+    import main as _app  # noqa: F401
+    from core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = rebuild_commission_rollups(db)
+    finally:
+        db.close()
+
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,11 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Security
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Security
 from sqlalchemy.orm import Session
 from core.database import get_db
 from . import models, schemas, services
+from .rollups import rebuild_commission_rollups as rebuild_rollups
 from apps.auth.security import get_current_admin, get_current_user
 from apps.auth.models import User
 
@@ -28,6 +31,14 @@ def get_commission_overview(db: Session = Depends(get_db),
     summary = services.get_commission_overview(db)
     return summary
 
+# Transaction Summary for every Salesperson
+@router.get("/summary/all-salespeople")
+def get_commission_summary_all_salespeople(start: Optional[datetime] = Query(None),
+                                           end: Optional[datetime] = Query(None),
+                                           db: Session = Depends(get_db),
+                                           current_user: User = Security(get_current_admin)):
+    return services.get_commission_summary_all_salespeople(db, start, end)
+
 # Transaction Summary by Salesperson
 @router.get("/salesperson/{salesperson_id}")
 def get_commission_summary_by_salesperson(salesperson_id: UUID, db: Session = Depends(get_db),
@@ -44,6 +55,12 @@ def get_commission_summary_by_salesperson(salesperson_id: UUID, db: Session = De
 
     return summary
 
+# Admin: Recompute commission rollups from the commission records
+@router.post("/rollups/rebuild")
+def rebuild_commission_rollups(db: Session = Depends(get_db),
+                               current_user: User = Security(get_current_admin)):
+    return rebuild_rollups(db)
+
 # Get, Update, Delete a Transaction Record by ID
 @router.get("/{commission_id}", response_model=schemas.CommissionResponse)
 def get_commission(commission_id: UUID, db: Session = Depends(get_db),
@@ -56,7 +73,7 @@ def get_commission(commission_id: UUID, db: Session = Depends(get_db),
 @router.put("/{commission_id}", response_model=schemas.CommissionResponse)
 def update_commission(commission_id: UUID, update_data: schemas.CommissionUpdate, db: Session = Depends(get_db),
                       current_user: User = Security(get_current_user)):
-    commission = services.update_commission(db, commission_id, update_data)
+    commission = services.update_commission(db, commission_id, update_data, current_user)
     if not commission:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return commission
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from apps.auth.models import User
 from . import models, schemas
+from .rollups import apply_rollup_delta, move_rollup
+from .aggregates import summarize_commissions, summarize_commissions_by_salesperson
 import logging
 from uuid import UUID
 
@@ -12,11 +13,15 @@ def create_commission(
     commission_data: schemas.CommissionCreate,
     current_user: User,
 ):
+    data = commission_data.model_dump()
+    # Status is part of the rollup key; an explicit null means the default
+    data["status"] = models.CommissionStatus(data["status"] or models.CommissionStatus.pending.value)
     new_commission = models.CommissionRecord(
-        **commission_data.model_dump(),
+        **data,
         created_by=current_user.id,
     )
     db.add(new_commission)
+    apply_rollup_delta(db, new_commission.salesperson_id, new_commission.status, 1, new_commission.amount)
     db.commit()
     db.refresh(new_commission)
     return new_commission
@@ -33,13 +38,29 @@ def get_commission_by_id(db: Session, commission_id, current_user: User):
                                                     models.CommissionRecord.created_by == current_user.id).first()
 
 
+# Lock a commission for a change that moves it between rollup rows
+def _get_commission_for_update(db: Session, commission_id, current_user: User):
+    return (
+        db.query(models.CommissionRecord)
+        .filter(
+            models.CommissionRecord.id == commission_id,
+            models.CommissionRecord.created_by == current_user.id,
+        )
+        .with_for_update(of=models.CommissionRecord)
+        .first()
+    )
+
+
 def update_commission(db: Session, commission_id, update_data: schemas.CommissionUpdate, current_user: User):
-    commission = get_commission_by_id(db, commission_id, current_user)
+    commission = _get_commission_for_update(db, commission_id, current_user)
     if not commission:
         return None
     
     data = update_data.model_dump(exclude_unset=True)
+    if "status" in data and data["status"] is None:
+        del data["status"]
     unsupported_fields = []
+    before = (commission.salesperson_id, commission.status, commission.amount)
     
     for key, value in data.items():
         if hasattr(commission, key):
@@ -51,98 +72,41 @@ def update_commission(db: Session, commission_id, update_data: schemas.Commissio
         logger.warning(
             f"Unsupported fields received in commission update: {unsupported_fields}"
         )
-    
+
+    if commission.status is not None:
+        commission.status = models.CommissionStatus(commission.status)
+    move_rollup(db, before, (commission.salesperson_id, commission.status, commission.amount))
     db.commit()
     db.refresh(commission)
     return commission
 
 
 def delete_commission(db: Session, commission_id: UUID, current_user: User):
-    commission = (
-        db.query(models.CommissionRecord)
-        .filter(
-            models.CommissionRecord.id == commission_id,
-            models.CommissionRecord.created_by == current_user.id,
-        )
-        .first()
-    )
+    commission = _get_commission_for_update(db, commission_id, current_user)
 
     if not commission:
         return False
 
+    apply_rollup_delta(db, commission.salesperson_id, commission.status, -1, -commission.amount)
     db.delete(commission)
     db.commit()
     return True
 
-# Transaction Overview returns total commissions and breakdown by status for ALL salespersons
+# Transaction Overview returns total commissions and breakdown by status for ALL salespersons,
+# aggregated from commission_rollups in one statement
 def get_commission_overview(db: Session):
-    status_summary = (
-        db.query(
-            models.CommissionRecord.status,
-            func.sum(models.CommissionRecord.amount).label("total_amount"),
-            func.count(models.CommissionRecord.id).label("count")
-        )
-        .group_by(models.CommissionRecord.status)
-        .all()
-    )
-
-    total_commissions = db.query(func.count(models.CommissionRecord.id)).scalar() or 0
-    total_amount = db.query(func.sum(models.CommissionRecord.amount)).scalar() or 0
-
-    # Return a safe empty summary if no commissions exist
-    if total_commissions == 0:
-        return {
-            "overall": {"total_commissions": 0, "total_amount": 0},
-            "by_status": []
-        }
-
-    return {
-        "overall": {"total_commissions": total_commissions, "total_amount": total_amount},
-        "by_status": [
-            {
-                "status": str(s.status.value if hasattr(s.status, "value") else s.status),
-                "count": s.count,
-                "total_amount": s.total_amount or 0
-            }
-            for s in status_summary
-        ]
-    }
+    return summarize_commissions(db)
 
 
 # Salesperson Transaction Summary returns total commissions and breakdown by status for a SPECIFIC salesperson
 def get_commission_summary_by_salesperson(db: Session, salesperson_id):
-    results = (
-        db.query(
-            models.CommissionRecord.status,
-            func.sum(models.CommissionRecord.amount).label("total_amount"),
-            func.count(models.CommissionRecord.id).label("count")
-        )
-        .filter(models.CommissionRecord.salesperson_id == salesperson_id)
-        .group_by(models.CommissionRecord.status)
-        .all()
-    )
-
-    # Compute overall totals
-    total_amount = db.query(func.sum(models.CommissionRecord.amount)).filter(
-        models.CommissionRecord.salesperson_id == salesperson_id
-    ).scalar() or 0
-
-    total_count = db.query(func.count(models.CommissionRecord.id)).filter(
-        models.CommissionRecord.salesperson_id == salesperson_id
-    ).scalar() or 0
-
     return {
         "salesperson_id": str(salesperson_id),
-        "overall": {
-            "total_commissions": total_count,
-            "total_amount": total_amount
-        },
-        "by_status": [
-            {
-                "status": str(r.status.value if hasattr(r.status, "value") else r.status),
-                "count": r.count,
-                "total_amount": r.total_amount or 0
-            }
-            for r in results
-        ]
-    }
\ No newline at end of file
+        **summarize_commissions(db, salesperson_id=salesperson_id),
+    }
+
+
+# Team Transaction Summary returns every salesperson's breakdown in one round trip.
+# A date range aggregates the commission records created in [start, end).
+def get_commission_summary_all_salespeople(db: Session, start=None, end=None):
+    return summarize_commissions_by_salesperson(db, start=start, end=end)
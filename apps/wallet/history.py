@@ -0,0 +1,207 @@
+import base64
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from .ledger import ZERO, available_delta
+from .models import TransactionType, Wallet, WalletBalanceCheckpoint, WalletTransaction
+from .schemas import WalletStatementResponse
+
+logger = logging.getLogger(__name__)
+
+# Ledger rows this recent may still be joined by concurrent writers with a
+# slightly earlier created_at, so checkpoints never cover them
+CHECKPOINT_SETTLE_SECONDS = 300
+CHECKPOINT_SCAN_BATCH_SIZE = 5000
+
+def encode_transaction_cursor(tx: WalletTransaction) -> str:
+    raw = json.dumps([tx.created_at.isoformat(), str(tx.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_transaction_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, tx_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(tx_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _active_transactions(wallet_id: UUID):
+    return (
+        WalletTransaction.wallet_id == wallet_id,
+        WalletTransaction.is_deleted == False,
+    )
+
+# Wallet ledger newest first, optionally limited to [start, end). With a
+# limit the page is keyset-paginated on (created_at, id) and the next
+# page's cursor is returned alongside it.
+def list_wallet_transactions(
+    db: Session,
+    wallet_id: UUID,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[List[WalletTransaction], Optional[str]]:
+    query = db.query(WalletTransaction).filter(*_active_transactions(wallet_id))
+    if start:
+        query = query.filter(WalletTransaction.created_at >= start)
+    if end:
+        query = query.filter(WalletTransaction.created_at < end)
+    if cursor:
+        query = query.filter(
+            tuple_(WalletTransaction.created_at, WalletTransaction.id) < decode_transaction_cursor(cursor)
+        )
+    query = query.order_by(WalletTransaction.created_at.desc(), WalletTransaction.id.desc())
+
+    if limit is None:
+        return query.all(), None
+
+    transactions = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = encode_transaction_cursor(transactions[-1])
+    return transactions, next_cursor
+
+def _latest_checkpoint(db: Session, wallet_id: UUID, before: Optional[datetime] = None) -> Optional[WalletBalanceCheckpoint]:
+    query = db.query(WalletBalanceCheckpoint).filter(WalletBalanceCheckpoint.wallet_id == wallet_id)
+    if before is not None:
+        query = query.filter(WalletBalanceCheckpoint.as_of_created_at < before)
+    return query.order_by(
+        WalletBalanceCheckpoint.as_of_created_at.desc(),
+        WalletBalanceCheckpoint.as_of_transaction_id.desc(),
+    ).first()
+
+def _after_checkpoint(checkpoint: WalletBalanceCheckpoint):
+    return tuple_(WalletTransaction.created_at, WalletTransaction.id) > tuple_(
+        checkpoint.as_of_created_at, checkpoint.as_of_transaction_id
+    )
+
+# Available balance implied by cumulative per-type totals. Derived from the
+# set of rows covered rather than the balance_after of the "last" one, so it
+# does not depend on (created_at, id) matching the order rows were written.
+def _balance_from_totals(totals: Dict[TransactionType, Decimal]) -> Decimal:
+    return sum((available_delta(tx_type, amount) for tx_type, amount in totals.items()), ZERO)
+
+# Extend a wallet's checkpoints: one every `interval` settled transactions,
+# each holding the running balance and cumulative totals per type. Only the
+# rows after the last checkpoint are read. Returns checkpoints written.
+def refresh_checkpoints(
+    db: Session,
+    wallet_id: UUID,
+    interval: int = settings.WALLET_CHECKPOINT_INTERVAL,
+) -> int:
+    last = _latest_checkpoint(db, wallet_id)
+    count = last.transaction_count if last else 0
+    totals: Dict[TransactionType, Decimal] = defaultdict(lambda: ZERO)
+    if last:
+        totals.update({TransactionType(k): Decimal(v) for k, v in last.totals.items()})
+
+    settled_before = datetime.now(timezone.utc) - timedelta(seconds=CHECKPOINT_SETTLE_SECONDS)
+    query = (
+        select(
+            WalletTransaction.id,
+            WalletTransaction.created_at,
+            WalletTransaction.type,
+            WalletTransaction.amount,
+        )
+        .where(*_active_transactions(wallet_id), WalletTransaction.created_at < settled_before)
+        .order_by(WalletTransaction.created_at.asc(), WalletTransaction.id.asc())
+    )
+    if last:
+        query = query.where(_after_checkpoint(last))
+
+    checkpoints = []
+    rows = db.execute(query.execution_options(yield_per=CHECKPOINT_SCAN_BATCH_SIZE))
+    for tx_id, created_at, tx_type, amount in rows:
+        count += 1
+        totals[tx_type] += amount
+        if count % interval == 0:
+            checkpoints.append({
+                "wallet_id": wallet_id,
+                "as_of_created_at": created_at,
+                "as_of_transaction_id": tx_id,
+                "transaction_count": count,
+                "available_balance": _balance_from_totals(totals),
+                "totals": {key.value: str(value) for key, value in totals.items()},
+                "created_at": datetime.now(timezone.utc),
+            })
+    rows.close()
+
+    if not checkpoints:
+        return 0
+    try:
+        db.execute(insert(WalletBalanceCheckpoint), checkpoints)
+        db.commit()
+    except IntegrityError:
+        # A concurrent refresh wrote the same checkpoints
+        db.rollback()
+        return 0
+    return len(checkpoints)
+
+# Backfill checkpoints for every wallet (e.g. after enabling them)
+def refresh_all_checkpoints(db: Session) -> dict:
+    wallet_ids = db.scalars(select(Wallet.id).where(Wallet.is_deleted == False)).all()
+    written = sum(refresh_checkpoints(db, wallet_id) for wallet_id in wallet_ids)
+    logger.info(f"Wallet checkpoints refreshed | wallets={len(wallet_ids)} | checkpoints={written}")
+    return {"wallets": len(wallet_ids), "checkpoints": written}
+
+# Ledger state just before `at`: (transaction count, cumulative totals per
+# type, available balance). Starts from the nearest earlier checkpoint, so
+# at most one checkpoint interval (plus unsettled rows) is aggregated.
+def _state_at(db: Session, wallet_id: UUID, at: datetime) -> Tuple[int, Dict[TransactionType, Decimal], Decimal]:
+    checkpoint = _latest_checkpoint(db, wallet_id, before=at)
+    count = checkpoint.transaction_count if checkpoint else 0
+    totals: Dict[TransactionType, Decimal] = defaultdict(lambda: ZERO)
+    if checkpoint:
+        totals.update({TransactionType(k): Decimal(v) for k, v in checkpoint.totals.items()})
+
+    tail = (
+        select(WalletTransaction.type, func.count(), func.sum(WalletTransaction.amount))
+        .where(*_active_transactions(wallet_id), WalletTransaction.created_at < at)
+        .group_by(WalletTransaction.type)
+    )
+    if checkpoint:
+        tail = tail.where(_after_checkpoint(checkpoint))
+    for tx_type, tx_count, amount in db.execute(tail):
+        count += tx_count
+        totals[tx_type] += amount or ZERO
+
+    # Checkpoint balance plus the signed deltas of the tail
+    return count, totals, _balance_from_totals(totals)
+
+# Statement for [start, end): opening and closing balance and the per-type
+# totals of the period, without reading the wallet's full history
+def wallet_statement(db: Session, wallet_id: UUID, start: datetime, end: datetime) -> WalletStatementResponse:
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end.",
+        )
+
+    refresh_checkpoints(db, wallet_id)
+    opening_count, opening_totals, opening_balance = _state_at(db, wallet_id, start)
+    closing_count, closing_totals, closing_balance = _state_at(db, wallet_id, end)
+
+    return WalletStatementResponse(
+        wallet_id=wallet_id,
+        start=start,
+        end=end,
+        opening_balance=opening_balance,
+        closing_balance=closing_balance,
+        transaction_count=closing_count - opening_count,
+        totals={
+            tx_type: closing_totals[tx_type] - opening_totals[tx_type]
+            for tx_type in TransactionType
+        },
+    )
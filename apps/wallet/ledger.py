@@ -0,0 +1,118 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import cast, insert, inspect, literal, select, update
+from sqlalchemy.orm import Session
+
+from apps.wallet.models import TransactionType, Wallet, WalletTransaction
+
+ZERO = Decimal("0.00")
+
+# Core tables: mutations bypass the ORM identity map, so callers refresh any
+# Wallet objects they already hold
+wallets = Wallet.__table__
+wallet_transactions = WalletTransaction.__table__
+# Attribute name -> column (e.g. "type" is stored as transaction_type_enum)
+tx_columns = inspect(WalletTransaction).columns
+
+# Effect of each transaction type on the wallet counters, as applied by
+# apps/wallet/services.py (adjustments move the available balance only)
+TRANSACTION_EFFECTS: Dict[TransactionType, Dict[str, int]] = {
+    TransactionType.COMMISSION_CREDIT: {"available_balance": 1, "lifetime_earnings": 1},
+    TransactionType.WITHDRAWAL_REQUESTED: {"available_balance": -1, "pending_payout_amount": 1},
+    TransactionType.WITHDRAWAL_COMPLETED: {"pending_payout_amount": -1, "lifetime_withdrawals": 1},
+    TransactionType.WITHDRAWAL_REJECTED: {"available_balance": 1, "pending_payout_amount": -1},
+    TransactionType.ADJUSTMENT_CREDIT: {"available_balance": 1},
+    TransactionType.ADJUSTMENT_DEBIT: {"available_balance": -1},
+}
+
+# Signed effect of one ledger row on the wallet's available balance
+def available_delta(tx_type: TransactionType, amount: Decimal) -> Decimal:
+    return TRANSACTION_EFFECTS[tx_type].get("available_balance", 0) * amount
+
+# Wallet mutation engine.
+# Balances are never read into Python and written back: every mutation is a
+# relative UPDATE on the wallet row (so concurrent writers serialize on the
+# row lock instead of overwriting each other) and the ledger entry is
+# appended with the balance the UPDATE returned. On PostgreSQL both happen
+# in one statement (UPDATE ... RETURNING inside a CTE feeding the INSERT);
+# other databases get UPDATE ... RETURNING followed by the INSERT.
+#
+# Returns the wallet's available balance after the mutation, or None when
+# no row matched (wallet missing/deleted, or min_available not satisfied).
+# The caller owns the transaction and commits.
+def apply_wallet_mutation(
+    db: Session,
+    wallet_id: UUID,
+    tx_type: TransactionType,
+    amount: Decimal,
+    balance_delta: Decimal = ZERO,
+    pending_delta: Decimal = ZERO,
+    earnings_delta: Decimal = ZERO,
+    withdrawals_delta: Decimal = ZERO,
+    min_available: Optional[Decimal] = None,
+    related_withdrawal_id: Optional[UUID] = None,
+    description: Optional[str] = None,
+) -> Optional[Decimal]:
+    now = datetime.now(timezone.utc)
+
+    conditions = [wallets.c.id == wallet_id, wallets.c.is_deleted == False]
+    if min_available is not None:
+        conditions.append(wallets.c.available_balance >= min_available)
+
+    wallet_update = (
+        update(wallets)
+        .where(*conditions)
+        .values(
+            available_balance=wallets.c.available_balance + balance_delta,
+            pending_payout_amount=wallets.c.pending_payout_amount + pending_delta,
+            lifetime_earnings=wallets.c.lifetime_earnings + earnings_delta,
+            lifetime_withdrawals=wallets.c.lifetime_withdrawals + withdrawals_delta,
+            updated_at=now,
+        )
+        .returning(wallets.c.id, wallets.c.available_balance)
+    )
+
+    tx_values = {
+        "id": uuid.uuid4(),
+        "wallet_id": wallet_id,
+        "type": tx_type,
+        "amount": amount,
+        "related_withdrawal_id": related_withdrawal_id,
+        "description": description,
+        "created_at": now,
+        "is_deleted": False,
+    }
+
+    if db.get_bind().dialect.name == "postgresql":
+        updated = wallet_update.cte("updated_wallet")
+        columns = [tx_columns[name] for name in tx_values] + [tx_columns["balance_after"]]
+        # Explicit casts: untyped parameters (NULLs especially) in an
+        # INSERT ... SELECT list would otherwise resolve to text
+        source = select(
+            *[
+                cast(literal(value, type_=tx_columns[name].type), tx_columns[name].type)
+                for name, value in tx_values.items()
+            ],
+            updated.c.available_balance,
+        ).select_from(updated)
+        statement = (
+            insert(wallet_transactions)
+            .from_select(columns, source)
+            .returning(wallet_transactions.c.balance_after)
+        )
+        return db.execute(statement).scalar()
+
+    row = db.execute(wallet_update).first()
+    if row is None:
+        return None
+    db.execute(
+        insert(wallet_transactions).values({
+            **{tx_columns[name]: value for name, value in tx_values.items()},
+            tx_columns["balance_after"]: row.available_balance,
+        })
+    )
+    return row.available_balance
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, ForeignKey, Numeric
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, ForeignKey, Numeric, Integer, JSON, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -90,6 +90,11 @@ class WithdrawalRequest(Base):
 
 class WalletTransaction(Base):
     __tablename__ = "wallet_transactions"
+    __table_args__ = (
+        # Per-wallet history in (created_at, id) order: keyset pages, date
+        # ranges and checkpoint tails are all index range scans
+        Index("ix_wallet_transactions_wallet_id_created_at", "wallet_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     wallet_id = Column(UUID(as_uuid=True), ForeignKey("wallets.id"), nullable=False, index=True)
@@ -103,6 +108,9 @@ class WalletTransaction(Base):
 
     description = Column(String(255), nullable=True)
 
+    # External idempotency key (e.g. a payout run line); a reference is applied at most once
+    reference = Column(String(100), unique=True, nullable=True, index=True)
+
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     is_deleted = Column(Boolean, default=False)
@@ -110,3 +118,25 @@ class WalletTransaction(Base):
     # Relationships
     wallet = relationship("Wallet", back_populates="transactions")
     related_withdrawal = relationship("WithdrawalRequest", back_populates="transactions")
+
+
+class WalletBalanceCheckpoint(Base):
+    __tablename__ = "wallet_balance_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("wallet_id", "transaction_count", name="uq_wallet_checkpoint_count"),
+        Index("ix_wallet_checkpoints_wallet_id_as_of", "wallet_id", "as_of_created_at", "as_of_transaction_id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    wallet_id = Column(UUID(as_uuid=True), ForeignKey("wallets.id"), nullable=False)
+
+    # Ledger position covered: every transaction up to and including this one
+    as_of_created_at = Column(DateTime(timezone=True), nullable=False)
+    as_of_transaction_id = Column(UUID(as_uuid=True), nullable=False)
+
+    transaction_count = Column(Integer, nullable=False)
+    available_balance = Column(Numeric(12, 2), nullable=False)
+    # Cumulative amount per transaction type, e.g. {"commission_credit": "120.00"}
+    totals = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
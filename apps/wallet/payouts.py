@@ -0,0 +1,304 @@
+import argparse
+import json
+import logging
+import sys
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import IO, Dict, List, Set, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import Numeric, cast, column, insert, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from apps.contacts.models import PersonOfContact
+from core.file_import import detect_format, format_validation_error, iter_rows
+from .ledger import ZERO, wallet_transactions, wallets
+from .models import TransactionType, Wallet, WalletTransaction
+from .schemas import CommissionPayoutError, CommissionPayoutItem, CommissionPayoutResponse
+
+logger = logging.getLogger(__name__)
+
+PAYOUT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+PayoutRow = Tuple[int, CommissionPayoutItem]
+
+
+# Wallet ids for the given persons, creating the missing wallets with one
+# multi-row INSERT. Missing persons are locked (in id order, so concurrent
+# runs cannot deadlock) and re-checked first, the same guard _create_wallet
+# uses against two wallets for one person. Returns ({person_id: wallet_id},
+# wallets_created); persons that do not exist are absent from the map.
+def _resolve_wallets(db: Session, person_ids: Set[UUID]) -> Tuple[Dict[UUID, UUID], int]:
+    def active_wallets(ids) -> Dict[UUID, UUID]:
+        rows = db.execute(
+            select(wallets.c.person_id, wallets.c.id)
+            .where(wallets.c.person_id.in_(ids), wallets.c.is_deleted == False)
+        )
+        return {person_id: wallet_id for person_id, wallet_id in rows}
+
+    wallet_ids = active_wallets(person_ids)
+    missing = person_ids - wallet_ids.keys()
+    if not missing:
+        return wallet_ids, 0
+
+    existing_persons = set(db.scalars(
+        select(PersonOfContact.id)
+        .where(PersonOfContact.id.in_(missing))
+        .order_by(PersonOfContact.id)
+        .with_for_update()
+    ))
+    if not existing_persons:
+        return wallet_ids, 0
+    wallet_ids.update(active_wallets(existing_persons))
+
+    now = datetime.now(timezone.utc)
+    new_wallets = [
+        {
+            "id": uuid.uuid4(),
+            "person_id": person_id,
+            "currency": "USD",
+            "available_balance": ZERO,
+            "pending_payout_amount": ZERO,
+            "lifetime_earnings": ZERO,
+            "lifetime_withdrawals": ZERO,
+            "is_active": True,
+            "is_deleted": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for person_id in existing_persons - wallet_ids.keys()
+    ]
+    if new_wallets:
+        db.execute(insert(Wallet), new_wallets)
+        wallet_ids.update({row["person_id"]: row["id"] for row in new_wallets})
+    return wallet_ids, len(new_wallets)
+
+
+# Add each wallet's total to its balances; returns {wallet_id: available_balance}
+# for the wallets that were updated. On PostgreSQL this is a single
+# UPDATE ... FROM (VALUES ...) RETURNING for the whole chunk.
+def _apply_deltas(db: Session, deltas: Dict[UUID, Decimal], now: datetime) -> Dict[UUID, Decimal]:
+    if db.get_bind().dialect.name == "postgresql":
+        delta_values = values(
+            column("wallet_id", PG_UUID(as_uuid=True)),
+            column("amount", Numeric(12, 2)),
+            name="deltas",
+        ).data(list(deltas.items()))
+        # VALUES parameters are untyped; cast so the sum is numeric, not text
+        amount = cast(delta_values.c.amount, Numeric(12, 2))
+        rows = db.execute(
+            update(wallets)
+            .where(wallets.c.id == delta_values.c.wallet_id, wallets.c.is_deleted == False)
+            .values(
+                available_balance=wallets.c.available_balance + amount,
+                lifetime_earnings=wallets.c.lifetime_earnings + amount,
+                updated_at=now,
+            )
+            .returning(wallets.c.id, wallets.c.available_balance)
+        )
+        return {wallet_id: balance for wallet_id, balance in rows}
+
+    balances = {}
+    for wallet_id, amount in deltas.items():
+        row = db.execute(
+            update(wallets)
+            .where(wallets.c.id == wallet_id, wallets.c.is_deleted == False)
+            .values(
+                available_balance=wallets.c.available_balance + amount,
+                lifetime_earnings=wallets.c.lifetime_earnings + amount,
+                updated_at=now,
+            )
+            .returning(wallets.c.available_balance)
+        ).first()
+        if row is not None:
+            balances[wallet_id] = row.available_balance
+    return balances
+
+
+# Credit one chunk and commit it. Returns (credited rows, duplicate rows,
+# failed rows with their error, wallets created).
+def _credit_chunk(
+    db: Session, chunk: List[PayoutRow]
+) -> Tuple[List[PayoutRow], List[PayoutRow], List[Tuple[PayoutRow, str]], int]:
+    # References credited by an earlier run
+    applied = set(db.scalars(
+        select(wallet_transactions.c.reference)
+        .where(wallet_transactions.c.reference.in_([item.reference for _, item in chunk]))
+    ))
+    duplicates = [entry for entry in chunk if entry[1].reference in applied]
+    pending = [entry for entry in chunk if entry[1].reference not in applied]
+    failed: List[Tuple[PayoutRow, str]] = []
+    if not pending:
+        return [], duplicates, failed, 0
+
+    wallet_ids, wallets_created = _resolve_wallets(db, {item.person_id for _, item in pending})
+
+    by_wallet: Dict[UUID, List[PayoutRow]] = defaultdict(list)
+    for entry in pending:
+        wallet_id = wallet_ids.get(entry[1].person_id)
+        if wallet_id is None:
+            failed.append((entry, "PersonOfContact not found."))
+        else:
+            by_wallet[wallet_id].append(entry)
+
+    now = datetime.now(timezone.utc)
+    balances = _apply_deltas(
+        db,
+        {wallet_id: sum((item.amount for _, item in entries), ZERO) for wallet_id, entries in by_wallet.items()},
+        now,
+    )
+
+    # Ledger rows carry the running balance: the returned balance minus the
+    # wallet's chunk total, plus each credit in file order. Each of a
+    # wallet's rows is stamped a microsecond after the previous one, so
+    # readers ordering by (created_at, id) see the credits in that order.
+    credited: List[PayoutRow] = []
+    tx_rows = []
+    for wallet_id, entries in by_wallet.items():
+        if wallet_id not in balances:
+            # Wallet deleted since it was resolved
+            failed.extend((entry, "Wallet not found.") for entry in entries)
+            continue
+        balance = balances[wallet_id] - sum((item.amount for _, item in entries), ZERO)
+        for position, entry in enumerate(entries):
+            item = entry[1]
+            balance += item.amount
+            tx_rows.append({
+                "id": uuid.uuid4(),
+                "wallet_id": wallet_id,
+                "type": TransactionType.COMMISSION_CREDIT,
+                "amount": item.amount,
+                "balance_after": balance,
+                "description": f"Commission credited: {item.amount}",
+                "reference": item.reference,
+                "created_at": now + timedelta(microseconds=position),
+                "is_deleted": False,
+            })
+            credited.append(entry)
+
+    if tx_rows:
+        db.execute(insert(WalletTransaction), tx_rows)
+    db.commit()
+    return credited, duplicates, failed, wallets_created
+
+
+# Month-end commission payout run: credit (person_id, amount, reference) rows
+# from a CSV or NDJSON stream in chunks, each one set-based and committed on
+# its own. References already in the ledger (or repeated in the file) are
+# skipped, so a run that failed part-way can simply be re-run. A concurrent
+# run crediting the same reference trips the unique index instead; that chunk
+# is rolled back and reported, and a rerun skips what the other run applied.
+def run_commission_payouts(
+    db: Session,
+    stream: IO[bytes],
+    fmt: str,
+    chunk_size: int = PAYOUT_CHUNK_SIZE,
+) -> CommissionPayoutResponse:
+    total_rows = 0
+    credited = 0
+    duplicates = 0
+    failed = 0
+    wallets_created = 0
+    total_credited = ZERO
+    errors: List[CommissionPayoutError] = []
+    seen_references: Set[str] = set()
+
+    def record_error(row_number: int, message: str, reference=None):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(CommissionPayoutError(row=row_number, reference=reference, error=message))
+
+    def flush(chunk: List[PayoutRow]):
+        nonlocal credited, duplicates, wallets_created, total_credited
+        if not chunk:
+            return
+        try:
+            chunk_credited, chunk_duplicates, chunk_failed, chunk_wallets = _credit_chunk(db, chunk)
+        except Exception as e:
+            db.rollback()
+            logger.exception(
+                f"Commission payout chunk failed | first_row={chunk[0][0]} | size={len(chunk)}"
+            )
+            for row_number, item in chunk:
+                record_error(row_number, f"Credit failed: {e.__class__.__name__}", item.reference)
+            return
+        credited += len(chunk_credited)
+        duplicates += len(chunk_duplicates)
+        wallets_created += chunk_wallets
+        total_credited += sum((item.amount for _, item in chunk_credited), ZERO)
+        for (row_number, item), message in chunk_failed:
+            record_error(row_number, message, item.reference)
+
+    chunk: List[PayoutRow] = []
+    for row_number, payload, error in iter_rows(stream, fmt):
+        total_rows += 1
+        if error:
+            record_error(row_number, error)
+            continue
+        try:
+            item = CommissionPayoutItem.model_validate(payload)
+        except ValidationError as e:
+            record_error(row_number, format_validation_error(e), payload.get("reference"))
+            continue
+
+        if item.reference in seen_references:
+            duplicates += 1
+            continue
+        seen_references.add(item.reference)
+
+        chunk.append((row_number, item))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    flush(chunk)
+
+    logger.info(
+        f"Commission payout run finished | total={total_rows} | credited={credited} | "
+        f"duplicates={duplicates} | failed={failed} | amount={total_credited}"
+    )
+    return CommissionPayoutResponse(
+        total_rows=total_rows,
+        credited=credited,
+        duplicates=duplicates,
+        failed=failed,
+        wallets_created=wallets_created,
+        total_credited=total_credited,
+        errors=errors,
+    )
+
+
+# CLI: python -m apps.wallet.payouts payouts.csv [--format ndjson] [--chunk-size 1000]
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Credit a commission payout file to wallets.")
+    parser.add_argument("path", help="CSV or NDJSON file with person_id, amount, reference")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None)
+    parser.add_argument("--chunk-size", type=int, default=PAYOUT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt = detect_format(args.format, args.path, None)
+    if not fmt:
+        parser.error("Unsupported payout file format. Use csv or ndjson.")
+
+    # Registers every app's models (and configures logging) like the API process
+    import main as _app  # noqa: F401
+    from core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            result = run_commission_payouts(db, stream, fmt, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+    print(json.dumps(result.model_dump(mode="json"), indent=2))
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
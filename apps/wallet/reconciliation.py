@@ -0,0 +1,164 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from .ledger import TRANSACTION_EFFECTS, ZERO, wallet_transactions, wallets, tx_columns
+from .schemas import WalletDrift, WalletReconciliationResponse
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 5000
+REPAIR_BATCH_SIZE = 500
+MAX_REPORTED_DRIFTS = 1000
+
+BALANCE_FIELDS = ("available_balance", "pending_payout_amount", "lifetime_earnings", "lifetime_withdrawals")
+
+# SUM(CASE type WHEN ... THEN +/-amount END) per counter: every counter is
+# derived from the ledger in a single pass
+def _ledger_sums():
+    tx_type = tx_columns["type"]
+    amount = wallet_transactions.c.amount
+    sums = []
+    for field in BALANCE_FIELDS:
+        whens = [
+            (tx_type == t, amount if effects[field] > 0 else -amount)
+            for t, effects in TRANSACTION_EFFECTS.items()
+            if field in effects
+        ]
+        sums.append(func.coalesce(func.sum(case(*whens, else_=0)), 0).label(field))
+    return sums
+
+def _ledger_totals(wallet_ids=None):
+    query = (
+        select(wallet_transactions.c.wallet_id, *_ledger_sums())
+        .where(wallet_transactions.c.is_deleted == False)
+        .group_by(wallet_transactions.c.wallet_id)
+    )
+    if wallet_ids is not None:
+        query = query.where(wallet_transactions.c.wallet_id.in_(wallet_ids))
+    return query
+
+# Wallets whose counters differ from their ledger: the ledger is aggregated
+# per wallet in one grouped query, outer-joined to the wallet rows, and only
+# mismatching rows come back. Both tables are read in the same statement,
+# so the comparison is against one consistent snapshot.
+def _drift_query():
+    ledger = _ledger_totals().subquery("ledger")
+    expected = [func.coalesce(ledger.c[field], 0) for field in BALANCE_FIELDS]
+    return (
+        select(
+            wallets.c.id,
+            *[wallets.c[field] for field in BALANCE_FIELDS],
+            *[value.label(f"expected_{field}") for field, value in zip(BALANCE_FIELDS, expected)],
+        )
+        .select_from(wallets.outerjoin(ledger, ledger.c.wallet_id == wallets.c.id))
+        .where(
+            wallets.c.is_deleted == False,
+            or_(*[wallets.c[field] != value for field, value in zip(BALANCE_FIELDS, expected)]),
+        )
+    )
+
+# Reset drifted wallets to their ledger totals. Each wallet row is locked
+# before its ledger is re-aggregated: ledger mutations update the wallet row
+# first, so once the lock is held the wallet's ledger is complete and a
+# drift reported by the scan that has since been resolved is left alone.
+def _repair(db: Session, wallet_ids: List[UUID]) -> int:
+    repaired = 0
+    for start in range(0, len(wallet_ids), REPAIR_BATCH_SIZE):
+        batch = sorted(wallet_ids[start:start + REPAIR_BATCH_SIZE])
+        locked = db.execute(
+            select(*[wallets.c[field] for field in BALANCE_FIELDS], wallets.c.id)
+            .where(wallets.c.id.in_(batch))
+            .order_by(wallets.c.id)
+            .with_for_update()
+        ).all()
+        expected = {row.wallet_id: row for row in db.execute(_ledger_totals(batch))}
+        for row in locked:
+            ledger = expected.get(row.id)
+            values = {field: getattr(ledger, field) if ledger else ZERO for field in BALANCE_FIELDS}
+            if all(getattr(row, field) == values[field] for field in BALANCE_FIELDS):
+                continue
+            db.execute(update(wallets).where(wallets.c.id == row.id).values(**values))
+            repaired += 1
+        db.commit()
+    return repaired
+
+# Verify every wallet's denormalized counters against wallet_transactions,
+# optionally repairing drift. Drifted rows are streamed with a server-side
+# cursor, so memory holds the report and the drifted wallet ids only.
+def reconcile_wallets(
+    db: Session,
+    repair: bool = False,
+    batch_size: int = RECONCILE_BATCH_SIZE,
+) -> WalletReconciliationResponse:
+    started = time.perf_counter()
+    wallets_checked = db.scalar(
+        select(func.count()).select_from(wallets).where(wallets.c.is_deleted == False)
+    )
+
+    drifted_ids: List[UUID] = []
+    drifts: List[WalletDrift] = []
+    total_drift = {field: ZERO for field in BALANCE_FIELDS}
+
+    result = db.execute(
+        _drift_query().execution_options(stream_results=True, yield_per=batch_size)
+    )
+    for partition in result.partitions():
+        for row in partition:
+            drifted_ids.append(row.id)
+            for field in BALANCE_FIELDS:
+                total_drift[field] += getattr(row, f"expected_{field}") - getattr(row, field)
+            if len(drifts) < MAX_REPORTED_DRIFTS:
+                drifts.append(WalletDrift(wallet_id=row.id, **{
+                    key: value for key, value in row._mapping.items() if key != "id"
+                }))
+    # Ends the read transaction (and its cursor) before any repair locks
+    db.rollback()
+
+    repaired = _repair(db, drifted_ids) if repair and drifted_ids else 0
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        f"Wallet reconciliation finished | wallets={wallets_checked} | drifted={len(drifted_ids)} | "
+        f"repaired={repaired} | elapsed={elapsed:.2f}s"
+    )
+    return WalletReconciliationResponse(
+        wallets_checked=wallets_checked,
+        drifted=len(drifted_ids),
+        repaired=repaired,
+        total_drift=total_drift,
+        elapsed_seconds=round(elapsed, 3),
+        drifts=drifts,
+    )
+
+
+# CLI: python -m apps.wallet.reconciliation [--repair]
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reconcile wallet balances against the ledger.")
+    parser.add_argument("--repair", action="store_true", help="Reset drifted wallets to their ledger totals")
+    parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    # Registers every app's models (and configures logging) like the API process
+    import main as _app  # noqa: F401
+    from core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = reconcile_wallets(db, repair=args.repair, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(json.dumps(result.model_dump(mode="json"), indent=2))
+    return 1 if result.drifted and not args.repair else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
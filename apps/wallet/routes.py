@@ -1,4 +1,6 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, File, Header, Query, Response, UploadFile
+from typing import Optional
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from uuid import UUID
 from core.database import get_db
@@ -17,8 +19,16 @@ from .schemas import (
     WithdrawalStatusUpdate,
     WithdrawalRequestResponse,
     CommissionCredit,
+    CommissionPayoutResponse,
+    WalletStatementResponse,
+    WalletReconciliationResponse,
 )
-from .models import Wallet, WalletTransaction, WithdrawalRequest
+from .payouts import run_commission_payouts
+from .history import list_wallet_transactions, refresh_all_checkpoints, wallet_statement
+from .reconciliation import reconcile_wallets
+from core.file_import import detect_format
+from apps.idempotency.store import run_idempotent
+from .models import Wallet, WithdrawalRequest
 
 
 router = APIRouter(prefix="/wallet", tags=["Wallet"])
@@ -34,27 +44,86 @@ def get_my_wallet(
     return wallet
 
 
+# Get own transaction history, newest first. Pages are keyset-paginated on
+# (created_at, id); the next page's cursor is returned in X-Next-Cursor.
+@router.get("/me/transactions", response_model=list[WalletTransactionResponse])
+def get_my_transactions(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None, description="Only transactions at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only transactions before this time"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    wallet = get_or_create_wallet(db, current_user.id)
+    transactions, next_cursor = list_wallet_transactions(db, wallet.id, limit, cursor, start, end)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return transactions
+
+
+# Get own statement (opening/closing balance and totals) for [start, end)
+@router.get("/me/statement", response_model=WalletStatementResponse)
+def get_my_statement(
+    start: datetime = Query(...),
+    end: Optional[datetime] = Query(None, description="Defaults to now"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    wallet = get_or_create_wallet(db, current_user.id)
+    return wallet_statement(db, wallet.id, start, end or datetime.now(timezone.utc))
+
+
+# Admin: Credit a payout file of (person_id, amount, reference) rows
+@router.post("/commission/batch", response_model=CommissionPayoutResponse)
+def add_commission_batch(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson; inferred from the file when omitted"),
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    fmt = detect_format(format, file.filename, file.content_type)
+    if not fmt:
+        raise HTTPException(status_code=400, detail="Unsupported payout file format. Use csv or ndjson.")
+    return run_commission_payouts(db, file.file, fmt)
+
+
 # Admin: Credit commission to a POC wallet
 @router.post("/commission/{person_id}", response_model=WalletResponse)
 def add_commission(
     person_id: UUID,
     data: CommissionCredit,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
-    wallet = credit_commission(db, person_id, data)
-    return wallet
+    return run_idempotent(
+        "wallet.commission",
+        idempotency_key,
+        {"person_id": person_id, **data.model_dump()},
+        lambda: credit_commission(db, person_id, data),
+        WalletResponse,
+        principal=current_admin.get("sub"),
+    )
 
 
 # User: Request withdrawal
 @router.post("/withdrawals", response_model=WithdrawalRequestResponse)
 def request_withdrawal_route(
     data: WithdrawalRequestCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    withdrawal = request_withdrawal(db, current_user.id, data)
-    return withdrawal
+    return run_idempotent(
+        "wallet.withdrawal",
+        idempotency_key,
+        data.model_dump(),
+        lambda: request_withdrawal(db, current_user.id, data),
+        WithdrawalRequestResponse,
+        principal=str(current_user.id),
+    )
 
 
 # User: View own withdrawal requests
@@ -99,10 +168,33 @@ def admin_update_withdrawal_status(
     return updated
 
 
+# Admin: Build balance checkpoints for every wallet's settled history
+@router.post("/checkpoints/refresh", response_model=dict)
+def refresh_wallet_checkpoints(
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    return refresh_all_checkpoints(db)
+
+
+# Admin: Check wallet balances against the ledger, optionally repairing drift
+@router.post("/reconcile", response_model=WalletReconciliationResponse)
+def reconcile_wallet_balances(
+    repair: bool = Query(False, description="Reset drifted wallets to their ledger totals"),
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    return reconcile_wallets(db, repair=repair)
+
+
 # Admin: Get transaction log for a person (by person_id)
+# Passing limit (and cursor for later pages) switches to keyset pagination.
 @router.get("/{person_id}/transactions", response_model=list[WalletTransactionResponse])
 def get_transaction_log(
     person_id: UUID,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
@@ -118,14 +210,9 @@ def get_transaction_log(
             detail="Wallet not found for this person."
         )
 
-    tx_list = (
-        db.query(WalletTransaction)
-        .filter(
-            WalletTransaction.wallet_id == wallet.id,
-            WalletTransaction.is_deleted == False
-        )
-        .order_by(WalletTransaction.created_at.desc())
-        .all()
-    )
-
+    if cursor and limit is None:
+        limit = 50
+    tx_list, next_cursor = list_wallet_transactions(db, wallet.id, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return tx_list
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from decimal import Decimal
 from enum import Enum
 
@@ -50,6 +50,7 @@ class WalletTransactionResponse(BaseModel):
     balance_after: Decimal
     related_withdrawal_id: Optional[UUID]
     description: Optional[str]
+    reference: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -100,3 +101,57 @@ class WithdrawalRequestResponse(BaseModel):
 
 class CommissionCredit(BaseModel):
     amount: Decimal = Field(..., gt=0)
+
+
+class CommissionPayoutItem(BaseModel):
+    person_id: UUID
+    amount: Decimal = Field(..., gt=0, max_digits=12, decimal_places=2)
+    reference: str = Field(..., min_length=1, max_length=100)
+
+
+class CommissionPayoutError(BaseModel):
+    row: int
+    reference: Optional[str] = None
+    error: str
+
+
+class CommissionPayoutResponse(BaseModel):
+    total_rows: int
+    credited: int
+    duplicates: int
+    failed: int
+    wallets_created: int
+    total_credited: Decimal
+    errors: List[CommissionPayoutError] = []
+
+
+class WalletStatementResponse(BaseModel):
+    wallet_id: UUID
+    start: datetime
+    end: datetime
+    opening_balance: Decimal
+    closing_balance: Decimal
+    transaction_count: int
+    totals: Dict[TransactionType, Decimal]
+
+
+class WalletDrift(BaseModel):
+    wallet_id: UUID
+    available_balance: Decimal
+    expected_available_balance: Decimal
+    pending_payout_amount: Decimal
+    expected_pending_payout_amount: Decimal
+    lifetime_earnings: Decimal
+    expected_lifetime_earnings: Decimal
+    lifetime_withdrawals: Decimal
+    expected_lifetime_withdrawals: Decimal
+
+
+class WalletReconciliationResponse(BaseModel):
+    wallets_checked: int
+    drifted: int
+    repaired: int
+    # Sum of (expected - recorded) per balance field over drifted wallets
+    total_drift: Dict[str, Decimal]
+    elapsed_seconds: float
+    drifts: List[WalletDrift] = []
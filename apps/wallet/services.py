@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from uuid import UUID
+import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
 
@@ -11,6 +12,7 @@ from apps.wallet.models import (
     TransactionType,
 )
 from apps.contacts.models import PersonOfContact
+from apps.wallet.ledger import apply_wallet_mutation
 from apps.wallet.schemas import (
     WithdrawalRequestCreate,
     WithdrawalStatusUpdate,
@@ -53,46 +55,74 @@ def get_or_create_wallet(db: Session, user_id: UUID) -> Wallet:
     return wallet
 
 
-# Admin: Credit Commission
-def credit_commission(db: Session, person_id: UUID, data: CommissionCredit) -> Wallet:   
-    wallet = (
-        db.query(Wallet)
-        .filter(Wallet.person_id == person_id, 
+def _active_wallet(db: Session, person_id: UUID):
+    return (
+        db.query(Wallet.id, Wallet.currency, Wallet.available_balance)
+        .filter(Wallet.person_id == person_id,
                 Wallet.is_deleted == False)
         .first()
     )
-    if not wallet:
-        wallet = Wallet(
-            person_id=person_id,
-            available_balance=Decimal("0.00"),
-            lifetime_earnings=Decimal("0.00"),
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
+
+# Create a person's wallet. The person row is locked first so concurrent
+# first credits for the same person cannot create two wallets.
+def _create_wallet(db: Session, person_id: UUID) -> UUID:
+    person = (
+        db.query(PersonOfContact.id)
+        .filter(PersonOfContact.id == person_id)
+        .with_for_update()
+        .first()
+    )
+    if not person:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="PersonOfContact not found.",
         )
-        db.add(wallet)
-        db.flush() # Ensures wallet.id exists for transaction logging
 
-    amount = Decimal(str(data.amount))
+    existing = _active_wallet(db, person_id)
+    if existing:
+        return existing.id
+
+    wallet = Wallet(
+        person_id=person_id,
+        available_balance=Decimal("0.00"),
+        pending_payout_amount=Decimal("0.00"),
+        lifetime_earnings=Decimal("0.00"),
+        lifetime_withdrawals=Decimal("0.00"),
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+    db.add(wallet)
+    db.flush()
+    return wallet.id
 
-    # Update wallet balances
-    wallet.available_balance += amount
-    wallet.lifetime_earnings += amount
-    wallet.updated_at = datetime.now(timezone.utc)
 
-    # Log transaction
-    tx = WalletTransaction(
-        wallet_id=wallet.id,
-        type=TransactionType.COMMISSION_CREDIT,
-        amount=amount,
-        balance_after=wallet.available_balance,
+# Admin: Credit Commission
+def credit_commission(db: Session, person_id: UUID, data: CommissionCredit) -> Wallet:   
+    wallet = _active_wallet(db, person_id)
+    wallet_id = wallet.id if wallet else _create_wallet(db, person_id)
+
+    amount = Decimal(str(data.amount))
+
+    # Atomic balance update and ledger entry
+    balance_after = apply_wallet_mutation(
+        db,
+        wallet_id,
+        TransactionType.COMMISSION_CREDIT,
+        amount,
+        balance_delta=amount,
+        earnings_delta=amount,
         description=f"Commission credited: {amount}",
     )
-
-    db.add(tx)
+    if balance_after is None:
+        # The wallet was deleted after it was looked up
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Wallet is no longer active."
+        )
     db.commit()
-    db.refresh(wallet)
 
-    return wallet
+    return db.query(Wallet).populate_existing().filter(Wallet.id == wallet_id).one()
 
 
 # User: Request Withdrawal
@@ -104,7 +134,7 @@ def request_withdrawal(
 
     # Ensure logged-in user has a POC record
     poc = (
-        db.query(PersonOfContact)
+        db.query(PersonOfContact.id)
         .filter(PersonOfContact.user_id == user_id, 
                 PersonOfContact.is_deleted == False)
         .first()
@@ -115,11 +145,7 @@ def request_withdrawal(
             detail="PersonOfContact not found for this user."
         )
 
-    # Get or create wallet
-    wallet = db.query(Wallet).filter(
-        Wallet.person_id == poc.id,
-        Wallet.is_deleted == False
-    ).first()
+    wallet = _active_wallet(db, poc.id)
 
     if not wallet:
         raise HTTPException(
@@ -135,19 +161,16 @@ def request_withdrawal(
             detail="Withdrawal amount must be greater than 0."
         )
 
+    # Fast rejection; the balance check that counts is in the UPDATE below
     if wallet.available_balance < amount:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Insufficient available balance."
         )
 
-    # Deduct from available and move to pending
-    wallet.available_balance -= amount
-    wallet.pending_payout_amount += amount
-    wallet.updated_at = datetime.now(timezone.utc)
-
     # Create withdrawal request
     withdrawal = WithdrawalRequest(
+        id=uuid.uuid4(),
         wallet_id=wallet.id,
         requested_by_id=poc.id,
         amount=amount,
@@ -160,20 +183,28 @@ def request_withdrawal(
         paypal_email=data.paypal_email,
         status=WithdrawalStatus.REQUESTED,
     )
-
     db.add(withdrawal)
-
-    # Log transaction
-    tx = WalletTransaction(
-        wallet_id=wallet.id,
-        type=TransactionType.WITHDRAWAL_REQUESTED,
-        amount=amount,
-        balance_after=wallet.available_balance,
+    db.flush()
+
+    # Deduct from available and move to pending, only if the balance still covers it
+    balance_after = apply_wallet_mutation(
+        db,
+        wallet.id,
+        TransactionType.WITHDRAWAL_REQUESTED,
+        amount,
+        balance_delta=-amount,
+        pending_delta=amount,
+        min_available=amount,
         related_withdrawal_id=withdrawal.id,
-        description="Withdrawal requested"
+        description="Withdrawal requested",
     )
+    if balance_after is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient available balance."
+        )
 
-    db.add(tx)
     db.commit()
     db.refresh(withdrawal)
 
@@ -187,12 +218,14 @@ def update_withdrawal_status(
     data: WithdrawalStatusUpdate
 ) -> WithdrawalRequest:
 
+    # Lock the request so concurrent status changes apply at most once
     withdrawal = (
         db.query(WithdrawalRequest)
         .filter(
             WithdrawalRequest.id == withdrawal_id,
             WithdrawalRequest.is_deleted == False
         )
+        .with_for_update(of=WithdrawalRequest)
         .first()
     )
 
@@ -202,9 +235,15 @@ def update_withdrawal_status(
             detail="Withdrawal request not found."
         )
 
-    wallet = withdrawal.wallet
+    # Completed and rejected requests have already moved money
+    if withdrawal.status in (WithdrawalStatus.COMPLETED, WithdrawalStatus.REJECTED):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Withdrawal is already {withdrawal.status.value}."
+        )
 
     new_status = data.status
+    amount = withdrawal.amount
 
     # Handle status transitions
     if new_status == WithdrawalStatus.APPROVED:
@@ -214,39 +253,31 @@ def update_withdrawal_status(
         withdrawal.status = WithdrawalStatus.COMPLETED
         withdrawal.completed_at = datetime.now(timezone.utc)
 
-        amount = withdrawal.amount
-
-        wallet.pending_payout_amount -= amount
-        wallet.lifetime_withdrawals += amount
-        wallet.updated_at = datetime.now(timezone.utc)
-
-        # Log completion transaction
-        tx = WalletTransaction(
-            wallet_id=wallet.id,
-            type=TransactionType.WITHDRAWAL_COMPLETED,
-            amount=amount,
-            balance_after=wallet.available_balance,
+        balance_after = apply_wallet_mutation(
+            db,
+            withdrawal.wallet_id,
+            TransactionType.WITHDRAWAL_COMPLETED,
+            amount,
+            pending_delta=-amount,
+            withdrawals_delta=amount,
             related_withdrawal_id=withdrawal.id,
-            description="Withdrawal completed"
+            description="Withdrawal completed",
         )
-        db.add(tx)
 
     elif new_status == WithdrawalStatus.REJECTED:
         withdrawal.status = WithdrawalStatus.REJECTED
 
         # Return funds to available balance
-        wallet.available_balance += withdrawal.amount
-        wallet.pending_payout_amount -= withdrawal.amount
-
-        tx = WalletTransaction(
-            wallet_id=wallet.id,
-            type=TransactionType.WITHDRAWAL_REJECTED,
-            amount=withdrawal.amount,
-            balance_after=wallet.available_balance,
+        balance_after = apply_wallet_mutation(
+            db,
+            withdrawal.wallet_id,
+            TransactionType.WITHDRAWAL_REJECTED,
+            amount,
+            balance_delta=amount,
+            pending_delta=-amount,
             related_withdrawal_id=withdrawal.id,
-            description="Withdrawal rejected"
+            description="Withdrawal rejected",
         )
-        db.add(tx)
 
     else:
         raise HTTPException(
@@ -254,6 +285,15 @@ def update_withdrawal_status(
             detail="Invalid withdrawal status."
         )
 
+    # No wallet row matched (deleted since the request was made): keep the
+    # status unchanged rather than committing it without moving money
+    if new_status != WithdrawalStatus.APPROVED and balance_after is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Wallet for this withdrawal is no longer active."
+        )
+
     db.commit()
     db.refresh(withdrawal)
     return withdrawal
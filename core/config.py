@@ -10,6 +10,56 @@ class Settings:
    JWT_ALGORITHM: str = "HS256"
    JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+   # Authenticated user cache (0 disables)
+   USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+   USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+   # Affiliate click ingestion pipeline
+   CLICK_QUEUE_MAX_SIZE: int = int(os.getenv("CLICK_QUEUE_MAX_SIZE", "10000"))
+   CLICK_BATCH_SIZE: int = int(os.getenv("CLICK_BATCH_SIZE", "500"))
+   CLICK_FLUSH_INTERVAL_MS: int = int(os.getenv("CLICK_FLUSH_INTERVAL_MS", "200"))
+   CLICK_ENQUEUE_TIMEOUT_MS: int = int(os.getenv("CLICK_ENQUEUE_TIMEOUT_MS", "20"))
+   CLICK_SLOW_FLUSH_SECONDS: float = float(os.getenv("CLICK_SLOW_FLUSH_SECONDS", "2"))
+   CLICK_DEGRADED_COOLDOWN_SECONDS: float = float(os.getenv("CLICK_DEGRADED_COOLDOWN_SECONDS", "30"))
+   CLICK_SPOOL_PATH: str = os.getenv("CLICK_SPOOL_PATH", "spool/affiliate_clicks.ndjson")
+
+   # Affiliate link resolution cache: positive entries (links and affiliate
+   # ids) expire after the TTL, negative entries for unknown ids sooner
+   AFFILIATE_CACHE_TTL_SECONDS: float = float(os.getenv("AFFILIATE_CACHE_TTL_SECONDS", "300"))
+   AFFILIATE_NEGATIVE_CACHE_TTL_SECONDS: float = float(os.getenv("AFFILIATE_NEGATIVE_CACHE_TTL_SECONDS", "60"))
+   AFFILIATE_NEGATIVE_CACHE_MAX_SIZE: int = int(os.getenv("AFFILIATE_NEGATIVE_CACHE_MAX_SIZE", "100000"))
+
+   # Rows fetched per server-side cursor batch for /export streams
+   EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+   # Follow-up reminder scheduler window (0 disables) and in-memory cap
+   FOLLOWUP_REMINDER_HORIZON_HOURS: float = float(os.getenv("FOLLOWUP_REMINDER_HORIZON_HOURS", "24"))
+   FOLLOWUP_REMINDER_MAX_ENTRIES: int = int(os.getenv("FOLLOWUP_REMINDER_MAX_ENTRIES", "1000000"))
+
+   # Wallet ledger transactions between balance checkpoints
+   WALLET_CHECKPOINT_INTERVAL: int = int(os.getenv("WALLET_CHECKPOINT_INTERVAL", "1000"))
+
+   # Idempotency-Key replay store: in-memory LRU size and how long keys are honoured
+   IDEMPOTENCY_CACHE_MAX_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_MAX_SIZE", "10000"))
+   IDEMPOTENCY_RETENTION_HOURS: float = float(os.getenv("IDEMPOTENCY_RETENTION_HOURS", "24"))
+
+   # Admin dashboard result cache (0 disables); date ranges are rounded
+   # outward to this many seconds so near-identical requests share entries
+   DASHBOARD_CACHE_MAX_SIZE: int = int(os.getenv("DASHBOARD_CACHE_MAX_SIZE", "256"))
+   DASHBOARD_CACHE_TTL_SECONDS: float = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30"))
+   DASHBOARD_CACHE_BUCKET_SECONDS: int = int(os.getenv("DASHBOARD_CACHE_BUCKET_SECONDS", "60"))
+
+   # Seconds between daily_entity_counts aggregation runs; 0 disables
+   DASHBOARD_ROLLUP_INTERVAL_SECONDS: float = float(os.getenv("DASHBOARD_ROLLUP_INTERVAL_SECONDS", "300"))
+
+   # Salesperson performance/leaderboard cache (0 disables); cleared on
+   # every committed write to the tables the metrics are computed from
+   PERFORMANCE_CACHE_MAX_SIZE: int = int(os.getenv("PERFORMANCE_CACHE_MAX_SIZE", "1024"))
+   PERFORMANCE_CACHE_TTL_SECONDS: float = float(os.getenv("PERFORMANCE_CACHE_TTL_SECONDS", "300"))
+
+   # Seconds between stages/ change checks; 0 disables hot-reload
+   STAGES_RELOAD_INTERVAL_SECONDS: float = float(os.getenv("STAGES_RELOAD_INTERVAL_SECONDS", "5"))
+
    PROJECT_NAME: str = "CRM Sales Pipeline API"
    PROJECT_VERSION: str = "1.0.0"
 
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from typing import IO, Callable, Iterator, Optional, Tuple
+
+from pydantic import ValidationError
+
+# Shared CSV/NDJSON upload parsing for bulk imports (leads, wallet payouts)
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+# Pick the payload format from an explicit value, the file name or content type
+def detect_format(fmt: Optional[str], filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    if fmt:
+        fmt = fmt.strip().lower()
+        return fmt if fmt in SUPPORTED_FORMATS else None
+
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in ctype:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in ctype or "jsonl" in ctype:
+        return "ndjson"
+    return None
+
+# Default CSV row conversion: trimmed values, empty cells left out
+def csv_row_to_payload(row: dict) -> dict:
+    payload = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        value = value.strip() if isinstance(value, str) else value
+        if value in ("", None):
+            continue
+        payload[key.strip()] = value
+    return payload
+
+# Yield (row_number, payload, error) for every record in the stream.
+# Row numbers are 1-based and count data rows only. CSV rows are turned
+# into payloads by csv_row (csv_row_to_payload by default).
+def iter_rows(
+    stream: IO[bytes],
+    fmt: str,
+    csv_row: Callable[[dict], dict] = csv_row_to_payload,
+) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row_number, row in enumerate(reader, start=1):
+            yield row_number, csv_row(row), None
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(payload, dict):
+            yield row_number, None, "Each NDJSON line must be a JSON object"
+            continue
+        yield row_number, payload, None
+
+# One-line "field: message; ..." summary of a pydantic ValidationError
+def format_validation_error(error: ValidationError) -> str:
+    messages = []
+    for err in error.errors():
+        loc = ".".join(str(part) for part in err.get("loc", ()))
+        messages.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return "; ".join(messages)
@@ -3,16 +3,49 @@ import apps.leads.scoring
 import sys, os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
+from core.database import SessionLocal
+from apps.leads.scoring import stage_catalog
+from apps.integrations.click_pipeline import click_ingestor
+from apps.integrations.link_cache import affiliate_link_cache
+from apps.followups.scheduler import followup_scheduler
+from apps.admin.dashboard_rollups import daily_count_aggregator
 import logging
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s | %(name)s | %(levelname)s | %(message)s')
 
+logger = logging.getLogger(__name__)
+
+# Preload affiliate links; redirects still resolve lazily if this fails
+def warm_affiliate_link_cache():
+    db = SessionLocal()
+    try:
+        affiliate_link_cache.warm(db)
+    except Exception:
+        logger.exception("Affiliate link cache warm-up failed")
+    finally:
+        db.close()
+
+# Start and stop background workers with the app
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stage_catalog.start_watcher(settings.STAGES_RELOAD_INTERVAL_SECONDS)
+    warm_affiliate_link_cache()
+    click_ingestor.start()
+    followup_scheduler.start()
+    daily_count_aggregator.start()
+    yield
+    daily_count_aggregator.stop()
+    followup_scheduler.stop()
+    click_ingestor.stop()
+    stage_catalog.stop_watcher()
+
 # Initialize FastAPI app
-app = FastAPI(title="CRM Sales Pipeline API", version="1.0.0")
+app = FastAPI(title="CRM Sales Pipeline API", version="1.0.0", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -46,6 +79,8 @@ from apps.followups.routes import router as followups_router
 from apps.wallet.routes import router as wallet_router
 from apps.integrations.routes import router as integrations_router
 from apps.integrations.ecommerce_routes import router as ecommerce_router
+from apps.exports.routes import router as exports_router
+from apps.idempotency.routes import router as idempotency_router
 
 # Register Routers 
 app.include_router(admin_router)
@@ -62,6 +97,8 @@ app.include_router(followups_router)
 app.include_router(wallet_router)
 app.include_router(integrations_router)
 app.include_router(ecommerce_router)
+app.include_router(exports_router)
+app.include_router(idempotency_router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,85 @@
+import os
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# PostgreSQL-backed tests connect to TEST_DATABASE_URL and run in a
+# throwaway schema that is dropped afterwards; they skip without it
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# core.database creates its engine at import time; it is never connected
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL or "postgresql+psycopg2://localhost/unused")
+
+import main  # noqa: E402,F401  (registers every app's models)
+from core.database import Base  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    admin_engine = create_engine(TEST_DATABASE_URL)
+    if admin_engine.dialect.name != "postgresql":
+        pytest.skip("TEST_DATABASE_URL is not a PostgreSQL database")
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    try:
+        with admin_engine.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    except OperationalError as e:
+        admin_engine.dispose()
+        pytest.skip(f"PostgreSQL is not available: {e.orig}")
+
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={schema}"},
+        pool_size=20,
+        max_overflow=0,
+    )
+    try:
+        Base.metadata.create_all(engine)
+        yield engine
+    finally:
+        engine.dispose()
+        with admin_engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def pg_sessionmaker(pg_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=pg_engine)
+
+
+@pytest.fixture
+def pg_session(pg_sessionmaker):
+    db = pg_sessionmaker()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Statements sent to the test database while the block runs:
+#     with capture_statements() as statements: ...
+@pytest.fixture
+def capture_statements(pg_engine):
+    @contextmanager
+    def capture():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(pg_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(pg_engine, "before_cursor_execute", record)
+
+    return capture
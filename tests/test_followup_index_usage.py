@@ -0,0 +1,165 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert, inspect, text
+
+from apps.accounts.models import Account
+from apps.auth.models import User
+from apps.contacts.models import PersonOfContact
+from apps.followups import models
+from apps.followups.services import (
+    encode_followup_cursor,
+    get_all_followups,
+    get_no_interaction_followups,
+    get_past_due_followups,
+    get_upcoming_followups,
+)
+from apps.interactions.models import Interaction, InteractionType
+
+USERS = 200
+FOLLOWUPS = 20000
+PENDING_SHARE = 0.05
+PAGE_SIZE = 20
+
+ASSIGNEE_INDEX = "ix_followup_assignees_user_id_followup_id"
+STATUS_INDEX = "ix_followups_status_is_deleted_due_date"
+
+
+def _user(n):
+    return User(
+        first_name="User",
+        last_name=str(n),
+        email=f"followup-user-{uuid.uuid4().hex}@example.com",
+        hashed_password="x",
+    )
+
+
+# USERS assignees with FOLLOWUPS follow-ups spread over a year around now,
+# each assigned to one user; most are completed, a few deleted
+@pytest.fixture(scope="module")
+def seeded_followups(pg_sessionmaker):
+    rng = random.Random(12)
+    db = pg_sessionmaker()
+    try:
+        users = [_user(n) for n in range(USERS)]
+        db.add_all(users)
+        db.flush()
+        owner = users[0]
+        account = Account(
+            company_name="Index Test", account_type="client", client_type="direct",
+            status="active", owner_id=owner.id,
+        )
+        person = PersonOfContact(user_id=owner.id)
+        db.add_all([account, person])
+        db.flush()
+        interaction = Interaction(
+            type=InteractionType.CALL, subject="Index test", created_by=owner.id, account_id=account.id,
+        )
+        db.add(interaction)
+        db.flush()
+
+        now = datetime.now(timezone.utc)
+        rows, assignees = [], []
+        for n in range(FOLLOWUPS):
+            followup_id = uuid.uuid4()
+            due_date = now + timedelta(minutes=rng.randint(-180 * 24 * 60, 180 * 24 * 60))
+            rows.append({
+                "id": followup_id,
+                "due_date": due_date,
+                "status": "pending" if rng.random() < PENDING_SHARE else "completed",
+                "type": "call",
+                "is_deleted": rng.random() < 0.02,
+                "poc_id": person.id,
+                "interaction_id": interaction.id,
+                "created_at": due_date - timedelta(days=30),
+                "updated_at": due_date - timedelta(days=30),
+            })
+            assignees.append({"followup_id": followup_id, "user_id": users[n % USERS].id})
+        db.execute(insert(models.FollowUp), rows)
+        db.execute(insert(models.followup_assignees), assignees)
+        db.commit()
+
+        for table in ("users", "followups", "followup_assignees", "interactions"):
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+        return [user.id for user in users[1:]]
+    finally:
+        db.close()
+
+
+# EXPLAIN of the first statement call() sends; for the listings that is
+# the follow-up page query (assignees are loaded by a later SELECT ... IN)
+def _explain_first_query(db, call) -> str:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[0]
+    rows = db.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return "\n".join(row[0] for row in rows)
+
+
+LISTINGS = {
+    "all": get_all_followups,
+    "past_due": get_past_due_followups,
+    "upcoming": lambda db, user, **page: get_upcoming_followups(db, user, hours=24 * 180, **page),
+    "no_interaction": get_no_interaction_followups,
+}
+
+
+def test_followup_indexes_exist(pg_engine):
+    inspector = inspect(pg_engine)
+    assert ASSIGNEE_INDEX in {index["name"] for index in inspector.get_indexes("followup_assignees")}
+    assert STATUS_INDEX in {index["name"] for index in inspector.get_indexes("followups")}
+
+
+@pytest.mark.parametrize("listing", sorted(LISTINGS))
+def test_keyset_listing_uses_assignee_index(pg_sessionmaker, seeded_followups, listing):
+    db = pg_sessionmaker()
+    try:
+        user = db.get(User, seeded_followups[0])
+        fetch = LISTINGS[listing]
+
+        plan = _explain_first_query(db, lambda: fetch(db, user, limit=PAGE_SIZE))
+        assert ASSIGNEE_INDEX in plan, plan
+
+        # Later pages add the (due_date, id) > cursor condition
+        followups, _ = get_all_followups(db, user, limit=PAGE_SIZE)
+        cursor = encode_followup_cursor(followups[len(followups) // 2])
+        plan = _explain_first_query(db, lambda: fetch(db, user, limit=PAGE_SIZE, cursor=cursor))
+        assert ASSIGNEE_INDEX in plan, plan
+    finally:
+        db.close()
+
+
+# Pending, not deleted follow-ups due in a window are answered from the
+# (status, is_deleted, due_date) index, not a table scan
+def test_pending_due_window_uses_status_index(pg_sessionmaker, seeded_followups):
+    db = pg_sessionmaker()
+    try:
+        now = datetime.now(timezone.utc)
+        query = (
+            db.query(models.FollowUp.id)
+            .filter(
+                models.FollowUp.status == "pending",
+                models.FollowUp.is_deleted == False,
+                models.FollowUp.due_date >= now,
+                models.FollowUp.due_date < now + timedelta(days=1),
+            )
+            .order_by(models.FollowUp.due_date.asc())
+        )
+        plan = _explain_first_query(db, query.all)
+        assert STATUS_INDEX in plan, plan
+        assert "Seq Scan on followups" not in plan, plan
+    finally:
+        db.close()
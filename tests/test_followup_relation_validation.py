@@ -0,0 +1,188 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from apps.accounts.models import Account
+from apps.auth.models import User
+from apps.contacts.models import PersonOfContact
+from apps.followups import models, schemas
+from apps.followups.services import (
+    MISSING_ASSIGNED_USERS,
+    MISSING_LEAD,
+    MISSING_POC,
+    _missing_relations,
+    create_followup,
+    update_followup,
+)
+from apps.interactions.models import Interaction, InteractionType
+from apps.leads.models import Lead
+from apps.opportunities.models import Opportunity
+
+RELATION_TABLES = ("persons", "interactions", "leads", "opportunities", "users")
+
+
+def _kind(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper()
+
+
+# Statements that look up follow-up relations by id
+def _relation_lookups(statements) -> list:
+    return [
+        statement for statement in statements
+        if _kind(statement) == "SELECT"
+        and any(f"{table}.id IN" in statement for table in RELATION_TABLES)
+    ]
+
+
+def _user(n):
+    return User(
+        first_name="Assignee",
+        last_name=str(n),
+        email=f"followup-relations-{uuid.uuid4().hex}@example.com",
+        hashed_password="x",
+    )
+
+
+# Three assignees (the first one creates the follow-ups), a person of
+# contact, an interaction, a lead and an opportunity
+@pytest.fixture
+def relations(pg_sessionmaker):
+    db = pg_sessionmaker()
+    try:
+        users = [_user(n) for n in range(3)]
+        db.add_all(users)
+        db.flush()
+        account = Account(
+            company_name="Follow-up Relations", account_type="client", client_type="direct",
+            status="active", owner_id=users[0].id,
+        )
+        person = PersonOfContact(user_id=users[0].id)
+        lead = Lead(title="Lead", first_name="Lead", last_name="Relations", email="relations@example.com")
+        opportunity = Opportunity(name="Relations")
+        db.add_all([account, person, lead, opportunity])
+        db.flush()
+        interaction = Interaction(
+            type=InteractionType.CALL, subject="Relations", created_by=users[0].id, account_id=account.id,
+        )
+        db.add(interaction)
+        db.commit()
+        return {
+            "user_ids": [user.id for user in users],
+            "poc_id": person.id,
+            "interaction_id": interaction.id,
+            "lead_id": lead.id,
+            "opportunity_id": opportunity.id,
+        }
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db(pg_sessionmaker):
+    session = pg_sessionmaker()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _create_data(relations, **overrides) -> schemas.FollowUpCreate:
+    values = {
+        "due_date": datetime.now(timezone.utc) + timedelta(days=1),
+        "status": "pending",
+        "type": "call",
+        "poc_id": relations["poc_id"],
+        "interaction_id": relations["interaction_id"],
+        "lead_id": relations["lead_id"],
+        "opportunity_id": relations["opportunity_id"],
+        "assigned_user_ids": relations["user_ids"],
+        **overrides,
+    }
+    return schemas.FollowUpCreate(**values)
+
+
+# Person, interaction, lead, opportunity and the three assignees are
+# validated by one UNION ALL statement, sent before the follow-up insert
+def test_create_validates_relations_in_one_union_query(db, relations, capture_statements):
+    creator = db.get(User, relations["user_ids"][0])
+
+    with capture_statements() as statements:
+        created = create_followup(db, _create_data(relations), creator)
+
+    lookups = _relation_lookups(statements)
+    assert len(lookups) == 1
+    assert statements[0] is lookups[0]
+    assert lookups[0].count("UNION ALL") == 4
+    assert _kind(statements[1]) == "INSERT"
+    assert sorted(created.assigned_user_ids) == sorted(relations["user_ids"])
+
+
+def test_update_validates_assignees_in_one_query(db, relations, capture_statements):
+    creator = db.get(User, relations["user_ids"][0])
+    created = create_followup(db, _create_data(relations, assigned_user_ids=[creator.id]), creator)
+
+    with capture_statements() as statements:
+        updated = update_followup(
+            db, created.id, schemas.FollowUpUpdate(assigned_user_ids=relations["user_ids"]), creator,
+        )
+
+    lookups = _relation_lookups(statements)
+    assert len(lookups) == 1
+    assert "users.id IN" in lookups[0]
+    assert sorted(updated.assigned_user_ids) == sorted(relations["user_ids"])
+
+
+def test_missing_ids_set_their_bits(db, relations, capture_statements):
+    with capture_statements() as statements:
+        missing = _missing_relations(
+            db,
+            poc_id=relations["poc_id"],
+            interaction_id=relations["interaction_id"],
+            lead_id=uuid.uuid4(),
+            opportunity_id=relations["opportunity_id"],
+            user_ids=[*relations["user_ids"], uuid.uuid4()],
+        )
+
+    assert missing == MISSING_LEAD | MISSING_ASSIGNED_USERS
+    assert len(statements) == 1
+
+    assert _missing_relations(db, poc_id=uuid.uuid4(), user_ids=relations["user_ids"]) == MISSING_POC
+    assert _missing_relations(
+        db,
+        poc_id=relations["poc_id"],
+        interaction_id=relations["interaction_id"],
+        lead_id=relations["lead_id"],
+        opportunity_id=relations["opportunity_id"],
+        user_ids=relations["user_ids"],
+    ) == 0
+
+
+# The first missing relation, in the API's reporting order, decides the
+# error; nothing is inserted
+@pytest.mark.parametrize(
+    "missing_keys, status_code, detail",
+    [
+        (("lead_id",), 404, "Lead not found."),
+        (("opportunity_id",), 404, "Opportunity not found."),
+        (("poc_id", "lead_id"), 404, "Person of contact not found."),
+        (("interaction_id", "opportunity_id"), 404, "Interaction not found."),
+        (("assigned_user_ids",), 400, "One or more assigned users not found."),
+    ],
+)
+def test_create_reports_missing_relations(db, relations, capture_statements, missing_keys, status_code, detail):
+    creator = db.get(User, relations["user_ids"][0])
+    values = {
+        key: [*relations["user_ids"], uuid.uuid4()] if key == "assigned_user_ids" else uuid.uuid4()
+        for key in missing_keys
+    }
+
+    with capture_statements() as statements:
+        with pytest.raises(HTTPException) as error:
+            create_followup(db, _create_data(relations, **values), creator)
+
+    assert (error.value.status_code, error.value.detail) == (status_code, detail)
+    assert len(_relation_lookups(statements)) == 1
+    assert "INSERT" not in [_kind(statement) for statement in statements]
+    assert db.query(models.FollowUp).filter(models.FollowUp.poc_id == relations["poc_id"]).count() == 0
@@ -0,0 +1,112 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from apps.auth.models import User
+from apps.followups import models, schemas
+from apps.followups.services import serialize_followup, serialize_followups
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+# The per-row construction every endpoint used before serialize_followups,
+# with the clock read replaced by the shared reference time
+def _serialize_per_row(followup: models.FollowUp, now: datetime) -> schemas.FollowUpResponse:
+    due_date = (
+        followup.due_date.replace(tzinfo=timezone.utc)
+        if followup.due_date and followup.due_date.tzinfo is None
+        else followup.due_date
+    )
+    is_past_due = (
+        due_date < now
+        if due_date
+        else False
+    )
+
+    return schemas.FollowUpResponse(
+        id=followup.id,
+        due_date=followup.due_date,
+        status=followup.status,
+        type=followup.type,
+        notes=followup.notes,
+        poc_id=followup.poc_id,
+        interaction_id=followup.interaction_id,
+        lead_id=followup.lead_id,
+        opportunity_id=followup.opportunity_id,
+        assigned_user_ids=[user.id for user in followup.assigned_users],
+        is_deleted=followup.is_deleted,
+        is_past_due=is_past_due,
+        created_at=followup.created_at,
+        updated_at=followup.updated_at,
+        completed_at=followup.completed_at,
+    )
+
+
+def _followup(due_date, assignees=2, **values) -> models.FollowUp:
+    return models.FollowUp(
+        id=uuid.uuid4(),
+        due_date=due_date,
+        status=values.get("status", "pending"),
+        type="call",
+        notes=values.get("notes"),
+        is_deleted=values.get("is_deleted", False),
+        poc_id=uuid.uuid4(),
+        interaction_id=uuid.uuid4(),
+        lead_id=values.get("lead_id"),
+        opportunity_id=values.get("opportunity_id"),
+        assigned_users=[User(id=uuid.uuid4()) for _ in range(assignees)],
+        created_at=NOW - timedelta(days=7),
+        updated_at=NOW - timedelta(days=1),
+        completed_at=values.get("completed_at"),
+    )
+
+
+def _mixed_batch() -> list:
+    return [
+        _followup(NOW - timedelta(days=2)),
+        _followup(NOW + timedelta(hours=3), lead_id=uuid.uuid4(), notes="call back"),
+        # Due exactly now is not past due
+        _followup(NOW),
+        _followup(NOW - timedelta(microseconds=1), assignees=0),
+        # Naive due dates are UTC
+        _followup(NOW.replace(tzinfo=None) - timedelta(minutes=5), opportunity_id=uuid.uuid4()),
+        _followup(NOW.replace(tzinfo=None) + timedelta(minutes=5)),
+        # Aware due dates in another zone
+        _followup(NOW.astimezone(timezone(timedelta(hours=-5))) - timedelta(seconds=1)),
+        _followup(NOW.astimezone(timezone(timedelta(hours=9))) + timedelta(seconds=1)),
+        _followup(
+            NOW - timedelta(days=30), status="completed", is_deleted=True,
+            completed_at=NOW - timedelta(days=29),
+        ),
+    ]
+
+
+def test_batch_matches_per_row_serialization():
+    batch = _mixed_batch()
+
+    assert serialize_followups(batch, NOW) == [_serialize_per_row(followup, NOW) for followup in batch]
+    assert [response.is_past_due for response in serialize_followups(batch, NOW)] == [
+        True, False, False, True, True, False, True, False, True,
+    ]
+
+
+def test_single_followup_matches_per_row_serialization():
+    for followup in _mixed_batch():
+        assert serialize_followup(followup, NOW) == _serialize_per_row(followup, NOW)
+
+
+# FollowUpResponse requires a due date, so a row without one is rejected
+# by both paths rather than reported as not past due
+def test_missing_due_date_is_rejected_like_per_row_serialization():
+    followup = _followup(None)
+
+    with pytest.raises(ValidationError):
+        _serialize_per_row(followup, NOW)
+    with pytest.raises(ValidationError):
+        serialize_followups([_followup(NOW), followup], NOW)
+
+
+def test_empty_batch():
+    assert serialize_followups([], NOW) == []
@@ -0,0 +1,136 @@
+import re
+import uuid
+
+import pytest
+
+from apps.accounts.models import Account
+from apps.auth.models import User
+from apps.leads.loaders import LeadLoad, query_leads
+from apps.leads.models import Lead, LeadDetails, LeadNote, LeadProduct
+from apps.leads.schemas import LeadResponse
+from apps.leads.services import (
+    convert_lead_to_contact,
+    get_lead_service,
+    list_leads_page,
+    soft_delete_lead_service,
+)
+
+LEADS = 5
+# Collections FULL loads with selectinload, one SELECT each
+FULL_SELECTIN_COLLECTIONS = 7
+
+
+def _kind(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper()
+
+
+# Tables a statement reads: FROM and JOIN targets
+def _tables(statement: str) -> set:
+    return set(re.findall(r"\b(?:FROM|JOIN)\s+(\w+)", statement))
+
+
+# LEADS leads, each with details, three products, two notes and an account
+@pytest.fixture
+def seeded_leads(pg_sessionmaker):
+    db = pg_sessionmaker()
+    try:
+        owner = User(
+            first_name="Lead",
+            last_name="Owner",
+            email=f"lead-owner-{uuid.uuid4().hex}@example.com",
+            hashed_password="x",
+        )
+        db.add(owner)
+        db.flush()
+        account = Account(
+            company_name="Load Profiles", account_type="client", client_type="direct",
+            status="active", owner_id=owner.id,
+        )
+        leads = [
+            Lead(
+                title="Lead",
+                first_name="Lead",
+                last_name=str(n),
+                email=f"lead-{uuid.uuid4().hex}@example.com",
+                user_id=owner.id,
+                accounts=[account],
+                details=LeadDetails(),
+                products=[LeadProduct(product=f"product-{p}") for p in range(3)],
+                notes=[LeadNote(note=f"note {p}") for p in range(2)],
+            )
+            for n in range(LEADS)
+        ]
+        db.add_all(leads)
+        db.commit()
+        return [lead.id for lead in leads]
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db(pg_sessionmaker):
+    session = pg_sessionmaker()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_minimal_get_reads_only_the_lead_row(db, seeded_leads, capture_statements):
+    with capture_statements() as statements:
+        get_lead_service(db, seeded_leads[0], LeadLoad.MINIMAL)
+
+    assert len(statements) == 1
+    assert _tables(statements[0]) == {"leads"}
+
+
+# details and products (what LeadResponse reads) come from one SELECT each,
+# however many leads are returned
+@pytest.mark.parametrize("lead_count", [1, LEADS])
+def test_detail_profile_serializes_in_three_statements(db, seeded_leads, capture_statements, lead_count):
+    with capture_statements() as statements:
+        leads = query_leads(db, LeadLoad.DETAIL).filter(Lead.id.in_(seeded_leads[:lead_count])).all()
+        responses = [LeadResponse.model_validate(lead) for lead in leads]
+
+    assert len(responses) == lead_count
+    assert all(len(response.products) == 3 and response.details is not None for response in responses)
+    assert len(statements) == 3
+    assert [_tables(statement) for statement in statements] == [{"leads"}, {"lead_details"}, {"lead_products"}]
+
+
+# One joined SELECT for the to-one relationships plus one per collection;
+# no cartesian join across collections
+@pytest.mark.parametrize("lead_count", [1, LEADS])
+def test_full_profile_loads_collections_separately(db, seeded_leads, capture_statements, lead_count):
+    with capture_statements() as statements:
+        leads = query_leads(db, LeadLoad.FULL).filter(Lead.id.in_(seeded_leads[:lead_count])).all()
+        for lead in leads:
+            assert len(lead.products) == 3 and len(lead.notes) == 2 and len(lead.accounts) == 1
+
+    assert len(statements) == 1 + FULL_SELECTIN_COLLECTIONS
+    assert "lead_products" not in _tables(statements[0])
+    assert "lead_notes" not in _tables(statements[0])
+
+
+def test_paginated_list_loads_only_requested_includes(db, seeded_leads, capture_statements):
+    with capture_statements() as statements:
+        leads, _ = list_leads_page(db, LEADS)
+        [LeadResponse.model_validate(lead) for lead in leads]
+    assert len(statements) == 1
+    assert _tables(statements[0]) == {"leads"}
+
+    with capture_statements() as statements:
+        leads, _ = list_leads_page(db, LEADS, include=["accounts", "details", "products"])
+        [LeadResponse.model_validate(lead) for lead in leads]
+    assert len(statements) == 4
+
+
+# Mutations fetch the single lead row (no relationship loads), update it
+# and re-read it on refresh
+@pytest.mark.parametrize("mutate", [soft_delete_lead_service, convert_lead_to_contact])
+def test_mutating_paths_fetch_only_the_lead_row(db, seeded_leads, capture_statements, mutate):
+    with capture_statements() as statements:
+        mutate(db, seeded_leads[0])
+
+    assert [_kind(statement) for statement in statements] == ["SELECT", "UPDATE", "SELECT"]
+    assert all(_tables(statement) <= {"leads"} for statement in statements)
@@ -0,0 +1,120 @@
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+
+from apps.auth.models import User
+from apps.integrations.models import AffiliateClick, AffiliateReferral
+from apps.integrations.services import record_click, record_clicks_batch
+
+WORKERS = 16
+CLICKS_PER_WORKER = 150
+BATCHES_PER_WORKER = 20
+SHOPS = ["alpha.myshopify.com", "beta.myshopify.com", "gamma.myshopify.com"]
+
+
+def _create_affiliates(db, count):
+    affiliates = [
+        User(
+            first_name="Affiliate",
+            last_name=str(n),
+            email=f"affiliate-{uuid.uuid4().hex}@example.com",
+            hashed_password="x",
+        )
+        for n in range(count)
+    ]
+    db.add_all(affiliates)
+    db.commit()
+    return [affiliate.id for affiliate in affiliates]
+
+
+# Every worker starts together and clicks the same (affiliate, shop) pairs:
+# half through record_click, half through record_clicks_batch with the
+# pairs shuffled per batch
+def test_parallel_clicks_keep_one_referral_per_affiliate_and_shop(pg_sessionmaker):
+    setup = pg_sessionmaker()
+    try:
+        affiliate_ids = _create_affiliates(setup, 2)
+    finally:
+        setup.close()
+    pairs = [(affiliate_id, shop) for affiliate_id in affiliate_ids for shop in SHOPS]
+    start = threading.Barrier(WORKERS)
+
+    def single_clicks(worker):
+        rng = random.Random(worker)
+        db = pg_sessionmaker()
+        try:
+            start.wait()
+            for _ in range(CLICKS_PER_WORKER):
+                affiliate_id, shop = rng.choice(pairs)
+                record_click(db, affiliate_id, shop, utm_source="stress")
+        finally:
+            db.close()
+
+    def click_batches(worker):
+        rng = random.Random(worker)
+        db = pg_sessionmaker()
+        try:
+            start.wait()
+            for _ in range(BATCHES_PER_WORKER):
+                batch = pairs * 3
+                rng.shuffle(batch)
+                record_clicks_batch(db, [
+                    {
+                        "id": uuid.uuid4(),
+                        "affiliate_user_id": affiliate_id,
+                        "shop_domain": shop,
+                        "utm_source": "stress",
+                        "created_at": datetime.now(timezone.utc),
+                    }
+                    for affiliate_id, shop in batch
+                ])
+                db.commit()
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        futures = [
+            pool.submit(single_clicks if worker % 2 == 0 else click_batches, worker)
+            for worker in range(WORKERS)
+        ]
+        for future in futures:
+            future.result()
+
+    db = pg_sessionmaker()
+    try:
+        referral_counts = dict(
+            ((affiliate_id, shop), total)
+            for affiliate_id, shop, total in db.query(
+                AffiliateReferral.affiliate_user_id,
+                AffiliateReferral.shop_domain,
+                func.count(),
+            )
+            .filter(AffiliateReferral.affiliate_user_id.in_(affiliate_ids))
+            .group_by(AffiliateReferral.affiliate_user_id, AffiliateReferral.shop_domain)
+        )
+        assert referral_counts == {pair: 1 for pair in pairs}
+
+        # Each referral points at (one of) the newest clicks for its pair
+        newest_clicks = dict(
+            ((affiliate_id, shop), newest)
+            for affiliate_id, shop, newest in db.query(
+                AffiliateClick.affiliate_user_id,
+                AffiliateClick.shop_domain,
+                func.max(AffiliateClick.created_at),
+            )
+            .filter(AffiliateClick.affiliate_user_id.in_(affiliate_ids))
+            .group_by(AffiliateClick.affiliate_user_id, AffiliateClick.shop_domain)
+        )
+        referrals = (
+            db.query(AffiliateReferral)
+            .filter(AffiliateReferral.affiliate_user_id.in_(affiliate_ids))
+            .all()
+        )
+        for referral in referrals:
+            assert referral.last_clicked_at == newest_clicks[(referral.affiliate_user_id, referral.shop_domain)]
+    finally:
+        db.close()
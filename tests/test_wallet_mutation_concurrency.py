@@ -0,0 +1,128 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from fastapi import HTTPException
+
+from apps.auth.models import User
+from apps.contacts.models import PersonOfContact
+from apps.wallet.models import PayoutMethod, TransactionType, Wallet, WalletTransaction, WithdrawalRequest
+from apps.wallet.schemas import CommissionCredit, WithdrawalRequestCreate
+from apps.wallet.services import credit_commission, request_withdrawal
+
+WORKERS = 16
+CREDITS_PER_WORKER = 100
+# More withdrawal attempts than the credited balance covers
+WITHDRAWALS_PER_WORKER = 120
+ONE = Decimal("1.00")
+
+
+def _create_person(db):
+    user = User(
+        first_name="Wallet",
+        last_name="Owner",
+        email=f"wallet-{uuid.uuid4().hex}@example.com",
+        hashed_password="x",
+    )
+    db.add(user)
+    db.flush()
+    person = PersonOfContact(user_id=user.id)
+    db.add(person)
+    db.commit()
+    return user.id, person.id
+
+
+# Start every worker together and run operation(db) per_worker times in
+# each; returns (successful operations, ops/s over all attempts)
+def _run_concurrently(pg_sessionmaker, per_worker, operation):
+    start = threading.Barrier(WORKERS)
+
+    def worker():
+        db = pg_sessionmaker()
+        succeeded = 0
+        try:
+            start.wait()
+            for _ in range(per_worker):
+                if operation(db):
+                    succeeded += 1
+        finally:
+            db.close()
+        return succeeded
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        futures = [pool.submit(worker) for _ in range(WORKERS)]
+        succeeded = sum(future.result() for future in futures)
+    elapsed = time.perf_counter() - started
+    return succeeded, WORKERS * per_worker / elapsed
+
+
+def _balances_after(db, wallet_id, tx_type):
+    return sorted(
+        balance for (balance,) in db.query(WalletTransaction.balance_after).filter(
+            WalletTransaction.wallet_id == wallet_id,
+            WalletTransaction.type == tx_type,
+        )
+    )
+
+
+# Concurrent first credits create one wallet and lose no update; concurrent
+# withdrawals never overdraw. Every mutation serializes on the wallet row,
+# so the ledger's balance_after values are exactly the consecutive balances.
+def test_concurrent_credits_and_withdrawals_keep_balance_and_ledger(pg_sessionmaker):
+    setup = pg_sessionmaker()
+    try:
+        user_id, person_id = _create_person(setup)
+    finally:
+        setup.close()
+
+    def credit(db):
+        credit_commission(db, person_id, CommissionCredit(amount=ONE))
+        return True
+
+    credits, credit_rate = _run_concurrently(pg_sessionmaker, CREDITS_PER_WORKER, credit)
+    credited = WORKERS * CREDITS_PER_WORKER
+    assert credits == credited
+
+    def withdraw(db):
+        try:
+            request_withdrawal(db, user_id, WithdrawalRequestCreate(
+                amount=ONE, payout_method=PayoutMethod.PAYPAL, paypal_email="owner@example.com",
+            ))
+            return True
+        except HTTPException as e:
+            assert e.status_code == 400, e.detail
+            db.rollback()
+            return False
+
+    withdrawals, withdrawal_rate = _run_concurrently(pg_sessionmaker, WITHDRAWALS_PER_WORKER, withdraw)
+    assert withdrawals == credited
+
+    print(
+        f"\nwallet mutations: {credit_rate:.0f} credits/s, {withdrawal_rate:.0f} withdrawal requests/s "
+        f"({WORKERS} threads)"
+    )
+
+    db = pg_sessionmaker()
+    try:
+        wallets = db.query(Wallet).filter(Wallet.person_id == person_id).all()
+        assert len(wallets) == 1
+        wallet = wallets[0]
+        assert wallet.available_balance == Decimal("0.00")
+        assert wallet.pending_payout_amount == credited * ONE
+        assert wallet.lifetime_earnings == credited * ONE
+
+        assert db.query(WalletTransaction).filter(WalletTransaction.wallet_id == wallet.id).count() == 2 * credited
+        assert db.query(WithdrawalRequest).filter(WithdrawalRequest.wallet_id == wallet.id).count() == credited
+
+        # Credits took the balance through 1..N, withdrawals back down N-1..0
+        assert _balances_after(db, wallet.id, TransactionType.COMMISSION_CREDIT) == [
+            n * ONE for n in range(1, credited + 1)
+        ]
+        assert _balances_after(db, wallet.id, TransactionType.WITHDRAWAL_REQUESTED) == [
+            n * ONE for n in range(credited)
+        ]
+    finally:
+        db.close()